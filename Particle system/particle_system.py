@@ -12,7 +12,1661 @@ bl_info = {
 
 import bpy
 from mathutils import Vector
-import random
+import numpy as np
+import threading
+import types
+
+# Shared simulation core. The preview operator runs it as a module (below) and
+# PARTICLE_OT_setup_logic pastes it into the runtime script at #@SIM_CORE@, so
+# the viewport and the game step particles with the same code.
+SIM_CORE_SOURCE = """# ── UPBGE Particle System — shared simulation core ──────────────────────
+# Pure NumPy: no bpy / bge imports. The addon executes this source for the
+# viewport preview and embeds it verbatim in the game runtime script, so
+# both simulate particles with exactly the same code.
+import numpy as np
+import os
+import tempfile
+import types
+
+_X_AXIS = np.array((1.0, 0.0, 0.0))
+_Y_AXIS = np.array((0.0, 1.0, 0.0))
+_Z_AXIS = np.array((0.0, 0.0, 1.0))
+
+# Per-slot arrays that make up the simulation state (see get_state / set_state)
+_STATE_ARRAYS = ('pos', 'prev_pos', 'vel', 'rot', 'ang_vel', 'local_offset',
+                 'age', 'life', 'seed', 'cell')
+
+
+def matrices_to_euler(m):
+    '''XYZ euler angles (Blender convention, R = Rz @ Ry @ Rx) for an (n, 3, 3)
+    stack of rotation matrices. Used where the target wants eulers (bpy preview).'''
+    sin_y  = np.clip(-m[:, 2, 0], -1.0, 1.0)
+    out    = np.empty((m.shape[0], 3))
+    out[:, 1] = np.arcsin(sin_y)
+    out[:, 0] = np.arctan2(m[:, 2, 1], m[:, 2, 2])
+    out[:, 2] = np.arctan2(m[:, 1, 0], m[:, 0, 0])
+    # Gimbal lock: X and Z rotate about the same axis — put it all in X
+    lock = np.abs(sin_y) > 0.99999
+    if lock.any():
+        out[lock, 0] = np.arctan2(-m[lock, 1, 2], m[lock, 1, 1])
+        out[lock, 2] = 0.0
+    return out
+
+
+def euler_to_matrices(e):
+    '''(n, 3, 3) rotation matrices for an (n, 3) array of XYZ eulers, the
+    inverse of matrices_to_euler()'''
+    cx, cy, cz = np.cos(e).T
+    sx, sy, sz = np.sin(e).T
+    m = np.empty((len(e), 3, 3))
+    m[:, 0, 0], m[:, 0, 1], m[:, 0, 2] = cy * cz, sx * sy * cz - cx * sz, cx * sy * cz + sx * sz
+    m[:, 1, 0], m[:, 1, 1], m[:, 1, 2] = cy * sz, sx * sy * sz + cx * cz, cx * sy * sz - sx * cz
+    m[:, 2, 0], m[:, 2, 1], m[:, 2, 2] = -sy, sx * cy, cx * cy
+    return m
+
+
+def rotations_toward(ori, target, s):
+    '''(n, 3, 3) rotations s[k] of the way from ori to target, turning about
+    the axis of the rotation between them (s = 0: ori, s = 1: target)'''
+    rel   = target @ ori.T
+    angle = np.arccos(np.clip((np.trace(rel) - 1.0) * 0.5, -1.0, 1.0))
+    sin_a = np.sin(angle)
+    if sin_a < 1e-6:
+        # No turn, or a half turn whose axis is ambiguous — keep ori
+        return np.broadcast_to(ori, (len(s), 3, 3))
+    x, y, z = (rel[2, 1] - rel[1, 2], rel[0, 2] - rel[2, 0], rel[1, 0] - rel[0, 1])
+    k  = np.array(((0.0, -z, y), (z, 0.0, -x), (-y, x, 0.0))) / (2.0 * sin_a)
+    a  = (angle * s)[:, None, None]
+    return (np.identity(3) + np.sin(a) * k + (1.0 - np.cos(a)) * (k @ k)) @ ori
+
+
+def emitter_at_step(emitter_pos, emitter_ori, emitter_prev, k, steps):
+    '''emit() arguments for step k of steps, the emitter moving linearly from
+    emitter_prev (last frame's (pos, ori), or None) to its current transform
+    over the frame: the transform at the end of the step and the one at its start'''
+    if emitter_prev is None or steps == 1:
+        return emitter_pos, emitter_ori, emitter_prev
+    prev_pos, prev_ori = emitter_prev
+    span = np.array(((k + 1.0) / steps, float(k) / steps))
+    pos  = prev_pos + (emitter_pos - prev_pos) * span[:, None]
+    ori  = rotations_toward(prev_ori, emitter_ori, span)
+    return pos[0], ori[0], (pos[1], ori[1])
+
+
+# ── Baked playback cache ────────────────────────────────────────────────
+# File layout: CACHE_HEADER, one CACHE_INDEX entry per frame, then each
+# frame's CACHE_RECORD array (live particles only). Positions are quantized
+# to the bake's bounding box, sizes to its largest size, eulers to +-pi.
+# Positions are relative to the emitter (see to_emitter_space).
+CACHE_MAGIC  = b'PSCACHE1'
+CACHE_COLOR  = 1    # Header flags: color / rotation channels were baked
+CACHE_ROT    = 2
+CACHE_LOCAL  = 4    # LOCAL simulation space: baked in the emitter's orientation
+CACHE_HEADER = np.dtype([('magic', 'S8'), ('version', '<u4'), ('flags', '<u4'),
+                         ('fps', '<f4'), ('frames', '<u4'), ('capacity', '<u4'),
+                         ('pos_min', '<f4', 3), ('pos_max', '<f4', 3), ('size_max', '<f4')])
+CACHE_INDEX  = np.dtype([('offset', '<u8'), ('count', '<u4'), ('pad', '<u4')])
+CACHE_RECORD = np.dtype([('slot', '<u2'), ('pos', '<u2', 3), ('size', '<u2'),
+                         ('rot', '<i2', 3), ('color', 'u1', 4)])
+
+
+def to_emitter_space(pos, rot, emitter_pos, emitter_ori, local):
+    '''Baked (pos, rot) of world-space particles: offset by the emitter's
+    position, and for LOCAL sims also turned into its orientation so the
+    playback turns with the emitter. WORLD sims keep their world directions
+    (gravity, fields). rot may be None.'''
+    pos = pos - emitter_pos
+    if not local:
+        return pos, rot
+    if rot is not None:
+        rot = matrices_to_euler(emitter_ori.T @ euler_to_matrices(rot))
+    return pos @ emitter_ori, rot
+
+
+def from_emitter_space(pos, rot, emitter_pos, emitter_ori, local):
+    '''World (pos, rot) of baked particles, the inverse of to_emitter_space()'''
+    if local:
+        pos = pos @ emitter_ori.T
+        if rot is not None:
+            rot = matrices_to_euler(emitter_ori @ euler_to_matrices(rot))
+    return emitter_pos + pos, rot
+
+
+def write_cache(path, frames, fps, capacity, flags):
+    '''Write baked frames, a list of (slots, pos, size, rot, color) per frame
+    (rot / color None unless their flag is set), one frame at a time.'''
+    filled   = [f for f in frames if len(f[0])]
+    pos_min  = np.min([f[1].min(axis=0) for f in filled], axis=0) if filled else np.zeros(3)
+    pos_max  = np.max([f[1].max(axis=0) for f in filled], axis=0) if filled else np.zeros(3)
+    size_max = max(float(f[2].max()) for f in filled) if filled else 1.0
+    span     = np.where(pos_max > pos_min, pos_max - pos_min, 1.0)
+    size_max = size_max if size_max > 0.0 else 1.0
+
+    header = np.zeros(1, CACHE_HEADER)
+    header['magic'], header['version'], header['flags'] = CACHE_MAGIC, 1, flags
+    header['fps'], header['frames'], header['capacity'] = fps, len(frames), capacity
+    header['pos_min'], header['pos_max'], header['size_max'] = pos_min, pos_max, size_max
+
+    index = np.zeros(len(frames), CACHE_INDEX)
+    index['count']  = [len(f[0]) for f in frames]
+    counts          = index['count'].astype(np.uint64)
+    index['offset'] = (CACHE_HEADER.itemsize + CACHE_INDEX.itemsize * len(frames)
+                       + CACHE_RECORD.itemsize * (np.cumsum(counts) - counts))
+
+    with open(path, 'wb') as fh:
+        header.tofile(fh)
+        index.tofile(fh)
+        for slots, pos, size, rot, color in frames:
+            rec = np.zeros(len(slots), CACHE_RECORD)
+            rec['slot'] = slots
+            rec['pos']  = np.rint((pos - pos_min) / span * 65535.0)
+            rec['size'] = np.rint(np.clip(size / size_max, 0.0, 1.0) * 65535.0)
+            if rot is not None:
+                rec['rot'] = np.rint((np.remainder(rot + np.pi, 2.0 * np.pi) - np.pi) / np.pi * 32767.0)
+            if color is not None:
+                rec['color'] = np.rint(np.clip(color, 0.0, 1.0) * 255.0)
+            rec.tofile(fh)
+
+
+class CacheReader:
+    '''Memory-mapped playback of a write_cache() file. Only the header and the
+    index are read up front; frame records page in when they are decoded.'''
+
+    def __init__(self, path):
+        self.mm = np.memmap(path, dtype=np.uint8, mode='r')
+        header = self.mm[:CACHE_HEADER.itemsize].view(CACHE_HEADER)[0]
+        if header['magic'] != CACHE_MAGIC:
+            raise ValueError("not a particle cache file")
+        self.fps       = float(header['fps'])
+        self.frames    = int(header['frames'])
+        self.capacity  = int(header['capacity'])
+        self.has_color = bool(header['flags'] & CACHE_COLOR)
+        self.has_rot   = bool(header['flags'] & CACHE_ROT)
+        self.is_local  = bool(header['flags'] & CACHE_LOCAL)
+        start = CACHE_HEADER.itemsize
+        self.index = self.mm[start:start + CACHE_INDEX.itemsize * self.frames].view(CACHE_INDEX)
+        pos_min, pos_max = header['pos_min'].astype(float), header['pos_max'].astype(float)
+        self._pos_min    = pos_min
+        self._pos_scale  = np.where(pos_max > pos_min, pos_max - pos_min, 1.0) / 65535.0
+        self._size_scale = float(header['size_max']) / 65535.0
+
+    def frame(self, i):
+        '''(slots, pos, size, rot, color) of frame i; rot / color are None when
+        they were not baked'''
+        entry = self.index[i]
+        off   = int(entry['offset'])
+        rec   = self.mm[off:off + CACHE_RECORD.itemsize * int(entry['count'])].view(CACHE_RECORD)
+        slots = rec['slot'].astype(np.intp)
+        pos   = self._pos_min + rec['pos'] * self._pos_scale
+        size  = rec['size'] * self._size_scale
+        rot   = rec['rot'] * (np.pi / 32767.0) if self.has_rot else None
+        color = rec['color'] * (1.0 / 255.0) if self.has_color else None
+        return slots, pos, size, rot, color
+
+
+# ── Kernels ─────────────────────────────────────────────────────────────
+# The per-particle hot loops of ParticleSim. NumpyKernels runs them as
+# vectorized expressions; fused_kernels() spells the same maths out as
+# explicit loops, which Numba compiles into one pass per kernel without
+# NumPy's temporary arrays. use_kernels() picks the backend at startup.
+class NumpyKernels:
+    @staticmethod
+    def age(act, age, life, dt):
+        '''Age the act slots by dt, returns their dead mask'''
+        a = age[act] + dt
+        age[act] = a
+        return a >= life[act]
+
+    @staticmethod
+    def integrate(live, pos, prev_pos, vel, acc, dt, damp):
+        '''Semi-implicit Euler: velocity (+ damping factor), then position'''
+        v  = vel[live] + acc * dt
+        v *= damp
+        vel[live]      = v
+        prev_pos[live] = pos[live]
+        pos[live]     += v * dt
+
+    @staticmethod
+    def spin(live, rot, ang_vel, torque, dt, damp):
+        av = (ang_vel[live] + torque * dt) * damp
+        ang_vel[live] = av
+        rot[live]    += av * dt
+
+    @staticmethod
+    def spin_linear(live, rot, rot_rad, life, dt):
+        rot[live] += rot_rad * (dt / life[live])[:, None]
+
+    # Batched variants: per-emitter parameters, (m, 3) / (m,), gathered
+    # through owner[slot] (see ParticleBatch)
+    @staticmethod
+    def integrate_owned(live, owner, pos, prev_pos, vel, acc, damp, dt):
+        o  = owner[live]
+        v  = vel[live] + acc[o] * dt
+        v *= damp[o][:, None]
+        vel[live]      = v
+        prev_pos[live] = pos[live]
+        pos[live]     += v * dt
+
+    @staticmethod
+    def spin_owned(live, owner, rot, ang_vel, torque, damp, dt):
+        o  = owner[live]
+        av = (ang_vel[live] + torque[o] * dt) * damp[o][:, None]
+        ang_vel[live] = av
+        rot[live]    += av * dt
+
+    @staticmethod
+    def spin_linear_owned(live, owner, rot, rot_rad, life, dt):
+        rot[live] += rot_rad[owner[live]] * (dt / life[live])[:, None]
+
+    @staticmethod
+    def bounce(idx, pos, vel, hit_pos, hit_normal, strength):
+        v    = vel[idx]
+        dot  = (v * hit_normal).sum(axis=1)
+        v   -= 2.0 * dot[:, None] * hit_normal
+        vel[idx] = v * strength
+        # Push off surface to prevent sinking
+        pos[idx] = hit_pos + hit_normal * 0.02
+
+    @staticmethod
+    def colors(idx, age, life, seed, cell, shader, use_color, use_alpha,
+               color_start, color_end, t0, t1, start_alpha):
+        ratio = age[idx] / life[idx]
+        out   = np.ones((len(idx), 4))
+        if shader:
+            out[:, 0] = ratio
+            out[:, 1] = seed[idx]
+            out[:, 2] = cell[idx]
+            out[:, 3] = 1.0 / life[idx]
+            return out
+        if use_color:
+            t = np.clip((ratio - t0) / (t1 - t0), 0.0, 1.0)
+            out[:, :3] = color_start + (color_end - color_start) * t[:, None]
+        if use_alpha:
+            sa = start_alpha
+            out[:, 3] = sa * (1.0 - ratio) ** (1.0 / sa) if sa > 0.0 else 0.0
+        return out
+
+    @staticmethod
+    def face_camera(idx, pos, bb_dir, cam_pos, axis, use_axis, cos_thr):
+        '''AXIS / PER_PARTICLE billboards: slots whose direction to the camera
+        turned past the threshold and their new (n, 3, 3) bases'''
+        to_cam = cam_pos - pos[idx]
+        if use_axis:
+            to_cam -= np.outer(to_cam @ axis, axis)
+        length = np.sqrt((to_cam * to_cam).sum(axis=1))
+        valid  = length > 1e-9
+        to_cam[valid] /= length[valid, None]
+        need_mask = valid & ((to_cam * bb_dir[idx]).sum(axis=1) < cos_thr)
+        need = idx[need_mask]
+        d    = to_cam[need_mask]
+        bb_dir[need] = d
+        if use_axis:
+            up    = np.broadcast_to(axis, d.shape)
+            right = np.cross(up, d)
+        else:
+            # Gimbal-lock guard: if to_cam is nearly parallel to Z, use Y as reference
+            ref   = np.where((np.abs(d[:, 2]) > 0.999)[:, None], _Y_AXIS, _Z_AXIS)
+            right = np.cross(ref, d)
+            right /= np.sqrt((right * right).sum(axis=1))[:, None]
+            up    = np.cross(d, right)
+        return need, np.stack((right, -d, up), axis=2)
+
+
+def fused_kernels(jit):
+    '''NumpyKernels as per-particle loops, each wrapped with jit (numba.njit;
+    an identity jit runs them as plain Python)'''
+    @jit
+    def age(act, age, life, dt):
+        dead = np.empty(act.shape[0], dtype=np.bool_)
+        for k in range(act.shape[0]):
+            i = act[k]
+            a = age[i] + dt
+            age[i]  = a
+            dead[k] = a >= life[i]
+        return dead
+
+    @jit
+    def integrate(live, pos, prev_pos, vel, acc, dt, damp):
+        for k in range(live.shape[0]):
+            i = live[k]
+            for c in range(3):
+                v = (vel[i, c] + acc[c] * dt) * damp
+                vel[i, c]      = v
+                prev_pos[i, c] = pos[i, c]
+                pos[i, c]     += v * dt
+
+    @jit
+    def spin(live, rot, ang_vel, torque, dt, damp):
+        for k in range(live.shape[0]):
+            i = live[k]
+            for c in range(3):
+                av = (ang_vel[i, c] + torque[c] * dt) * damp
+                ang_vel[i, c] = av
+                rot[i, c]    += av * dt
+
+    @jit
+    def spin_linear(live, rot, rot_rad, life, dt):
+        for k in range(live.shape[0]):
+            i = live[k]
+            s = dt / life[i]
+            for c in range(3):
+                rot[i, c] += rot_rad[c] * s
+
+    @jit
+    def integrate_owned(live, owner, pos, prev_pos, vel, acc, damp, dt):
+        for k in range(live.shape[0]):
+            i = live[k]
+            o = owner[i]
+            for c in range(3):
+                v = (vel[i, c] + acc[o, c] * dt) * damp[o]
+                vel[i, c]      = v
+                prev_pos[i, c] = pos[i, c]
+                pos[i, c]     += v * dt
+
+    @jit
+    def spin_owned(live, owner, rot, ang_vel, torque, damp, dt):
+        for k in range(live.shape[0]):
+            i = live[k]
+            o = owner[i]
+            for c in range(3):
+                av = (ang_vel[i, c] + torque[o, c] * dt) * damp[o]
+                ang_vel[i, c] = av
+                rot[i, c]    += av * dt
+
+    @jit
+    def spin_linear_owned(live, owner, rot, rot_rad, life, dt):
+        for k in range(live.shape[0]):
+            i = live[k]
+            o = owner[i]
+            s = dt / life[i]
+            for c in range(3):
+                rot[i, c] += rot_rad[o, c] * s
+
+    @jit
+    def bounce(idx, pos, vel, hit_pos, hit_normal, strength):
+        for k in range(idx.shape[0]):
+            i   = idx[k]
+            dot = vel[i, 0] * hit_normal[k, 0] + vel[i, 1] * hit_normal[k, 1] + vel[i, 2] * hit_normal[k, 2]
+            for c in range(3):
+                vel[i, c] = (vel[i, c] - 2.0 * dot * hit_normal[k, c]) * strength
+                pos[i, c] = hit_pos[k, c] + hit_normal[k, c] * 0.02
+
+    @jit
+    def colors(idx, age, life, seed, cell, shader, use_color, use_alpha,
+               color_start, color_end, t0, t1, start_alpha):
+        n   = idx.shape[0]
+        out = np.ones((n, 4))
+        for k in range(n):
+            i     = idx[k]
+            ratio = age[i] / life[i]
+            if shader:
+                out[k, 0] = ratio
+                out[k, 1] = seed[i]
+                out[k, 2] = cell[i]
+                out[k, 3] = 1.0 / life[i]
+                continue
+            if use_color:
+                t = min(max((ratio - t0) / (t1 - t0), 0.0), 1.0)
+                for c in range(3):
+                    out[k, c] = color_start[c] + (color_end[c] - color_start[c]) * t
+            if use_alpha:
+                out[k, 3] = start_alpha * (1.0 - ratio) ** (1.0 / start_alpha) if start_alpha > 0.0 else 0.0
+        return out
+
+    @jit
+    def face_camera(idx, pos, bb_dir, cam_pos, axis, use_axis, cos_thr):
+        n    = idx.shape[0]
+        need = np.empty(n, dtype=idx.dtype)
+        mats = np.empty((n, 3, 3))
+        m    = 0
+        for k in range(n):
+            i  = idx[k]
+            dx = cam_pos[0] - pos[i, 0]
+            dy = cam_pos[1] - pos[i, 1]
+            dz = cam_pos[2] - pos[i, 2]
+            if use_axis:
+                a   = dx * axis[0] + dy * axis[1] + dz * axis[2]
+                dx -= a * axis[0]
+                dy -= a * axis[1]
+                dz -= a * axis[2]
+            length = np.sqrt(dx * dx + dy * dy + dz * dz)
+            if length <= 1e-9:
+                continue
+            dx /= length
+            dy /= length
+            dz /= length
+            if dx * bb_dir[i, 0] + dy * bb_dir[i, 1] + dz * bb_dir[i, 2] >= cos_thr:
+                continue
+            bb_dir[i, 0] = dx
+            bb_dir[i, 1] = dy
+            bb_dir[i, 2] = dz
+            if use_axis:
+                ux, uy, uz = axis[0], axis[1], axis[2]
+                rx, ry, rz = uy * dz - uz * dy, uz * dx - ux * dz, ux * dy - uy * dx
+            else:
+                # Gimbal-lock guard: if to_cam is nearly parallel to Z, use Y as reference
+                if abs(dz) > 0.999:
+                    rx, ry, rz = dz, 0.0, -dx           # Y x d
+                else:
+                    rx, ry, rz = -dy, dx, 0.0           # Z x d
+                rl  = np.sqrt(rx * rx + ry * ry + rz * rz)
+                rx /= rl
+                ry /= rl
+                rz /= rl
+                ux, uy, uz = dy * rz - dz * ry, dz * rx - dx * rz, dx * ry - dy * rx
+            need[m] = i
+            mats[m, 0, 0], mats[m, 1, 0], mats[m, 2, 0] = rx, ry, rz
+            mats[m, 0, 1], mats[m, 1, 1], mats[m, 2, 1] = -dx, -dy, -dz
+            mats[m, 0, 2], mats[m, 1, 2], mats[m, 2, 2] = ux, uy, uz
+            m += 1
+        return need[:m], mats[:m]
+
+    return types.SimpleNamespace(age=age, integrate=integrate, spin=spin,
+                                 spin_linear=spin_linear, integrate_owned=integrate_owned,
+                                 spin_owned=spin_owned, spin_linear_owned=spin_linear_owned,
+                                 bounce=bounce, colors=colors, face_camera=face_camera)
+
+
+def kernels_agree(a, b, n=257, seed=1):
+    '''Run every kernel of backends a and b on the same random particles and
+    compare all outputs and updated arrays (rounding-level tolerance). Every
+    branch runs for any seed: each colors() flag combination with zero and
+    random start alpha, face_camera() with and without a random axis.'''
+    rng  = np.random.default_rng(seed)
+    idx  = rng.permutation(n)[:n // 2].astype(np.intp)
+    pos, vel, rot, bb_dir = (rng.random((n, 3)) - 0.5 for _ in range(4))
+    age  = rng.random(n)
+    life = rng.random(n) + 0.5
+    seed_, cell = rng.random(n), rng.random(n)
+    hit_pos, hit_normal = rng.random((len(idx), 3)), rng.random((len(idx), 3))
+    vec  = rng.random(3)
+    color_start, color_end = rng.random(3), rng.random(3)
+    t0, t1  = sorted(rng.random(2))
+    alpha   = rng.uniform(0.05, 1.0)
+    cam_pos = rng.random(3) * 4.0
+    axis    = rng.normal(size=3)
+    axis   /= np.sqrt(axis @ axis)
+    cos_thr = rng.uniform(-0.2, 0.3)   # Against non-unit bb_dir: some turn, some keep
+    # bounce() puts the first live particles right below the camera, facing
+    # away, so free billboards turn through the gimbal-lock guard
+    age[idx[:8]]   = 0.0
+    hit_pos[:8]    = cam_pos - (rng.random((8, 3)) - 0.5) * 1e-3 - (0.0, 0.0, 1.0)
+    hit_normal[:8] = _Z_AXIS
+    bb_dir[idx[:8]] = -_Z_AXIS
+    owner    = rng.integers(0, 5, n)
+    per_acc  = rng.random((5, 3)) - 0.5
+    per_damp = 1.0 - rng.random(5) * 0.1
+    ok   = True
+
+    def same(x, y):
+        return x.shape == y.shape and np.allclose(x, y, rtol=1e-12, atol=1e-12)
+
+    def run(k):
+        s  = {'pos': pos.copy(), 'prev': pos.copy(), 'vel': vel.copy(), 'rot': rot.copy(),
+              'ang': vel.copy(), 'age': age.copy(), 'bb': bb_dir.copy(), 'bb_axis': bb_dir.copy()}
+        dead = k.age(idx, s['age'], life, 0.3)
+        live = idx[~dead]
+        res  = [dead]
+        k.integrate(live, s['pos'], s['prev'], s['vel'], vec, 0.016, 0.98)
+        k.spin(live, s['rot'], s['ang'], vec, 0.016, 0.98)
+        k.spin_linear(live, s['rot'], vec, life, 0.016)
+        k.integrate_owned(live, owner, s['pos'], s['prev'], s['vel'], per_acc, per_damp, 0.016)
+        k.spin_owned(live, owner, s['rot'], s['ang'], per_acc, per_damp, 0.016)
+        k.spin_linear_owned(live, owner, s['rot'], per_acc, life, 0.016)
+        k.bounce(idx, s['pos'], s['vel'], hit_pos, hit_normal, 0.5)
+        for flags in np.ndindex(2, 2, 2):   # (shader, use_color, use_alpha)
+            for start_alpha in (0.0, alpha):
+                res.append(k.colors(live, s['age'], life, seed_, cell, *(bool(f) for f in flags),
+                                    color_start, color_end, t0, t1, start_alpha))
+        for bb, use_axis in (('bb', False), ('bb_axis', True)):
+            res.extend(k.face_camera(live, s['pos'], s[bb], cam_pos, axis, use_axis, cos_thr))
+        return res + list(s.values())
+
+    for x, y in zip(run(a), run(b)):
+        ok = ok and same(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+    return ok
+
+
+kernels = NumpyKernels   # Active backend, see use_kernels()
+
+
+def _cacheable_core(source):
+    '''This core's source as a module backed by a file in the temp
+    directory, named after the source's hash. Numba can only cache functions
+    that come from a file it can locate, which exec'd source never does.'''
+    import sys
+    import zlib
+    name = 'upbge_ps_core_%08x' % zlib.crc32(source.encode())
+    mod = sys.modules.get(name)
+    if mod is None:
+        path = os.path.join(tempfile.gettempdir(), name + '.py')
+        if not os.path.exists(path):
+            tmp = f"{path}.{os.getpid()}"
+            with open(tmp, 'w', encoding='utf-8') as f:
+                f.write(source)
+            os.replace(tmp, path)   # Atomic: workers may race to write it
+        mod = types.ModuleType(name)
+        mod.__file__ = path
+        sys.modules[name] = mod
+        exec(compile(source, path, 'exec'), mod.__dict__)
+    return mod
+
+
+def use_kernels(prefer_jit=True, source=None):
+    '''Select the kernel backend for every ParticleSim in this process: the
+    Numba-compiled fused_kernels when numba imports and they pass
+    kernels_agree() against NumPy, NumpyKernels otherwise. Returns a short
+    description for the log.
+
+    source: the text of this core. When given, the kernels are compiled from
+    a file-backed copy of it with Numba's on-disk cache, so only the first
+    start compiles; later ones, and every worker process, load the cache.'''
+    global kernels
+    kernels = NumpyKernels
+    if not prefer_jit:
+        return "NumPy"
+    try:
+        import numba
+    except ImportError:
+        return "NumPy (numba not installed)"
+    build = fused_kernels
+    cache = source is not None
+    if cache:
+        try:
+            build = _cacheable_core(source).fused_kernels
+        except OSError:
+            cache = False   # No writable temp directory: compile uncached
+    try:
+        fused = build(numba.njit(nogil=True, cache=cache))
+        if not kernels_agree(fused, NumpyKernels):
+            return "NumPy (Numba kernels failed the self-check)"
+    except Exception as e:
+        return f"NumPy (Numba compile failed: {e})"
+    kernels = fused
+    return f"Numba {numba.__version__}" + (" (cached)" if cache else "")
+
+
+# ── Shared-memory frames ────────────────────────────────────────────────
+# Worker processes publish finished frames into a buffer shared with the
+# game: two frames back to back (double buffer), each a live count followed
+# by fixed-capacity per-slot arrays. Only the first count entries are valid.
+FRAME_FIELDS = (('slots', np.int64, ()), ('pos', np.float64, (3,)), ('prev', np.float64, (3,)),
+                ('size', np.float64, ()), ('color', np.float64, (4,)), ('rot', np.float64, (3,)))
+
+
+def frame_buffer_size(capacity):
+    '''Bytes needed for both frames of a capacity-slot emitter'''
+    per_slot = sum(np.dtype(dt).itemsize * int(np.prod(shape)) for _, dt, shape in FRAME_FIELDS)
+    return 2 * (8 + capacity * per_slot)
+
+
+def frame_views(buf, capacity):
+    '''The two frames of buf as dicts of NumPy views: 'count' plus FRAME_FIELDS'''
+    frames = []
+    off    = 0
+    for _ in range(2):
+        frame = {'count': np.ndarray(1, np.int64, buf, off)}
+        off  += 8
+        for name, dt, shape in FRAME_FIELDS:
+            view = np.ndarray((capacity,) + shape, dt, buf, off)
+            off += view.nbytes
+            frame[name] = view
+        frames.append(frame)
+    return frames
+
+
+def write_frame(frame, sim):
+    '''Publish sim's live particles into one frame_views() frame. color / rot
+    are only filled when sim writes them; count is stored last.'''
+    live = sim.live
+    n    = len(live)
+    frame['slots'][:n] = live
+    frame['pos'][:n]   = sim.pos[live]
+    frame['prev'][:n]  = sim.prev_pos[live]
+    frame['size'][:n]  = sim.sizes(live)
+    if sim.writes_color:
+        frame['color'][:n] = sim.colors(live)
+    if sim.has_torque or sim.rot_has_value:
+        frame['rot'][:n] = sim.rot[live]
+    frame['count'][0] = n
+
+# ── Emission shapes ─────────────────────────────────────────────────────
+# Every sampler returns n emitter-local spawn positions and their unit
+# directions (what normal_velocity pushes along) in one array pass, no
+# per-particle Python. shell samples the shape's boundary, not its inside.
+
+def unit_vectors(rng, n):
+    '''n directions uniform on the unit sphere (z uniform in [-1, 1])'''
+    z     = 2.0 * rng.random(n) - 1.0
+    theta = 2.0 * np.pi * rng.random(n)
+    s     = np.sqrt(1.0 - z * z)
+    return np.column_stack((s * np.cos(theta), s * np.sin(theta), z))
+
+
+def _up(n):
+    return np.tile(_Z_AXIS, (n, 1))
+
+
+def _annulus(rng, n, r0, r1):
+    '''n points uniform by area between radii r0 and r1 in the XY plane, and their radial directions'''
+    theta  = 2.0 * np.pi * rng.random(n)
+    radial = np.column_stack((np.cos(theta), np.sin(theta), np.zeros(n)))
+    r      = np.sqrt(r0 * r0 + (r1 * r1 - r0 * r0) * rng.random(n))
+    return radial * r[:, None], radial
+
+
+def sample_point(rng, n):
+    '''The origin, directions all around'''
+    return np.zeros((n, 3)), unit_vectors(rng, n)
+
+
+def sample_box(rng, n, size, shell):
+    '''Box of size centered on the origin. Volume: directions +Z; shell: the
+    faces, picked by area, directions along their normals.'''
+    pos = (rng.random((n, 3)) - 0.5) * size
+    if not shell:
+        return pos, _up(n)
+    area = np.array((size[1] * size[2], size[0] * size[2], size[0] * size[1]))
+    axis = np.minimum(np.searchsorted(np.cumsum(area), rng.random(n) * area.sum(), side='right'), 2)
+    side = np.where(rng.random(n) < 0.5, -1.0, 1.0)
+    rows = np.arange(n)
+    pos[rows, axis] = 0.5 * size[axis] * side
+    dirs = np.zeros((n, 3))
+    dirs[rows, axis] = side
+    return pos, dirs
+
+
+def sample_sphere(rng, n, radius, shell, hemisphere=False):
+    '''Sphere (or its +Z half) around the origin, directions outward.
+    Uniform in volume: radius ~ cbrt(u).'''
+    dirs = unit_vectors(rng, n)
+    if hemisphere:
+        dirs[:, 2] = np.abs(dirs[:, 2])
+    r = radius if shell else radius * np.cbrt(rng.random(n))[:, None]
+    return dirs * r, dirs
+
+
+def sample_disk(rng, n, radius, shell):
+    '''Disk in the XY plane facing +Z; shell: its rim'''
+    pos, _ = _annulus(rng, n, radius if shell else 0.0, radius)
+    return pos, _up(n)
+
+
+def sample_ring(rng, n, radius, inner, shell):
+    '''Flat ring between inner * radius and radius in the XY plane,
+    directions outward; shell: its outer circle'''
+    return _annulus(rng, n, radius if shell else inner * radius, radius)
+
+
+def sample_cone(rng, n, radius, angle, shell):
+    '''Base disk (shell: its rim) in the XY plane; directions open from +Z by
+    up to angle, tilting outward with the distance from the center'''
+    pos, radial = _annulus(rng, n, radius if shell else 0.0, radius)
+    if radius > 0.0:
+        tilt = angle * np.sqrt((pos * pos).sum(axis=1)) / radius
+    else:
+        tilt = angle * np.sqrt(rng.random(n))   # Point cone: spread over the cap
+    dirs = radial * np.sin(tilt)[:, None]
+    dirs[:, 2] = np.cos(tilt)
+    return pos, dirs
+
+
+def sample_edge(rng, n, length):
+    '''Segment of length along the X axis, centered on the origin, directions +Z'''
+    pos = np.zeros((n, 3))
+    pos[:, 0] = (rng.random(n) - 0.5) * length
+    return pos, _up(n)
+
+
+def shape_sampler(p):
+    '''fn(rng, n) -> (positions, directions) for the props' emission shape.
+    The mesh shapes sample a MeshSampler instead.'''
+    shape  = p['emission_shape']
+    shell  = p['emission_shell']
+    radius = p['emission_sphere_radius']
+    if shape == 'BOX':
+        size = np.array(p['emission_box_size'], dtype=float)
+        return lambda rng, n: sample_box(rng, n, size, shell)
+    if shape in ('SPHERE', 'HEMISPHERE'):
+        half = shape == 'HEMISPHERE'
+        return lambda rng, n: sample_sphere(rng, n, radius, shell, half)
+    if shape == 'DISK':
+        return lambda rng, n: sample_disk(rng, n, radius, shell)
+    if shape == 'RING':
+        inner = p['emission_inner_radius']
+        return lambda rng, n: sample_ring(rng, n, radius, inner, shell)
+    if shape == 'CONE':
+        angle = np.radians(p['emission_cone_angle'])
+        return lambda rng, n: sample_cone(rng, n, radius, angle, shell)
+    if shape == 'EDGE':
+        length = p['emission_edge_length']
+        return lambda rng, n: sample_edge(rng, n, length)
+    return sample_point
+
+
+# ── Mesh emission ───────────────────────────────────────────────────────
+MESH_SHAPES = ('SURFACE', 'VERTEX')   # Emission shapes that sample the emitter's mesh
+
+
+class MeshSampler:
+    '''Spawn points on an emitter mesh, in the emitter's local space (scale
+    applied). SURFACE spreads them over the triangles by area, VERTEX picks
+    vertices; optional per-vertex weights (a vertex group) scale each
+    triangle's / vertex's share, so zero-weight parts never emit. The
+    cumulative table is built once; a sample is a binary search, O(log n).'''
+
+    def __init__(self, verts, tris, weights=None, surface=True):
+        self.args    = (verts, tris, weights, surface)   # Rebuilt from these in worker processes
+        self.surface = surface
+        verts = np.asarray(verts, dtype=float).reshape(-1, 3)
+        tris  = np.asarray(tris, dtype=np.intp).reshape(-1, 3)
+        a     = verts[tris[:, 0]]
+        ab    = verts[tris[:, 1]] - a
+        ac    = verts[tris[:, 2]] - a
+        cross = np.cross(ab, ac)            # Length = twice the triangle's area
+        area  = np.sqrt((cross * cross).sum(axis=1))
+        if surface:
+            share        = area if weights is None else area * weights[tris].mean(axis=1)
+            self.normals = cross / np.maximum(area, 1e-12)[:, None]
+            self.a, self.ab, self.ac = a, ab, ac
+        else:
+            share = np.ones(len(verts)) if weights is None else np.asarray(weights, dtype=float)
+            # Vertex normals: area-weighted sum of the adjacent face normals
+            normals = np.zeros_like(verts)
+            for k in range(3):
+                np.add.at(normals, tris[:, k], cross)
+            length = np.sqrt((normals * normals).sum(axis=1))
+            self.normals = normals / np.maximum(length, 1e-12)[:, None]
+            self.verts   = verts
+        self.cdf   = np.cumsum(share)
+        self.total = float(self.cdf[-1]) if len(self.cdf) else 0.0
+
+    def sample(self, rng, n):
+        '''(n, 3) local positions and their (n, 3) unit normals'''
+        if self.total <= 0.0:
+            return np.zeros((n, 3)), np.zeros((n, 3))
+        k = np.searchsorted(self.cdf, rng.random(n) * self.total, side='right')
+        k = np.minimum(k, len(self.cdf) - 1)
+        if not self.surface:
+            return self.verts[k], self.normals[k]
+        # Uniform in the triangle: fold the (u, v) square's far half back onto it
+        u, v = rng.random(n), rng.random(n)
+        fold = u + v > 1.0
+        u[fold], v[fold] = 1.0 - u[fold], 1.0 - v[fold]
+        return self.a[k] + self.ab[k] * u[:, None] + self.ac[k] * v[:, None], self.normals[k]
+
+
+def mesh_arrays(mesh, vertex_groups, group):
+    '''(vertices, triangles, weights) of a bpy Mesh, unscaled (read through
+    foreach_get — the core itself imports no bpy). vertex_groups / group: the
+    object's groups and the name of the one weighting the emission ('' = none,
+    weights None). None for meshes without faces.'''
+    nv = len(mesh.vertices)
+    co = np.empty(nv * 3)
+    mesh.vertices.foreach_get('co', co)
+    mesh.calc_loop_triangles()
+    tris = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+    mesh.loop_triangles.foreach_get('vertices', tris)
+    if not len(tris):
+        return None
+    weights = None
+    vg = vertex_groups.get(group) if group else None
+    if vg is not None:
+        # No bulk access to group weights: one pass over each vertex's own groups
+        gi      = vg.index
+        weights = np.array([next((g.weight for g in v.groups if g.group == gi), 0.0)
+                            for v in mesh.vertices])
+    return co.reshape(-1, 3), tris, weights
+
+
+def mesh_sampler(mesh, vertex_groups, group, scale, surface):
+    '''MeshSampler from a bpy Mesh at scale (see mesh_arrays). None for
+    meshes without faces.'''
+    arrays = mesh_arrays(mesh, vertex_groups, group)
+    if arrays is None:
+        return None
+    co, tris, weights = arrays
+    return MeshSampler(co * scale, tris, weights, surface)
+
+
+# ── Force fields ────────────────────────────────────────────────────────
+FIELD_KINDS = ('ATTRACT', 'VORTEX', 'WIND')
+
+
+class ForceFields:
+    '''Frame snapshot of the scene's force fields, evaluated for any number
+    of particles at once. fields: (kind, position, axis, strength, radius,
+    falloff) tuples — axis is the field object's +Z, radius 0 reaches
+    everywhere, falloff (CONSTANT / LINEAR / SMOOTH) fades it out toward
+    the radius. ATTRACT pulls toward the position (negative strength
+    repels), VORTEX swirls around the axis line, WIND pushes along the axis.'''
+
+    def __init__(self, fields):
+        self.args   = fields   # Rebuilt from these in worker processes
+        self.fields = [(kind, np.asarray(pos, dtype=float), np.asarray(axis, dtype=float),
+                        float(strength), float(radius), falloff)
+                       for kind, pos, axis, strength, radius, falloff in fields]
+
+    @staticmethod
+    def _weight(dist, radius, falloff):
+        if radius <= 0.0:
+            return 1.0
+        t = np.minimum(dist / radius, 1.0)
+        if falloff == 'LINEAR':
+            return 1.0 - t
+        if falloff == 'SMOOTH':
+            return 1.0 - t * t * (3.0 - 2.0 * t)
+        return (dist < radius).astype(float)
+
+    def accel(self, pos):
+        '''(n, 3) acceleration of the fields at the (n, 3) positions'''
+        out = np.zeros_like(pos)
+        for kind, center, axis, strength, radius, falloff in self.fields:
+            rel = pos - center
+            if kind == 'VORTEX':
+                # Distance and swirl measured from the axis line, not the center
+                radial = rel - np.outer(rel @ axis, axis)
+                dist   = np.sqrt((radial * radial).sum(axis=1))
+                push   = np.cross(axis, radial) / np.maximum(dist, 1e-9)[:, None]
+            else:
+                dist = np.sqrt((rel * rel).sum(axis=1))
+                if kind == 'WIND':
+                    push = axis
+                else:
+                    push = -rel / np.maximum(dist, 1e-9)[:, None]
+            w = self._weight(dist, radius, falloff) * strength
+            out += push * (w[:, None] if np.ndim(w) else w)
+        return out
+
+
+# ── Turbulence ──────────────────────────────────────────────────────────
+CURL_RESOLUTION = 32   # Cells per side of the tileable curl-noise grid
+CURL_FEATURES   = 4    # Swirls per grid period along each axis
+
+_curl_grids = {}       # (resolution, seed) -> grid, built or loaded once per process
+
+
+def build_curl_grid(res=CURL_RESOLUTION, seed=0):
+    '''(res, res, res, 3) float32 curl noise: the curl of a smooth random
+    vector potential, so it is divergence-free (particles swirl, they do not
+    bunch up). Made from a band-limited spectrum, it tiles seamlessly;
+    normalised to unit RMS.'''
+    rng  = np.random.default_rng(seed)
+    k    = np.fft.fftfreq(res, 1.0 / res)
+    kz   = np.fft.rfftfreq(res, 1.0 / res)
+    kvec = np.stack(np.meshgrid(k, k, kz, indexing='ij'), axis=-1)
+    kk   = np.sqrt((kvec * kvec).sum(axis=-1))
+    band = np.exp(-(kk / CURL_FEATURES) ** 2)
+    band[0, 0, 0] = 0.0
+    shape = band.shape + (3,)
+    pot   = (rng.standard_normal(shape) + 1j * rng.standard_normal(shape)) * band[..., None]
+    # Curl in frequency space: exact derivatives, periodic by construction
+    curl = 1j * np.cross(kvec, pot)
+    grid = np.stack([np.fft.irfftn(curl[..., c], s=(res, res, res)) for c in range(3)], axis=-1)
+    grid /= np.sqrt((grid * grid).sum(axis=-1).mean())
+    return grid.astype(np.float32)
+
+
+def curl_grid(res=CURL_RESOLUTION, seed=0):
+    '''The shared curl grid of this process. The first caller loads it from
+    the temp directory, or builds it and leaves it there for the other
+    processes (PROCESS workers, the next game run).'''
+    grid = _curl_grids.get((res, seed))
+    if grid is None:
+        path = os.path.join(tempfile.gettempdir(), f'upbge_ps_curl_{res}_{seed}.npy')
+        try:
+            grid = np.load(path)
+            if grid.shape != (res, res, res, 3):
+                grid = None
+        except (OSError, ValueError):
+            grid = None
+        if grid is None:
+            grid = build_curl_grid(res, seed)
+            try:
+                np.save(path, grid)
+            except OSError:
+                pass   # Read-only temp dir: build it again next time
+        _curl_grids[(res, seed)] = grid
+    return grid
+
+
+def sample_curl(grid, coords):
+    '''Trilinear lookup of grid at (n, 3) grid coordinates, wrapping around'''
+    res = grid.shape[0]
+    f   = np.floor(coords)
+    t   = coords - f
+    i0  = f.astype(np.intp) % res
+    i1  = (i0 + 1) % res
+    out = np.zeros(coords.shape)
+    for x, wx in ((i0[:, 0], 1.0 - t[:, 0]), (i1[:, 0], t[:, 0])):
+        for y, wy in ((i0[:, 1], 1.0 - t[:, 1]), (i1[:, 1], t[:, 1])):
+            wxy = wx * wy
+            for z, wz in ((i0[:, 2], 1.0 - t[:, 2]), (i1[:, 2], t[:, 2])):
+                out += grid[x, y, z] * (wxy * wz)[:, None]
+    return out
+
+
+# ── Spatial hash ────────────────────────────────────────────────────────
+_HASH_PRIMES = (73856093, 19349663, 83492791)
+
+
+class SpatialHash:
+    '''Uniform grid over a point set, hashed into a table of about 2n
+    buckets. build() is rebuilt from the position array each step (bucket
+    counts plus one sort, no per-point Python); a radius query then only
+    looks at the points of the few cells around each query point.'''
+
+    def __init__(self, cell):
+        self.cell = float(cell)
+        self.pos  = np.zeros((0, 3))
+
+    def build(self, pos):
+        '''Index the (n, 3) positions; returns self'''
+        self.pos   = pos
+        self._xyz  = [np.ascontiguousarray(pos[:, c]) for c in range(3)]
+        size       = 1 << max(4, (2 * len(pos)).bit_length())
+        self._mask = size - 1
+        cells      = np.floor(pos / self.cell).astype(np.int64)
+        bucket     = ((cells[:, 0] * _HASH_PRIMES[0]) ^ (cells[:, 1] * _HASH_PRIMES[1])
+                      ^ (cells[:, 2] * _HASH_PRIMES[2])) & self._mask
+        self.start = np.concatenate(([0], np.cumsum(np.bincount(bucket, minlength=size))))
+        self.order = np.argsort(bucket, kind='stable')   # Point indices grouped by bucket
+        return self
+
+    def _candidates(self, points, radius):
+        '''(q, j): every indexed point j in a cell around points[q]'''
+        span  = max(1, int(np.ceil(radius / self.cell)))
+        k     = 2 * span + 1
+        if k ** 3 >= len(self.pos):
+            # The cell block outgrows the set: every point is a candidate
+            m, n = len(points), len(self.pos)
+            return np.repeat(np.arange(m), n), np.tile(np.arange(n), m)
+        near  = np.arange(-span, span + 1)
+        cells = np.floor(points / self.cell).astype(np.int64)
+        # Hash each axis of the neighbouring cells once, then combine: (m, k^3) buckets
+        hx = (cells[:, 0, None] + near) * _HASH_PRIMES[0]
+        hy = (cells[:, 1, None] + near) * _HASH_PRIMES[1]
+        hz = (cells[:, 2, None] + near) * _HASH_PRIMES[2]
+        buckets = ((hx[:, :, None, None] ^ hy[:, None, :, None] ^ hz[:, None, None, :])
+                   & self._mask).reshape(len(points), k ** 3)
+        # Cells that hash to the same bucket: scan that bucket once
+        buckets = np.sort(buckets, axis=1)
+        keep = np.ones(buckets.shape, dtype=bool)
+        keep[:, 1:] = buckets[:, 1:] != buckets[:, :-1]
+        q, b  = np.nonzero(keep)[0], buckets[keep]
+        lo    = self.start[b]
+        count = self.start[b + 1] - lo
+        q     = np.repeat(q, count)
+        j     = self.order[np.repeat(lo - np.cumsum(count) + count, count) + np.arange(count.sum())]
+        return q, j
+
+    def _within(self, qx, q, j, radius):
+        '''Keep the (q, j) closer than radius; qx holds the query coordinates'''
+        d2 = np.zeros(len(q))
+        for a, b in zip(qx, self._xyz):
+            d  = a[q] - b[j]
+            d2 += d * d
+        near = d2 < radius * radius
+        return q[near], j[near], np.sqrt(d2[near])
+
+    def query(self, points, radius):
+        '''(q, j, dist): every indexed point j within radius of points[q]'''
+        if not len(self.pos) or not len(points):
+            return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp), np.zeros(0)
+        q, j = self._candidates(points, radius)
+        return self._within([points[:, c] for c in range(3)], q, j, radius)
+
+    def nearest(self, point, max_distance=np.inf):
+        '''(j, dist) of the indexed point nearest to the (3,) point, or None
+        when there is none within max_distance. Searches a growing radius,
+        starting at one cell.'''
+        if not len(self.pos):
+            return None
+        point  = np.asarray(point, dtype=float).reshape(1, 3)
+        radius = self.cell
+        while True:
+            r = min(radius, max_distance)
+            _, j, dist = self.query(point, r)
+            if len(j):
+                k = int(np.argmin(dist))
+                return int(j[k]), float(dist[k])
+            if r >= max_distance:
+                return None
+            radius *= 2.0
+
+    def pairs(self, radius):
+        '''(i, j, dist) of the indexed points closer than radius, each pair once (i < j)'''
+        if len(self.pos) < 2:
+            return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp), np.zeros(0)
+        i, j = self._candidates(self.pos, radius)
+        once = i < j
+        return self._within(self._xyz, i[once], j[once], radius)
+
+
+class ParticleSim:
+    '''Structure-of-arrays particle state plus emission, integration and the
+    per-frame derived values (size, color, billboard basis).
+
+    Adapters own the engine side: they pass emitter / camera transforms in as
+    NumPy arrays, run collision queries with their own ray casts and write the
+    results to KX_GameObjects (game) or bpy data (preview).'''
+
+    def __init__(self, capacity, seed=None):
+        self.rng             = np.random.default_rng(seed)
+        self.time_since_emit = 0.0
+        self.burst_triggered = False
+        self._due            = None   # Sub-step ages of the particles emission_count released
+        self.sampler         = None   # MeshSampler of the SURFACE / VERTEX shapes (set by the adapter)
+        self.turb_time       = 0.0    # Simulated time, scrolls the turbulence
+        self.props           = {}
+        self.live            = np.zeros(0, dtype=np.intp)
+        self._bb_screen      = None   # Shared SCREEN billboard matrix
+        self._bb_cam_y       = None
+        self._bb_cam_z       = None
+        self._bb_generation  = 0
+        self.resize(capacity)
+
+    # ------------------------------------------------------------------
+    # State
+    # ------------------------------------------------------------------
+    def resize(self, capacity):
+        '''(Re)allocate all particle arrays — every particle is dropped'''
+        self.capacity     = capacity
+        self.pos          = np.zeros((capacity, 3))
+        self.prev_pos     = np.zeros((capacity, 3))
+        self.vel          = np.zeros((capacity, 3))
+        self.rot          = np.zeros((capacity, 3))   # Euler XYZ, radians
+        self.ang_vel      = np.zeros((capacity, 3))
+        self.local_offset = np.zeros((capacity, 3))
+        self.age          = np.zeros(capacity)
+        self.life         = np.ones(capacity)
+        self.seed         = np.zeros(capacity)
+        self.cell         = np.zeros(capacity)        # Atlas cell, (index + 0.5) / cells
+        self.bb_dir       = np.zeros((capacity, 3))   # Last written billboard facing direction
+        self.bb_gen       = np.full(capacity, -1, dtype=np.int64)
+        self.active       = np.zeros(capacity, dtype=bool)
+        self.free         = list(range(capacity - 1, -1, -1))   # O(1) stack of free slots
+        self.live         = np.zeros(0, dtype=np.intp)
+
+    @property
+    def active_count(self):
+        return self.capacity - len(self.free)
+
+    def kill(self, idx):
+        '''Return slots to the free stack (adapters hide their objects)'''
+        if len(idx):
+            self.active[idx] = False
+            self.free.extend(idx.tolist())
+
+    def kill_all(self):
+        '''Deactivate every particle, returns the killed slots'''
+        idx = np.flatnonzero(self.active)
+        self.kill(idx)
+        self.live = np.zeros(0, dtype=np.intp)
+        return idx
+
+    def reseed(self, seed):
+        '''Restart the random stream and the emission schedule, so the same
+        props and step sequence reproduce the same particles'''
+        self.rng             = np.random.default_rng(seed)
+        self.time_since_emit = 0.0
+        self.burst_triggered = False
+        self._due            = None
+        self.turb_time       = 0.0
+
+    def get_state(self):
+        '''Compact snapshot of everything the next step depends on. Only active
+        slots are stored, plus the free stack, emission schedule and RNG state.'''
+        idx = np.flatnonzero(self.active)
+        return {
+            'idx':             idx,
+            'arrays':          {name: getattr(self, name)[idx] for name in _STATE_ARRAYS},
+            'free':            list(self.free),
+            'time_since_emit': self.time_since_emit,
+            'burst_triggered': self.burst_triggered,
+            'turb_time':       self.turb_time,
+            'rng':             self.rng.bit_generator.state,
+        }
+
+    def set_state(self, state):
+        '''Restore a get_state() snapshot taken at the same capacity.
+        Billboards are re-oriented on the next billboard_updates().'''
+        idx = state['idx']
+        self.active[:]   = False
+        self.active[idx] = True
+        for name, values in state['arrays'].items():
+            getattr(self, name)[idx] = values
+        self.free            = list(state['free'])
+        self.time_since_emit = state['time_since_emit']
+        self.burst_triggered = state['burst_triggered']
+        self.turb_time       = state['turb_time']
+        self.rng.bit_generator.state = state['rng']
+        self.live       = idx
+        self._bb_screen = None
+        self.bb_dir[:]  = 0.0
+        self.bb_gen[:]  = -1
+
+    # ------------------------------------------------------------------
+    # Properties
+    # ------------------------------------------------------------------
+    def configure(self, props):
+        '''Cache everything that stays constant until the props change.
+        props uses the runtime keys (see ParticleSystem._build_props_from_raw).'''
+        p = props
+        self.props       = p
+        self.is_local    = (p['simulation_space'] == 'LOCAL')
+        self.is_force    = (p['movement_type']    == 'FORCE')
+        self.is_billboard = (p['particle_type']   == 'BILLBOARD')
+        self.size_start  = p['start_size']
+        self.size_delta  = p['end_size'] - p['start_size']
+        self.bounce      = p['bounce_strength']
+        self.damping     = p['damping'] if self.is_force else 0.0
+        self.subframe    = p['subframe_emission']
+        self.normal_velocity = p['normal_velocity']
+        self.field_weight = p['field_weight']
+        self.turbulence  = p['turbulence_strength']
+        self.turb_freq   = CURL_RESOLUTION / CURL_FEATURES / max(p['turbulence_scale'], 1e-3)   # Grid cells per meter
+        self.turb_speed  = p['turbulence_speed']
+        self.curl        = curl_grid() if self.turbulence else None
+        self.interacts   = p['enable_interaction']
+        self.interact_radius = max(p['interaction_radius'], 1e-3)
+        self.repulsion   = p['repulsion']
+        self.cohesion    = p['cohesion']
+        self.contact_damping = p['contact_damping']
+        self.hash        = SpatialHash(self.interact_radius) if self.interacts else None
+        self.on_mesh     = p['emission_shape'] in MESH_SHAPES
+        self.sample_shape = shape_sampler(p)
+
+        grav = np.array(p['gravity'], dtype=float)
+        self.acc_per_sec = grav + np.array(p['force'], dtype=float) if self.is_force else grav
+
+        torq = p['torque']
+        self.has_torque     = self.is_force and (torq[0] != 0.0 or torq[1] != 0.0 or torq[2] != 0.0)
+        self.torque_per_sec = np.radians(np.array(torq, dtype=float))
+        rot = p['rotation']
+        self.rot_has_value  = (not self.is_force) and (rot[0] != 0.0 or rot[1] != 0.0 or rot[2] != 0.0)
+        self.rot_rad        = np.radians(np.array(rot, dtype=float))
+
+        # Color over lifetime (0-10 timing values normalised to 0-1 ratios)
+        self.enable_color = p['enable_color']
+        self.enable_alpha = p['enable_alpha']
+        self.shader_color = (p['color_mode'] == 'SHADER')
+        self.color_start  = np.array(p['color_start'], dtype=float)
+        self.color_end    = np.array(p['color_end'], dtype=float)
+        self.color_t0     = p['color_start_time'] / 10.0
+        self.color_t1     = max(p['color_end_time'] / 10.0, self.color_t0 + 0.0001)
+        self.start_alpha  = p['start_alpha']
+        # Shader mode without color / alpha only needs the seed for a tint and
+        # the cell for an atlas; with neither, no node reads the object color
+        self.writes_color = (self.enable_color or self.enable_alpha or
+                             (self.shader_color and (p['tint_random'] > 0.0 or p['atlas_cells'] > 0)))
+
+        # Atlas cell selection
+        self.atlas_cells  = p['atlas_cells']
+        self.atlas_index  = p['atlas_index']
+        self.atlas_random = p['atlas_random']
+
+        # Billboard orientation
+        self.bb_mode    = p['billboard_mode']
+        axis            = p['billboard_axis']
+        self.bb_axis    = _X_AXIS if axis == 'X' else (_Y_AXIS if axis == 'Y' else _Z_AXIS)
+        self.bb_cos_thr = float(np.cos(np.radians(p['billboard_threshold'])))
+        self._bb_screen = None
+        self.bb_dir[:]  = 0.0    # Mode / threshold may have changed: re-orient everything
+        self.bb_gen[:]  = -1
+
+    # ------------------------------------------------------------------
+    # Emission
+    # ------------------------------------------------------------------
+    def emission_count(self, dt, trigger, rate, burst_count, max_particles):
+        '''How many particles the CONTINUOUS / BURST / one-shot schedule releases
+        this step, capped by max_particles (a soft cap, e.g. from LOD).
+        With sub-frame emission, CONTINUOUS also notes how long ago within the
+        step each of them fell due, for the emit() that follows.'''
+        p        = self.props
+        room     = max(0, min(max_particles, self.capacity) - self.active_count)
+        self._due = None
+        if p['emission_mode'] == 'CONTINUOUS':
+            if not trigger:
+                return 0
+            self.time_since_emit += dt
+            if rate <= 0:
+                return 0
+            interval = 1.0 / rate
+            due = int(self.time_since_emit / interval)
+            self.time_since_emit -= due * interval
+            count = min(due, room)
+            if count and self.subframe and dt > 0.0:
+                # The youngest fell due time_since_emit ago, each older one an interval before
+                self._due = (self.time_since_emit + interval * np.arange(count), dt)
+            return count
+
+        if p['is_one_shot']:
+            if trigger and not self.burst_triggered:
+                self.burst_triggered = True
+                return min(burst_count, room)
+            if not trigger:
+                self.burst_triggered = False
+            return 0
+
+        if trigger:
+            self.time_since_emit += dt
+            if self.time_since_emit >= p['emission_delay']:
+                self.time_since_emit = 0.0
+                return min(burst_count, room)
+        return 0
+
+    def _shape_offsets(self, n):
+        '''Local spawn offsets for n particles from the emission shape, plus
+        their directions (surface normals on a mesh)'''
+        if not self.on_mesh:
+            return self.sample_shape(self.rng, n)
+        if self.sampler is not None:
+            return self.sampler.sample(self.rng, n)
+        return np.zeros((n, 3)), np.zeros((n, 3))   # Mesh not available: emit from the origin
+
+    def emit(self, count, emitter_pos, emitter_ori, emitter_prev=None):
+        '''Spawn up to count particles in one vectorized pass.
+        emitter_pos: (3,) world position, emitter_ori: (3, 3) world rotation.
+        emitter_prev: the emitter's (pos, ori) at the start of the step, or None.
+        After a sub-frame emission_count, each particle starts where the
+        emitter was when it fell due and is advanced by its sub-step age.
+        Returns the slot indices that were activated.'''
+        due, self._due = self._due, None
+        count = min(count, len(self.free))
+        if count <= 0:
+            return np.zeros(0, dtype=np.intp)
+        idx = np.array(self.free[-count:][::-1], dtype=np.intp)
+        del self.free[-count:]
+
+        p   = self.props
+        rng = self.rng
+        ages = None
+        pos, ori = emitter_pos, emitter_ori
+        if due is not None:
+            ages = due[0][:count]
+            if emitter_prev is not None:
+                # Emitter transform when each particle fell due (0 = now, 1 = step start)
+                back = np.minimum(ages / due[1], 1.0)
+                pos  = emitter_pos + (emitter_prev[0] - emitter_pos) * back[:, None]
+                if (self.is_local or self.on_mesh) and not np.array_equal(emitter_prev[1], emitter_ori):
+                    ori = rotations_toward(emitter_ori, emitter_prev[1], back)
+
+        def turn(v):
+            '''Emitter-local vectors to world space'''
+            return np.einsum('nij,nj->ni', ori, v) if ori.ndim == 3 else v @ ori.T
+
+        # Shapes turn with a local emitter; mesh points sit on it whatever the space
+        offsets, dirs = self._shape_offsets(count)
+        follow = self.is_local or self.on_mesh
+        self.pos[idx] = pos + (turn(offsets) if follow else offsets)
+
+        vr  = p['velocity_random']
+        vel = np.array(p['start_velocity'], dtype=float) + (rng.random((count, 3)) - 0.5) * (2.0 * vr)
+        self.vel[idx] = turn(vel) if self.is_local else vel
+        if self.normal_velocity:
+            self.vel[idx] += turn(dirs * self.normal_velocity) if follow else dirs * self.normal_velocity
+
+        self.local_offset[idx] = offsets
+        self.prev_pos[idx]     = self.pos[idx]
+        self.age[idx]          = 0.0
+        self.life[idx]         = p['lifetime'] * (1.0 + (rng.random(count) - 0.5) * p['lifetime_random'])
+        self.rot[idx]          = 0.0
+        self.ang_vel[idx]      = 0.0
+        self.seed[idx]         = rng.random(count)
+        cells = self.atlas_cells
+        if cells:
+            cell_idx = self.atlas_index + (rng.random(count) * self.atlas_random).astype(np.intp)
+            self.cell[idx] = (np.minimum(cell_idx, cells - 1) + 0.5) / cells
+        self.bb_dir[idx]  = 0.0
+        self.bb_gen[idx]  = -1
+        self.active[idx]  = True
+        if ages is not None:
+            self.age[idx] = ages
+            self._move_forward(idx, ages, emitter_ori)
+        return idx
+
+    def prewarm(self, emitter_pos, emitter_ori):
+        '''Fill a CONTINUOUS emitter with its steady-state population in one
+        vectorized pass: one candidate per emission interval back to the
+        longest possible lifetime, the ones still alive are spawned with their
+        age and moved with the closed-form motion (collisions are skipped).
+        Returns the activated slots.'''
+        p    = self.props
+        rate = p['emission_rate']
+        if p['emission_mode'] != 'CONTINUOUS' or not p['trigger'] or rate <= 0:
+            return np.zeros(0, dtype=np.intp)
+        rng      = self.rng
+        max_life = p['lifetime'] * (1.0 + 0.5 * p['lifetime_random'])
+        count    = int(rate * max_life)
+        ages     = (np.arange(count) + rng.random()) / rate    # Youngest first
+        lives    = p['lifetime'] * (1.0 + (rng.random(count) - 0.5) * p['lifetime_random'])
+        alive    = ages < lives
+        room     = max(0, min(p['max_particles'], self.capacity) - self.active_count)
+        ages     = ages[alive][:room]
+        self._due = None
+        idx      = self.emit(len(ages), emitter_pos, emitter_ori)
+        if not len(idx):
+            return idx
+        self.age[idx]  = ages
+        self.life[idx] = lives[alive][:room]
+        self._move_forward(idx, ages, emitter_ori)
+        self.time_since_emit = 0.0
+        return idx
+
+    def _move_forward(self, idx, ages, emitter_ori):
+        '''Move freshly emitted slots forward by ages seconds with the
+        closed-form motion (collisions are skipped)'''
+        t   = ages[:, None]
+        acc = emitter_ori @ self.acc_per_sec if self.is_local else self.acc_per_sec
+        v0  = self.vel[idx]
+        d   = self.damping
+        if d > 0.0:
+            # dv/dt = acc - d*v  ->  v tends to the terminal velocity acc / d
+            term  = acc / d
+            decay = np.exp(-d * t)
+            self.pos[idx] += term * t + (v0 - term) * (1.0 - decay) / d
+            self.vel[idx]  = term + (v0 - term) * decay
+        else:
+            self.pos[idx] += v0 * t + 0.5 * acc * t * t
+            self.vel[idx]  = v0 + acc * t
+        self.prev_pos[idx] = self.pos[idx]
+
+        if not self.is_billboard:
+            if self.has_torque:
+                tq = self.torque_per_sec
+                if d > 0.0:
+                    decay = np.exp(-d * t)
+                    self.ang_vel[idx] = tq / d * (1.0 - decay)
+                    self.rot[idx]     = tq / d * (t - (1.0 - decay) / d)
+                else:
+                    self.ang_vel[idx] = tq * t
+                    self.rot[idx]     = 0.5 * tq * t * t
+            elif self.rot_has_value:
+                self.rot[idx] = self.rot_rad * (ages / self.life[idx])[:, None]
+
+    # ------------------------------------------------------------------
+    # Integration
+    # ------------------------------------------------------------------
+    def step(self, dt, emitter_ori=None, fields=None):
+        '''Age, kill and integrate every active particle, pushed by the
+        turbulence and the ForceFields snapshot fields (scaled by
+        field_weight) if given.
+        Returns the slots that died; self.live holds the survivors.'''
+        self.turb_time += dt
+        act = np.flatnonzero(self.active)
+        if not act.size:
+            self.live = act
+            return act
+        dead_mask = kernels.age(act, self.age, self.life, dt)
+        dead = act[dead_mask]
+        self.kill(dead)
+        live = act[~dead_mask]
+        self.live = live
+        if not live.size:
+            return dead
+
+        acc = self.acc_per_sec
+        if self.is_local and emitter_ori is not None:
+            acc = emitter_ori @ acc
+        damp = max(0.0, 1.0 - self.damping * dt) if self.is_force else 1.0   # Large dt must not reverse velocity
+        if fields is not None and self.field_weight:
+            self.vel[live] += fields.accel(self.pos[live]) * (self.field_weight * dt)
+        if self.curl is not None:
+            self.vel[live] += self.turbulence_accel(self.pos[live]) * dt
+        if self.interacts:
+            self.interact(live, dt)
+        kernels.integrate(live, self.pos, self.prev_pos, self.vel, acc, dt, damp)
+
+        # Rotation — only meaningful for MESH particles, billboards get a basis instead
+        if not self.is_billboard:
+            if self.has_torque:
+                kernels.spin(live, self.rot, self.ang_vel, self.torque_per_sec, dt, damp)
+            elif self.rot_has_value:
+                kernels.spin_linear(live, self.rot, self.rot_rad, self.life, dt)
+        return dead
+
+    def interact(self, live, dt):
+        '''Particle-particle forces between the live slots, over the pairs
+        closer than interact_radius: repulsion pushes them apart (strongest
+        in contact), cohesion pulls them together at mid range (liquid-like
+        blobs), contact_damping takes that share of the speed two particles
+        close in with (soft collisions)'''
+        if len(live) < 2:
+            return
+        pos = self.pos[live]
+        i, j, dist = self.hash.build(pos).pairs(self.interact_radius)
+        if not len(i):
+            return
+        normal = (pos[i] - pos[j]) / np.maximum(dist, 1e-9)[:, None]   # j -> i
+        q      = 1.0 - dist / self.interact_radius
+        push   = (self.repulsion * q - self.cohesion * 4.0 * q * (1.0 - q)) * dt
+        if self.contact_damping:
+            vel     = self.vel[live]
+            closing = np.minimum(((vel[i] - vel[j]) * normal).sum(axis=1), 0.0)
+            push   -= 0.5 * self.contact_damping * closing
+        impulse = normal * push[:, None]
+        n  = len(live)
+        dv = np.empty((n, 3))
+        for c in range(3):
+            dv[:, c] = (np.bincount(i, impulse[:, c], minlength=n)
+                        - np.bincount(j, impulse[:, c], minlength=n))
+        self.vel[live] += dv
+
+    def turbulence_accel(self, pos):
+        '''Curl-noise acceleration at the (n, 3) positions; the noise drifts
+        up at turb_speed, so smoke keeps rolling even where it hangs still'''
+        coords = pos * self.turb_freq
+        coords[:, 2] -= self.turb_speed * self.turb_time * self.turb_freq
+        return sample_curl(self.curl, coords) * self.turbulence
+
+    def collide(self, idx, hit_pos, hit_normal):
+        '''Bounce response for particles whose ray hit a surface this step'''
+        kernels.bounce(idx, self.pos, self.vel, hit_pos, hit_normal, self.bounce)
+
+    # ------------------------------------------------------------------
+    # Derived per-frame values
+    # ------------------------------------------------------------------
+    def life_ratio(self, idx):
+        return self.age[idx] / self.life[idx]
+
+    def sizes(self, idx):
+        return self.size_start + self.size_delta * self.life_ratio(idx)
+
+    def colors(self, idx):
+        '''(n, 4) object colors — final RGBA in CPU mode, (age / life, seed,
+        cell, 1 / life) in Shader mode'''
+        return kernels.colors(idx, self.age, self.life, self.seed, self.cell,
+                              self.shader_color, self.enable_color, self.enable_alpha,
+                              self.color_start, self.color_end, self.color_t0,
+                              self.color_t1, self.start_alpha)
+
+    def billboard_updates(self, idx, cam_pos, cam_ori):
+        '''Billboards among idx whose orientation must be rewritten this frame.
+        Returns (slots, (n, 3, 3) rotation matrices). Columns: X = right,
+        Y = away from the camera (the plane's front face looks at it), Z = up.'''
+        thr = self.bb_cos_thr
+        if self.bb_mode == 'SCREEN':
+            cam_y = cam_ori[:, 1]
+            cam_z = cam_ori[:, 2]
+            if (self._bb_screen is None or cam_z @ self._bb_cam_z < thr
+                    or cam_y @ self._bb_cam_y < thr):
+                self._bb_screen = np.column_stack((cam_ori[:, 0], -cam_z, cam_y))
+                self._bb_cam_y  = cam_y.copy()
+                self._bb_cam_z  = cam_z.copy()
+                self._bb_generation += 1
+            need = idx[self.bb_gen[idx] != self._bb_generation]
+            self.bb_gen[need] = self._bb_generation
+            return need, np.broadcast_to(self._bb_screen, (len(need), 3, 3))
+
+        return kernels.face_camera(idx, self.pos, self.bb_dir, cam_pos, self.bb_axis,
+                                   self.bb_mode == 'AXIS', thr)
+
+
+# Per-slot arrays a ParticleBatch packs for its members
+_SLOT_ARRAYS = _STATE_ARRAYS + ('bb_dir', 'bb_gen', 'active')
+
+
+class ParticleBatch:
+    '''Many small ParticleSims packed into shared arrays, so they age, cull
+    and integrate in one vectorized pass instead of one step() each. Every
+    member keeps its own slot range [offset, offset + capacity): its arrays
+    are views into the packed ones, so emission, collision and the derived
+    values keep working per member unchanged. Members must share key().'''
+
+    def __init__(self):
+        self.members = []
+
+    @staticmethod
+    def key(sim):
+        '''Members of one batch share the rotation path of the step'''
+        if sim.is_billboard:
+            return 'NONE'
+        return 'TORQUE' if sim.has_torque else ('LINEAR' if sim.rot_has_value else 'NONE')
+
+    def add(self, sim):
+        self.members.append(sim)
+        self._pack()
+
+    def remove(self, sim):
+        self.members.remove(sim)
+        for name in _SLOT_ARRAYS:   # Own arrays again, contents kept
+            setattr(sim, name, getattr(sim, name).copy())
+        if self.members:
+            self._pack()
+
+    def _pack(self):
+        '''Reallocate the packed arrays for the current members and rebind
+        each member's arrays to its slot range (contents are kept)'''
+        caps         = [m.capacity for m in self.members]
+        self.offsets = np.concatenate(([0], np.cumsum(caps))).astype(np.intp)
+        self.owner   = np.repeat(np.arange(len(caps)), caps)
+        for name in _SLOT_ARRAYS:
+            packed = np.concatenate([getattr(m, name) for m in self.members])
+            setattr(self, name, packed)
+            for m, a, b in zip(self.members, self.offsets[:-1], self.offsets[1:]):
+                setattr(m, name, packed[a:b])
+
+    def step(self, dt, emitter_oris, fields=None):
+        '''ParticleSim.step() for every member at once; emitter_oris[k] is
+        member k's world rotation. Sets each member's live and returns the
+        members' dead slots (member-local), in member order.'''
+        members   = self.members
+        for m in members:
+            m.turb_time += dt
+        act       = np.flatnonzero(self.active)
+        dead_mask = kernels.age(act, self.age, self.life, dt)
+        dead      = act[dead_mask]
+        live      = act[~dead_mask]
+
+        if live.size:
+            acc  = np.array([ori @ m.acc_per_sec if (m.is_local and ori is not None) else m.acc_per_sec
+                             for m, ori in zip(members, emitter_oris)])
+            damp = np.array([max(0.0, 1.0 - m.damping * dt) if m.is_force else 1.0 for m in members])
+            if fields is not None:
+                # One field evaluation for the particles of every member that feels them
+                weight = np.array([m.field_weight for m in members])[self.owner[live]]
+                on     = weight != 0.0
+                felt   = live[on]
+                if felt.size:
+                    self.vel[felt] += fields.accel(self.pos[felt]) * (weight[on] * dt)[:, None]
+            if any(m.curl is not None for m in members):
+                # Each member's own strength, scale and scroll, one grid lookup for all
+                strength = np.array([m.turbulence for m in members])
+                freq     = np.array([m.turb_freq for m in members])
+                scroll   = np.array([m.turb_speed * m.turb_time * m.turb_freq for m in members])
+                felt     = live[strength[self.owner[live]] != 0.0]
+                if felt.size:
+                    own    = self.owner[felt]
+                    coords = self.pos[felt] * freq[own][:, None]
+                    coords[:, 2] -= scroll[own]
+                    self.vel[felt] += sample_curl(curl_grid(), coords) * (strength[own] * dt)[:, None]
+            if any(m.interacts for m in members):
+                # Particles only meet those of their own emitter
+                l_at = np.searchsorted(live, self.offsets)
+                for k, m in enumerate(members):
+                    if m.interacts:
+                        m.interact(live[l_at[k]:l_at[k + 1]] - self.offsets[k], dt)
+            kernels.integrate_owned(live, self.owner, self.pos, self.prev_pos, self.vel, acc, damp, dt)
+            rot_key = ParticleBatch.key(members[0])
+            if rot_key == 'TORQUE':
+                torque = np.array([m.torque_per_sec for m in members])
+                kernels.spin_owned(live, self.owner, self.rot, self.ang_vel, torque, damp, dt)
+            elif rot_key == 'LINEAR':
+                rot_rad = np.array([m.rot_rad for m in members])
+                kernels.spin_linear_owned(live, self.owner, self.rot, rot_rad, self.life, dt)
+
+        # act is sorted, so every member's slots are one contiguous run
+        off   = self.offsets
+        d_at  = np.searchsorted(dead, off)
+        l_at  = np.searchsorted(live, off)
+        deads = []
+        for k, m in enumerate(members):
+            d = dead[d_at[k]:d_at[k + 1]] - off[k]
+            m.kill(d)
+            m.live = live[l_at[k]:l_at[k + 1]] - off[k]
+            deads.append(d)
+        return deads
+"""
+
+# Worker process loop for the runtime's PROCESS update mode. The runtime
+# spawns processes that execute SIM_CORE_SOURCE + SIM_WORKER_SOURCE with the
+# command pipe injected as the global conn and the core's text as
+# SIM_CORE_SOURCE (for use_kernels' on-disk cache).
+SIM_WORKER_SOURCE = """
+# ── UPBGE Particle System — simulation worker process ───────────────────
+from multiprocessing import shared_memory
+
+
+def serve(conn):
+    '''Command loop. Every message is (op, key, ...) where key names the
+    emitter; only step (finished buffer index) and close (state) reply,
+    as (key, reply).'''
+    use_kernels(source=SIM_CORE_SOURCE)
+    sims = {}   # key -> (ParticleSim, SharedMemory, frame views)
+    while True:
+        msg     = conn.recv()
+        op, key = msg[0], msg[1]
+        if op == 'quit':
+            break
+        if op == 'open':
+            name, capacity, state = msg[2:]
+            shm = shared_memory.SharedMemory(name=name)
+            sim = ParticleSim(capacity)
+            sim.set_state(state)
+            sims[key] = (sim, shm, frame_views(shm.buf, capacity))
+        elif op == 'close':
+            sim, shm, frames = sims.pop(key)
+            del frames   # Views must be gone before the mapping closes
+            shm.close()
+            conn.send((key, sim.get_state()))
+        elif op == 'props':
+            sims[key][0].configure(msg[2])
+        elif op == 'sampler':
+            sims[key][0].sampler = MeshSampler(*msg[2]) if msg[2] is not None else None
+        elif op == 'kill':
+            sims[key][0].kill_all()
+        elif op == 'step':
+            buf, steps, dt, emit, emitter_pos, emitter_ori, emitter_prev, fields, hits = msg[2:]
+            sim, shm, frames = sims[key]
+            fields = ForceFields(fields) if fields is not None else None
+            if hits is not None:
+                sim.collide(*hits)
+            for k in range(steps):
+                if emit is not None:
+                    count = sim.emission_count(dt, *emit)
+                    if count:
+                        sim.emit(count, *emitter_at_step(emitter_pos, emitter_ori, emitter_prev, k, steps))
+                sim.step(dt, emitter_ori, fields)
+            write_frame(frames[buf], sim)
+            conn.send((key, buf))
+
+
+serve(conn)   # conn and SIM_CORE_SOURCE are injected by the runtime's SimWorkers
+"""
+
+sim_core = types.ModuleType("ps_sim_core")
+exec(SIM_CORE_SOURCE, sim_core.__dict__)
 
 # Wire shape visualization
 def update_wire_shape(self, context):
@@ -22,67 +1676,50 @@ def update_wire_shape(self, context):
         return
     
     ps = obj.particle_system_props
+    shape = ps.emission_shape if ps.enabled else None
     
     # Wire names for each shape type
     wire_box_name = f"PS_Wire_Box_{obj.name}"
     wire_sphere_name = f"PS_Wire_Sphere_{obj.name}"
+    wire_shape_name = f"PS_Wire_Shape_{obj.name}"
     
-    # Get existing wires
+    # Get existing wires, create the current shape's on first use
     wire_box = bpy.data.objects.get(wire_box_name)
     wire_sphere = bpy.data.objects.get(wire_sphere_name)
-    
-    # If disabled or POINT shape, hide all wires
-    if not ps.enabled or ps.emission_shape == 'POINT':
-        if wire_box:
-            wire_box.hide_viewport = True
-            wire_box.hide_render = True
-        if wire_sphere:
-            wire_sphere.hide_viewport = True
-            wire_sphere.hide_render = True
-        update_game_prop(self, context)
-        return
-    
-    # Create Box wire if it doesn't exist
-    if not wire_box:
+    wire_shape = bpy.data.objects.get(wire_shape_name)
+    if shape == 'BOX' and not wire_box:
         wire_box = create_box_wire(obj, wire_box_name)
-    
-    # Create Sphere wire if it doesn't exist
-    if not wire_sphere:
+    elif shape == 'SPHERE' and not wire_sphere:
         wire_sphere = create_sphere_wire(obj, wire_sphere_name)
+    elif shape in SHAPE_WIRES and not wire_shape:
+        wire_shape = create_shape_wire(obj, wire_shape_name)
     
-    # Show/hide based on current shape
-    if ps.emission_shape == 'BOX':
-
-        wire_box.parent = obj
-        wire_box.matrix_parent_inverse = obj.matrix_world.__class__()
-        
-        # Keep wire centered on emitter in local space
-        wire_box.location = (0, 0, 0)
-        wire_box.rotation_euler = (0, 0, 0)
-        
-        wire_box.hide_viewport = False
-        wire_box.hide_render = True
-        wire_box.scale = ps.emission_box_size
-        if wire_sphere:
-            wire_sphere.hide_viewport = True
-            wire_sphere.hide_render = True
-    
-    elif ps.emission_shape == 'SPHERE':
+    # Show the current shape's wire, hide the others (POINT and mesh shapes have none)
+    shown = {'BOX': wire_box, 'SPHERE': wire_sphere}.get(shape, wire_shape if shape in SHAPE_WIRES else None)
+    for wire in (wire_box, wire_sphere, wire_shape):
+        if wire and wire is not shown:
+            wire.hide_viewport = True
+            wire.hide_render = True
+    
+    if shown:
         # Parent to emitter with identity inverse so local origin = emitter origin
-        wire_sphere.parent = obj
-        wire_sphere.matrix_parent_inverse = obj.matrix_world.__class__()
+        shown.parent = obj
+        shown.matrix_parent_inverse = obj.matrix_world.__class__()
         
         # Keep wire centered on emitter in local space
-        wire_sphere.location = (0, 0, 0)
-        wire_sphere.rotation_euler = (0, 0, 0)
+        shown.location = (0, 0, 0)
+        shown.rotation_euler = (0, 0, 0)
         
-        wire_sphere.hide_viewport = False
-        wire_sphere.hide_render = True
-        radius = ps.emission_sphere_radius
-        wire_sphere.scale = (radius, radius, radius)
-        if wire_box:
-            wire_box.hide_viewport = True
-            wire_box.hide_render = True
+        shown.hide_viewport = False
+        shown.hide_render = True
+        if shape == 'BOX':
+            shown.scale = ps.emission_box_size
+        elif shape == 'SPHERE':
+            radius = ps.emission_sphere_radius
+            shown.scale = (radius, radius, radius)
+        else:
+            # Depends on more than a scale: rebuilt from the current settings
+            build_shape_wire(shown.data, ps)
     
     update_game_prop(self, context)
 
@@ -204,6 +1841,142 @@ def create_sphere_wire(obj, wire_name):
     
     return wire_obj
 
+# Shapes drawn by the rebuilt wire of create_shape_wire / build_shape_wire
+SHAPE_WIRES = {'HEMISPHERE', 'CONE', 'DISK', 'RING', 'EDGE'}
+
+def create_shape_wire(obj, wire_name):
+    """Create the wire object shared by the SHAPE_WIRES shapes (called once,
+    its mesh is rebuilt by build_shape_wire when a setting changes)"""
+    mesh = bpy.data.meshes.new(f"PS_WireMesh_Shape_{obj.name}")
+    wire_obj = bpy.data.objects.new(wire_name, mesh)
+    
+    # Link to collection
+    bpy.context.collection.objects.link(wire_obj)
+    
+    # Display properties
+    wire_obj.display_type = 'WIRE'
+    wire_obj.show_in_front = True
+    wire_obj.hide_render = True
+    wire_obj.hide_select = True
+    wire_obj.color = (0, 1, 1, 1)
+    
+    return wire_obj
+
+def build_shape_wire(mesh, ps):
+    """Fill mesh with the gizmo of the current shape, in emitter-local space:
+    hemisphere dome, cone base and spread (shown over one unit), disk, ring
+    (both edges) or edge line"""
+    import math
+    
+    verts, edges = [], []
+    
+    def polyline(points, closed):
+        base = len(verts)
+        verts.extend(points)
+        count = len(points) if closed else len(points) - 1
+        edges.extend((base + i, base + (i + 1) % len(points)) for i in range(count))
+    
+    segments = 32
+    angles = [2 * math.pi * i / segments for i in range(segments)]
+    
+    def circle(radius, z=0.0):
+        polyline([(radius * math.cos(a), radius * math.sin(a), z) for a in angles], True)
+    
+    shape = ps.emission_shape
+    radius = ps.emission_sphere_radius
+    if shape == 'EDGE':
+        half = ps.emission_edge_length * 0.5
+        polyline([(-half, 0.0, 0.0), (half, 0.0, 0.0)], False)
+    else:
+        circle(radius)
+    
+    if shape == 'RING' and ps.emission_inner_radius > 0.0:
+        circle(radius * ps.emission_inner_radius)
+    
+    elif shape == 'HEMISPHERE':
+        # XZ and YZ half arcs over the base circle
+        half = [math.pi * i / (segments // 2) for i in range(segments // 2 + 1)]
+        polyline([(radius * math.cos(a), 0.0, radius * math.sin(a)) for a in half], False)
+        polyline([(0.0, radius * math.cos(a), radius * math.sin(a)) for a in half], False)
+    
+    elif shape == 'CONE':
+        # Rim directions tilt by the full angle: top circle one unit up, four side lines
+        top = radius + math.tan(math.radians(min(ps.emission_cone_angle, 89.0)))
+        circle(top, 1.0)
+        for a in angles[::segments // 4]:
+            polyline([(radius * math.cos(a), radius * math.sin(a), 0.0),
+                      (top * math.cos(a), top * math.sin(a), 1.0)], False)
+    
+    mesh.clear_geometry()
+    mesh.from_pydata(verts, edges, [])
+    mesh.update()
+
+def settings_to_props(ps):
+    """Addon settings as the props dict the runtime builds from its game
+    properties (same keys), so the shared core can be configured from either"""
+    return {
+        'enabled':                ps.enabled,
+        'trigger':                ps.trigger_enabled,
+        'emission_mode':          ps.emission_mode,
+        'emission_shape':         ps.emission_shape,
+        'emission_box_size':      tuple(ps.emission_box_size),
+        'emission_sphere_radius': ps.emission_sphere_radius,
+        'vertex_group':           ps.emission_vertex_group,
+        'normal_velocity':        ps.normal_velocity,
+        'emission_shell':         ps.emission_shell,
+        'emission_inner_radius':  ps.emission_inner_radius,
+        'emission_cone_angle':    ps.emission_cone_angle,
+        'emission_edge_length':   ps.emission_edge_length,
+        'max_particles':          ps.max_particles,
+        'emission_rate':          ps.emission_rate,
+        'emission_delay':         ps.emission_delay,
+        'burst_count':            ps.burst_count,
+        'is_one_shot':            ps.is_one_shot,
+        'prewarm':                ps.prewarm,
+        'subframe_emission':      ps.subframe_emission,
+        'time_scale':             ps.time_scale,
+        'lifetime':               ps.lifetime,
+        'lifetime_random':        ps.lifetime_random,
+        'start_size':             ps.start_size,
+        'end_size':               ps.end_size,
+        'start_velocity':         tuple(ps.start_velocity),
+        'velocity_random':        ps.velocity_random,
+        'gravity':                tuple(ps.gravity),
+        'field_weight':           ps.field_weight,
+        'turbulence_strength':    ps.turbulence_strength,
+        'turbulence_scale':       ps.turbulence_scale,
+        'turbulence_speed':       ps.turbulence_speed,
+        'simulation_space':       ps.simulation_space,
+        'movement_type':          ps.movement_type,
+        'force':                  tuple(ps.force),
+        'torque':                 tuple(ps.torque),
+        'damping':                ps.damping,
+        'enable_collision':       ps.enable_collision,
+        'bounce_strength':        ps.bounce_strength,
+        'enable_interaction':     ps.enable_interaction,
+        'interaction_radius':     ps.interaction_radius,
+        'repulsion':              ps.repulsion,
+        'cohesion':               ps.cohesion,
+        'contact_damping':        ps.contact_damping,
+        'rotation':               tuple(ps.rotation),
+        'particle_type':          ps.particle_type,
+        'color_start':            tuple(ps.color_start),
+        'color_end':              tuple(ps.color_end),
+        'color_start_time':       ps.color_start_time,
+        'color_end_time':         ps.color_end_time,
+        'start_alpha':            ps.start_alpha,
+        'enable_color':           ps.enable_color,
+        'enable_alpha':           ps.enable_alpha,
+        'color_mode':             ps.color_mode,
+        'tint_random':            ps.tint_random,
+        'atlas_cells':            ps.atlas_columns * ps.atlas_rows if ps.use_atlas else 0,
+        'atlas_index':            ps.atlas_index,
+        'atlas_random':           ps.atlas_random_cells,
+        'billboard_mode':         ps.billboard_mode,
+        'billboard_axis':         ps.billboard_axis,
+        'billboard_threshold':    ps.billboard_angle_threshold,
+    }
+
 def update_game_prop(self, context):
     obj = context.object
     if not obj: return
@@ -215,11 +1988,19 @@ def update_game_prop(self, context):
         'emission_mode': 'ps_emission_mode',
         'emission_shape': 'ps_emission_shape',
         'emission_sphere_radius': 'ps_emission_sphere_radius',
+        'emission_vertex_group': 'ps_vertex_group',
+        'normal_velocity': 'ps_normal_velocity',
+        'emission_shell': 'ps_emission_shell',
+        'emission_inner_radius': 'ps_emission_inner',
+        'emission_cone_angle': 'ps_cone_angle',
+        'emission_edge_length': 'ps_edge_length',
         'max_particles': 'ps_max_particles',
         'emission_rate': 'ps_emission_rate',
         'emission_delay': 'ps_emission_delay',
         'burst_count': 'ps_burst_count',
         'is_one_shot': 'ps_is_one_shot',
+        'prewarm': 'ps_prewarm',
+        'subframe_emission': 'ps_subframe',
         'lifetime': 'ps_lifetime',
         'lifetime_random': 'ps_lifetime_random',
         'start_size': 'ps_start_size',
@@ -230,12 +2011,24 @@ def update_game_prop(self, context):
         'damping': 'ps_damping',
         'enable_collision': 'ps_enable_collision',
         'bounce_strength': 'ps_bounce_strength',
+        'enable_interaction': 'ps_interaction',
+        'interaction_radius': 'ps_interact_radius',
+        'repulsion': 'ps_repulsion',
+        'cohesion': 'ps_cohesion',
+        'contact_damping': 'ps_contact_damping',
         'particle_type': 'ps_particle_type',
         'start_alpha': 'ps_start_alpha',
         'color_start_time': 'ps_color_start_time',
         'color_end_time': 'ps_color_end_time',
         'enable_color': 'ps_enable_color',
         'enable_alpha': 'ps_enable_alpha',
+        'color_mode': 'ps_color_mode',
+        'tint_random': 'ps_tint_random',
+        'atlas_index': 'ps_atlas_index',
+        'atlas_random_cells': 'ps_atlas_random',
+        'billboard_mode': 'ps_billboard_mode',
+        'billboard_axis': 'ps_billboard_axis',
+        'billboard_angle_threshold': 'ps_billboard_threshold',
         'enable_lod':               'ps_enable_lod',
         'lod_start_distance':       'ps_lod_start',
         'lod1_distance':            'ps_lod1_dist',
@@ -259,6 +2052,19 @@ def update_game_prop(self, context):
         'lod3_disable_collision':   'ps_lod3_no_coll',
         'lod3_disable_emitting':    'ps_lod3_no_emit',
         'lod3_destroy_particles':   'ps_lod3_destroy',
+        'write_epsilon_position':   'ps_write_eps_pos',
+        'write_epsilon_scale':      'ps_write_eps_scale',
+        'write_epsilon_color':      'ps_write_eps_color',
+        'cache_loop':               'ps_cache_loop',
+        'update_mode':              'ps_update_mode',
+        'fixed_step':               'ps_fixed_step',
+        'fixed_step_rate':          'ps_fixed_rate',
+        'max_substeps':             'ps_max_substeps',
+        'time_scale':               'ps_time_scale',
+        'field_weight':             'ps_field_weight',
+        'turbulence_strength':      'ps_turbulence',
+        'turbulence_scale':         'ps_turb_scale',
+        'turbulence_speed':         'ps_turb_speed',
     }
     
     for addon_prop, game_prop in props_map.items():
@@ -310,6 +2116,32 @@ def update_game_prop(self, context):
         obj.game.properties['ps_color_end_g'].value = self.color_end[1]
         obj.game.properties['ps_color_end_b'].value = self.color_end[2]
 
+    if 'ps_atlas_cells' in obj.game.properties:
+        cells = self.atlas_columns * self.atlas_rows if self.use_atlas else 0
+        obj.game.properties['ps_atlas_cells'].value = cells
+
+    if 'ps_cache_file' in obj.game.properties:
+        obj.game.properties['ps_cache_file'].value = self.cache_file if self.use_cache else ''
+
+def update_field_props(self, context):
+    """Mirror the force field settings into the ps_field* game properties the
+    runtime's ParticleManager reads (an empty ps_field switches the field off)"""
+    obj = context.object
+    if not obj: return
+
+    values = (
+        ('ps_field',          'STRING', self.field_type if self.enabled else ''),
+        ('ps_field_strength', 'FLOAT',  self.strength),
+        ('ps_field_radius',   'FLOAT',  self.radius),
+        ('ps_field_falloff',  'STRING', self.falloff),
+    )
+    for name, type, value in values:
+        if name not in obj.game.properties:
+            if not self.enabled:
+                continue   # Never turned on: leave the object untagged
+            bpy.ops.object.game_property_new(type=type, name=name)
+        obj.game.properties[name].value = value
+
 # Particle System Properties
 class ParticleSystemProperties(bpy.types.PropertyGroup):
     enabled: bpy.props.BoolProperty(
@@ -341,10 +2173,53 @@ class ParticleSystemProperties(bpy.types.PropertyGroup):
             ('POINT', "Point", "Emit from center point"),
             ('BOX', "Box", "Emit from random points within a box volume"),
             ('SPHERE', "Sphere", "Emit from random points within a sphere volume"),
+            ('HEMISPHERE', "Hemisphere", "Emit from random points within the upper (+Z) half of a sphere"),
+            ('CONE', "Cone", "Emit from a disk, directions opening from +Z by the cone angle"),
+            ('DISK', "Disk", "Emit from random points on a flat disk facing +Z"),
+            ('RING', "Ring", "Emit from a flat ring, directions pointing outward"),
+            ('EDGE', "Edge", "Emit from random points along a line on the X axis"),
+            ('SURFACE', "Surface", "Emit from random points on the emitter mesh's faces, spread by area"),
+            ('VERTEX', "Vertices", "Emit from the emitter mesh's vertices"),
         ],
         default='POINT',
         update=update_wire_shape
     )
+    emission_vertex_group: bpy.props.StringProperty(
+        name="Vertex Group",
+        description="Weight the mesh emission by this vertex group (empty = whole mesh)",
+        default="",
+        update=update_game_prop
+    )
+    normal_velocity: bpy.props.FloatProperty(
+        name="Normal Velocity",
+        description="Initial speed along the shape's direction at the spawn point: outward for Point, Sphere, Hemisphere, Ring and box faces, +Z for Disk, Edge and box volume, the spread for Cone, the normal on a mesh",
+        default=0.0, soft_min=-10.0, soft_max=10.0,
+        update=update_game_prop
+    )
+    emission_shell: bpy.props.BoolProperty(
+        name="Shell",
+        description="Emit from the shape's boundary (box faces, sphere surface, disk / ring / cone rim) instead of its inside",
+        default=False,
+        update=update_game_prop
+    )
+    emission_inner_radius: bpy.props.FloatProperty(
+        name="Inner Radius",
+        description="Inner edge of the ring as a fraction of its radius",
+        default=0.5, min=0.0, max=1.0,
+        update=update_wire_shape
+    )
+    emission_cone_angle: bpy.props.FloatProperty(
+        name="Angle",
+        description="Opening angle of the cone, from its axis to its side (degrees)",
+        default=25.0, min=0.0, max=90.0,
+        update=update_wire_shape
+    )
+    emission_edge_length: bpy.props.FloatProperty(
+        name="Length",
+        description="Length of the emission edge",
+        default=1.0, min=0.0, soft_max=100.0,
+        update=update_wire_shape
+    )
     
     emission_box_size: bpy.props.FloatVectorProperty(
         name="Box Size",
@@ -357,7 +2232,7 @@ class ParticleSystemProperties(bpy.types.PropertyGroup):
     
     emission_sphere_radius: bpy.props.FloatProperty(
         name="Sphere Radius",
-        description="Radius of the emission sphere",
+        description="Radius of the emission sphere (also of the hemisphere, cone, disk and ring)",
         default=1.0,
         min=0.01,
         max=100.0,
@@ -372,6 +2247,8 @@ class ParticleSystemProperties(bpy.types.PropertyGroup):
     
     burst_count: bpy.props.IntProperty(name="Burst Count", default=30, min=1, max=1500, update=update_game_prop)
     is_one_shot: bpy.props.BoolProperty(name="One Shot", description="Fire once when triggered, reset when trigger stops", default=False, update=update_game_prop)
+    prewarm: bpy.props.BoolProperty(name="Prewarm", description="Start with the steady-state population instead of an empty emitter (Continuous mode)", default=False, update=update_game_prop)
+    subframe_emission: bpy.props.BoolProperty(name="Sub-frame Emission", description="Spread the particles due in a frame along the emitter's path since the last frame and age them by when they fell due, instead of spawning a clump at its current position (Continuous mode)", default=True, update=update_game_prop)
     
     lifetime: bpy.props.FloatProperty(name="Lifetime", default=3.0, min=0.1, max=100.0, update=update_game_prop)
     lifetime_random: bpy.props.FloatProperty(name="Random Lifetime", default=0.5, min=0.0, max=1.0, update=update_game_prop)
@@ -444,6 +2321,34 @@ class ParticleSystemProperties(bpy.types.PropertyGroup):
         update=update_game_prop
     )
 
+    # Billboard orientation
+    billboard_mode: bpy.props.EnumProperty(
+        name="Billboard Mode",
+        description="How billboards are oriented towards the camera",
+        items=[
+            ('SCREEN',       "Screen Aligned", "All particles share the camera orientation — one matrix per frame"),
+            ('AXIS',         "Axis Locked",    "Cylindrical: rotate only around the lock axis (rain, fire)"),
+            ('PER_PARTICLE', "Per Particle",   "Each particle looks at the camera position (most expensive)"),
+        ],
+        default='PER_PARTICLE',
+        update=update_game_prop
+    )
+
+    billboard_axis: bpy.props.EnumProperty(
+        name="Lock Axis",
+        description="World axis the billboard stays aligned to in Axis Locked mode",
+        items=[('X', "X", ""), ('Y', "Y", ""), ('Z', "Z", "")],
+        default='Z',
+        update=update_game_prop
+    )
+
+    billboard_angle_threshold: bpy.props.FloatProperty(
+        name="Angle Threshold",
+        description="Only re-orient a billboard when its direction to the camera changed more than this many degrees",
+        default=1.0, min=0.0, max=45.0,
+        update=update_game_prop
+    )
+
     def particle_mesh_poll(self, object):
         """Only allow MESH objects as particle mesh"""
         return object.type == 'MESH'
@@ -472,6 +2377,33 @@ class ParticleSystemProperties(bpy.types.PropertyGroup):
         description="Image to apply to the billboard material",
     )
 
+    # Texture atlas — many emitters share one image and one material
+    use_atlas: bpy.props.BoolProperty(
+        name="Use Atlas",
+        description="Texture is a grid atlas; each particle samples one cell selected through the object color (Shader color mode)",
+        default=False,
+        update=update_game_prop
+    )
+    atlas_source: bpy.props.PointerProperty(
+        name="Atlas Source",
+        type=bpy.types.Image,
+        description="Original texture of this emitter, kept so the atlas can be repacked",
+    )
+    atlas_columns: bpy.props.IntProperty(name="Columns", default=1, min=1, max=64, update=update_game_prop)
+    atlas_rows: bpy.props.IntProperty(name="Rows", default=1, min=1, max=64, update=update_game_prop)
+    atlas_index: bpy.props.IntProperty(
+        name="Cell",
+        description="Atlas cell used by this emitter (0 = top-left, row-major)",
+        default=0, min=0, max=4095,
+        update=update_game_prop
+    )
+    atlas_random_cells: bpy.props.IntProperty(
+        name="Random Cells",
+        description="Each particle picks a random cell in [Cell, Cell + Random Cells). 1 = every particle uses Cell",
+        default=1, min=1, max=4096,
+        update=update_game_prop
+    )
+
     # Collision Properties
     enable_collision: bpy.props.BoolProperty(
         name="Enable Collision",
@@ -488,6 +2420,38 @@ class ParticleSystemProperties(bpy.types.PropertyGroup):
         max=1.0,
         update=update_game_prop
     )
+
+    # Particle-particle interaction
+    enable_interaction: bpy.props.BoolProperty(
+        name="Interaction",
+        description="Let the particles of this emitter push and pull each other (neighbors found through a spatial hash grid)",
+        default=False,
+        update=update_game_prop
+    )
+    interaction_radius: bpy.props.FloatProperty(
+        name="Radius",
+        description="Distance within which two particles interact",
+        default=0.25, min=0.001, soft_max=5.0,
+        update=update_game_prop
+    )
+    repulsion: bpy.props.FloatProperty(
+        name="Repulsion",
+        description="Separation push between neighbors, strongest in contact (m/s²)",
+        default=20.0, min=0.0, soft_max=200.0,
+        update=update_game_prop
+    )
+    cohesion: bpy.props.FloatProperty(
+        name="Cohesion",
+        description="Pull between neighbors at mid range, for liquid-like blobs (m/s²)",
+        default=0.0, min=0.0, soft_max=200.0,
+        update=update_game_prop
+    )
+    contact_damping: bpy.props.FloatProperty(
+        name="Contact Damping",
+        description="Share of their closing speed two touching particles lose (soft collisions)",
+        default=0.5, min=0.0, max=1.0,
+        update=update_game_prop
+    )
     
     # Rotation Property (XYZ like velocity)
     rotation: bpy.props.FloatVectorProperty(
@@ -560,6 +2524,37 @@ class ParticleSystemProperties(bpy.types.PropertyGroup):
         update=update_game_prop
     )
 
+    # Where color / alpha over lifetime is evaluated
+    color_mode: bpy.props.EnumProperty(
+        name="Color Evaluation",
+        description="Where color and alpha over lifetime are computed",
+        items=[
+            ('CPU',    "CPU",    "Runtime interpolates color/alpha in Python and writes the result to the object color"),
+            ('SHADER', "Shader", "Runtime writes per-particle constants (age offset, seed, atlas cell, age rate) to the object color "
+                                 "once per particle; the material ages the particle from its clock and evaluates the color ramp, "
+                                 "alpha curve and tint. Re-apply the material after changing colors"),
+        ],
+        default='CPU',
+        update=update_game_prop
+    )
+
+    tint_color: bpy.props.FloatVectorProperty(
+        name="Tint",
+        description="Shader mode: color each particle is pulled towards by its random seed",
+        default=(1.0, 1.0, 1.0),
+        min=0.0, max=1.0,
+        size=3,
+        subtype='COLOR',
+    )
+
+    tint_random: bpy.props.FloatProperty(
+        name="Tint Random",
+        description="Shader mode: how far a particle with seed 1.0 is mixed towards the tint (0 = no tint)",
+        default=0.0,
+        min=0.0, max=1.0,
+        update=update_game_prop
+    )
+
     # LOD Properties
     enable_lod: bpy.props.BoolProperty(
         name="Enable LOD",
@@ -692,6 +2687,154 @@ class ParticleSystemProperties(bpy.types.PropertyGroup):
         default=True, update=update_game_prop
     )
 
+    # Write-back epsilons — skip KX_GameObject writes whose change is below these
+    write_epsilon_position: bpy.props.FloatProperty(
+        name="Position Epsilon",
+        description="Skip worldPosition writes when the particle moved less than this distance since the last write",
+        default=0.0, min=0.0, max=1.0, precision=4,
+        update=update_game_prop
+    )
+    write_epsilon_scale: bpy.props.FloatProperty(
+        name="Scale Epsilon",
+        description="Skip worldScale writes when the size changed less than this since the last write",
+        default=0.0005, min=0.0, max=1.0, precision=4,
+        update=update_game_prop
+    )
+    write_epsilon_color: bpy.props.FloatProperty(
+        name="Color Epsilon",
+        description="Skip color writes when no RGBA channel changed more than this since the last write (1/255 ≈ 0.004)",
+        default=0.004, min=0.0, max=1.0, precision=4,
+        update=update_game_prop
+    )
+
+    fixed_step: bpy.props.BoolProperty(
+        name="Fixed Timestep",
+        description="Step this emitter at a fixed rate independent of the frame rate and interpolate the drawn positions",
+        default=False,
+        update=update_game_prop
+    )
+    fixed_step_rate: bpy.props.FloatProperty(
+        name="Rate",
+        description="Simulation steps per second",
+        default=30.0, min=1.0, soft_max=240.0,
+        update=update_game_prop
+    )
+    max_substeps: bpy.props.IntProperty(
+        name="Max Steps",
+        description="Most steps per frame; time beyond that is dropped so a hitch cannot snowball",
+        default=4, min=1, max=32,
+        update=update_game_prop
+    )
+    time_scale: bpy.props.FloatProperty(
+        name="Time Scale",
+        description="Speed of this emitter's simulation (multiplied with the game-wide ParticleManager.time_scale); 0 freezes the particles and skips their update",
+        default=1.0, min=0.0, soft_max=4.0,
+        update=update_game_prop
+    )
+    field_weight: bpy.props.FloatProperty(
+        name="Field Weight",
+        description="How strongly the scene's force fields (attractors, vortices, wind) push this emitter's particles; 0 ignores them",
+        default=1.0, soft_min=-2.0, soft_max=2.0,
+        update=update_game_prop
+    )
+    turbulence_strength: bpy.props.FloatProperty(
+        name="Turbulence",
+        description="Strength of the curl-noise swirl pushing the particles, in m/s²; 0 turns it off",
+        default=0.0, min=0.0, soft_max=20.0,
+        update=update_game_prop
+    )
+    turbulence_scale: bpy.props.FloatProperty(
+        name="Scale",
+        description="Size of the turbulence swirls, in meters",
+        default=1.0, min=0.01, soft_max=20.0,
+        update=update_game_prop
+    )
+    turbulence_speed: bpy.props.FloatProperty(
+        name="Scroll",
+        description="Speed the turbulence pattern drifts upward, in m/s",
+        default=0.5, soft_min=-5.0, soft_max=5.0,
+        update=update_game_prop
+    )
+    update_mode: bpy.props.EnumProperty(
+        name="Update",
+        description="Where the game integrates this emitter; object writes and collision rays always stay on the logic thread",
+        items=[
+            ('SERIAL',  "Serial",  "Simulate on the logic thread"),
+            ('THREAD',  "Thread",  "Simulate on the shared thread pool, in parallel with other Thread emitters"),
+            ('PROCESS', "Process", "Simulate in a worker process; frames come back through shared memory one frame later"),
+            ('BATCH',   "Batch",   "Pack with the other Batch emitters into shared arrays integrated in one pass (many small emitters)"),
+        ],
+        default='SERIAL',
+        update=update_game_prop
+    )
+
+    # Baked playback cache
+    use_cache: bpy.props.BoolProperty(
+        name="Play Baked Cache",
+        description="In game, stream this emitter's particles from the baked cache file instead of simulating them",
+        default=False,
+        update=update_game_prop
+    )
+    cache_file: bpy.props.StringProperty(
+        name="Cache File",
+        description="Baked particle cache (.pscache), relative paths start at the blend file",
+        default="//ps_cache.pscache",
+        subtype='FILE_PATH',
+        update=update_game_prop
+    )
+    cache_loop: bpy.props.BoolProperty(
+        name="Loop",
+        description="Restart the cache when it reaches its last frame (otherwise the particles disappear)",
+        default=True,
+        update=update_game_prop
+    )
+    bake_duration: bpy.props.FloatProperty(
+        name="Duration",
+        description="Seconds of simulation to bake",
+        default=5.0, min=0.1, soft_max=60.0
+    )
+    bake_fps: bpy.props.IntProperty(
+        name="FPS",
+        description="Baked frames per second",
+        default=60, min=1, max=240
+    )
+
+    # Preview representation
+    preview_mode: bpy.props.EnumProperty(
+        name="Preview Mode",
+        description="How preview particles are represented in the viewport",
+        items=[
+            ('POINT_CLOUD', "Point Cloud", "All particles are vertices of one mesh, instanced by Geometry Nodes and updated in bulk"),
+            ('OBJECTS',     "Objects",     "One temporary object per particle (slow, rebuilds the depsgraph on every spawn)"),
+        ],
+        default='POINT_CLOUD',
+    )
+    preview_playback: bpy.props.EnumProperty(
+        name="Playback",
+        description="What drives the preview simulation time",
+        items=[
+            ('REALTIME', "Real Time", "Simulate forward in real time"),
+            ('SCRUB',    "Scrub",     "Hold the simulation at the Time slider; drag it to seek"),
+            ('TIMELINE', "Timeline",  "Follow the scene frame (seconds since the start frame)"),
+        ],
+        default='REALTIME',
+    )
+    preview_time: bpy.props.FloatProperty(
+        name="Time",
+        description="Preview simulation time in seconds (Scrub playback)",
+        default=0.0, min=0.0, soft_max=30.0, precision=2,
+    )
+    preview_seed: bpy.props.IntProperty(
+        name="Seed",
+        description="Random seed of the preview simulation — the same seed and settings replay the same particles",
+        default=0, min=0,
+    )
+    preview_checkpoint_interval: bpy.props.IntProperty(
+        name="Checkpoint Every",
+        description="Simulation steps (1/60 s) between stored preview checkpoints. Lower = faster seeking, more memory",
+        default=30, min=1, max=600,
+    )
+
     # Preview mode property
     preview_active: bpy.props.BoolProperty(
         name="Preview Active",
@@ -701,6 +2844,48 @@ class ParticleSystemProperties(bpy.types.PropertyGroup):
 
 
 
+# Force Field Properties
+class ParticleFieldProperties(bpy.types.PropertyGroup):
+    enabled: bpy.props.BoolProperty(
+        name="Force Field",
+        description="Push the particles of every emitter in the scene (scaled by each emitter's Field Weight)",
+        default=False,
+        update=update_field_props
+    )
+    field_type: bpy.props.EnumProperty(
+        name="Type",
+        items=[
+            ('ATTRACT', "Attractor", "Pull particles toward the object (negative strength repels)"),
+            ('VORTEX',  "Vortex",    "Swirl particles around the object's Z axis"),
+            ('WIND',    "Wind",      "Push particles along the object's Z axis"),
+        ],
+        default='ATTRACT',
+        update=update_field_props
+    )
+    strength: bpy.props.FloatProperty(
+        name="Strength",
+        description="Acceleration at full effect, in m/s²",
+        default=5.0, soft_min=-50.0, soft_max=50.0,
+        update=update_field_props
+    )
+    radius: bpy.props.FloatProperty(
+        name="Radius",
+        description="Reach of the field (from the axis for vortices); 0 reaches everywhere",
+        default=5.0, min=0.0, soft_max=50.0,
+        update=update_field_props
+    )
+    falloff: bpy.props.EnumProperty(
+        name="Falloff",
+        items=[
+            ('CONSTANT', "Constant", "Full strength up to the radius"),
+            ('LINEAR',   "Linear",   "Fade linearly to zero at the radius"),
+            ('SMOOTH',   "Smooth",   "Fade smoothly to zero at the radius"),
+        ],
+        default='SMOOTH',
+        update=update_field_props
+    )
+
+
 # Particle System Panel
 class PARTICLE_PT_upbge_panel(bpy.types.Panel):
     bl_label = "UPBGE Particle System"
@@ -744,6 +2929,17 @@ class PARTICLE_PT_upbge_panel(bpy.types.Panel):
             row.operator("particle.preview_toggle", text="Stop Preview", icon='PAUSE', depress=True)
         else:
             row.operator("particle.preview_toggle", text="Play Preview", icon='PLAY')
+        mode_row = box.row()
+        mode_row.enabled = not ps.preview_active
+        mode_row.prop(ps, "preview_mode", text="Preview")
+        time_row = box.row(align=True)
+        time_row.prop(ps, "preview_playback", text="")
+        scrub = time_row.row(align=True)
+        scrub.enabled = (ps.preview_playback == 'SCRUB')
+        scrub.prop(ps, "preview_time")
+        seed_row = box.row(align=True)
+        seed_row.prop(ps, "preview_seed")
+        seed_row.prop(ps, "preview_checkpoint_interval", text="Checkpoint")
         
         layout.separator()
         ps = obj.particle_system_props
@@ -762,6 +2958,22 @@ class PARTICLE_PT_upbge_panel(bpy.types.Panel):
                 box.prop(ps, "emission_box_size")
             elif ps.emission_shape == 'SPHERE':
                 box.prop(ps, "emission_sphere_radius")
+            elif ps.emission_shape in {'HEMISPHERE', 'CONE', 'DISK', 'RING'}:
+                box.prop(ps, "emission_sphere_radius", text="Radius")
+                if ps.emission_shape == 'RING':
+                    box.prop(ps, "emission_inner_radius")
+                elif ps.emission_shape == 'CONE':
+                    box.prop(ps, "emission_cone_angle")
+            elif ps.emission_shape == 'EDGE':
+                box.prop(ps, "emission_edge_length")
+            elif ps.emission_shape in sim_core.MESH_SHAPES:
+                if obj.type == 'MESH':
+                    box.prop_search(ps, "emission_vertex_group", obj, "vertex_groups")
+                else:
+                    box.label(text="The emitter has no mesh: emitting from its origin", icon='ERROR')
+            if ps.emission_shape in {'BOX', 'SPHERE', 'HEMISPHERE', 'CONE', 'DISK', 'RING'}:
+                box.prop(ps, "emission_shell")
+            box.prop(ps, "normal_velocity")
             
             # MOVED DOWN: Trigger is now below Mode
             layout.prop(ps, "trigger_enabled", text="Emission Trigger")
@@ -770,6 +2982,8 @@ class PARTICLE_PT_upbge_panel(bpy.types.Panel):
             
             if ps.emission_mode == 'CONTINUOUS':
                 box.prop(ps, "emission_rate")
+                box.prop(ps, "prewarm")
+                box.prop(ps, "subframe_emission")
             else: # BURST MODE
                 box.prop(ps, "burst_count")
                 box.prop(ps, "is_one_shot")
@@ -794,10 +3008,14 @@ class PARTICLE_PT_upbge_panel(bpy.types.Panel):
                 if ps.preview_active:
                     box.label(text="(Mesh locked during preview)", icon='LOCKED')
             else:
-                # Billboard mode plane info
-                bb_name = f"PS_BP_{obj.name}"
-                if bb_name in bpy.data.objects:
-                    box.label(text=f"Plane: {bb_name}", icon='MESH_PLANE')
+                # Billboard mode plane info (planes are shared between emitters by material key)
+                bb_prop = obj.game.properties.get('ps_billboard_template')
+                if bb_prop and bb_prop.value in bpy.data.objects:
+                    box.label(text=f"Plane: {bb_prop.value}", icon='MESH_PLANE')
+                box.prop(ps, "billboard_mode", text="Orientation")
+                if ps.billboard_mode == 'AXIS':
+                    box.prop(ps, "billboard_axis", text="Lock Axis", expand=True)
+                box.prop(ps, "billboard_angle_threshold")
 
             box.prop(ps, "start_size")
             box.prop(ps, "end_size")
@@ -812,6 +3030,17 @@ class PARTICLE_PT_upbge_panel(bpy.types.Panel):
                 box.prop(ps, "billboard_texture", text="Image")
                 if not ps.billboard_texture:
                     box.label(text="No image selected — texture slot will be empty", icon='ERROR')
+                box.prop(ps, "use_atlas")
+                if ps.use_atlas:
+                    row_at = box.row(align=True)
+                    row_at.prop(ps, "atlas_columns")
+                    row_at.prop(ps, "atlas_rows")
+                    row_at = box.row(align=True)
+                    row_at.prop(ps, "atlas_index")
+                    row_at.prop(ps, "atlas_random_cells")
+                    if ps.color_mode != 'SHADER':
+                        box.label(text="Atlas cells need Shader color evaluation", icon='ERROR')
+                box.operator("particle.pack_atlas", text="Pack Atlas (Selected Emitters)", icon='TEXTURE')
 
             # Color over Lifetime
             box.prop(ps, "enable_color", text="Color over Lifetime")
@@ -828,6 +3057,14 @@ class PARTICLE_PT_upbge_panel(bpy.types.Panel):
             if ps.enable_alpha:
                 box.prop(ps, "start_alpha", text="Start Alpha", slider=True)
 
+            # Shader-side lifetime evaluation
+            box.prop(ps, "color_mode", text="Evaluate")
+            if ps.color_mode == 'SHADER':
+                row4 = box.row(align=True)
+                row4.prop(ps, "tint_color", text="")
+                row4.prop(ps, "tint_random", text="Tint Random", slider=True)
+                box.label(text="Re-apply material after changing colors", icon='INFO')
+
             # Apply Material button
             box.separator()
             box.operator("particle.apply_material", text="Apply Material", icon='NODE_MATERIAL')
@@ -839,6 +3076,20 @@ class PARTICLE_PT_upbge_panel(bpy.types.Panel):
 
             box.prop(ps, "simulation_space", text="Space")
             box.prop(ps, "movement_type", text="Movement")
+            row = box.row(align=True)
+            row.prop(ps, "fixed_step")
+            sub = row.row(align=True)
+            sub.enabled = ps.fixed_step
+            sub.prop(ps, "fixed_step_rate")
+            sub.prop(ps, "max_substeps")
+            box.prop(ps, "time_scale")
+            box.prop(ps, "field_weight")
+            row = box.row(align=True)
+            row.prop(ps, "turbulence_strength")
+            sub = row.row(align=True)
+            sub.enabled = ps.turbulence_strength > 0.0
+            sub.prop(ps, "turbulence_scale")
+            sub.prop(ps, "turbulence_speed")
             
             # Conditional UI based on movement type
             if ps.movement_type == 'SIMPLE':
@@ -861,6 +3112,13 @@ class PARTICLE_PT_upbge_panel(bpy.types.Panel):
             box.prop(ps, "enable_collision", text="Enable Collision")
             if ps.enable_collision:
                 box.prop(ps, "bounce_strength", slider=True)
+            box.prop(ps, "enable_interaction")
+            if ps.enable_interaction:
+                col = box.column(align=True)
+                col.prop(ps, "interaction_radius")
+                col.prop(ps, "repulsion")
+                col.prop(ps, "cohesion")
+                col.prop(ps, "contact_damping", slider=True)
 
             # Render / LOD box
             box = layout.box()
@@ -915,267 +3173,531 @@ class PARTICLE_PT_upbge_panel(bpy.types.Panel):
                 if ps.lod3_disable_emitting:
                     lod3_box.prop(ps, "lod3_destroy_particles", text="Destroy Particles")
 
+            # Write-back epsilons
+            wb_box = box.box()
+            wb_box.label(text="Write-back Epsilons")
+            wb_box.prop(ps, "write_epsilon_position", text="Position")
+            wb_box.prop(ps, "write_epsilon_scale",    text="Scale")
+            wb_box.prop(ps, "write_epsilon_color",    text="Color")
+            box.prop(ps, "update_mode")
+
+            # Baked playback cache
+            box = layout.box()
+            box.label(text="Baked Cache:")
+            box.prop(ps, "cache_file", text="File")
+            row = box.row(align=True)
+            row.prop(ps, "bake_duration")
+            row.prop(ps, "bake_fps")
+            box.operator("particle.bake_cache", text="Bake", icon='FILE_CACHE')
+            row = box.row()
+            row.prop(ps, "use_cache")
+            sub = row.row()
+            sub.enabled = ps.use_cache
+            sub.prop(ps, "cache_loop")
+
+# Force Field Panel
+class PARTICLE_PT_force_field(bpy.types.Panel):
+    bl_label = "UPBGE Force Field"
+    bl_idname = "PARTICLE_PT_force_field"
+    bl_space_type = 'PROPERTIES'
+    bl_region_type = 'WINDOW'
+    bl_context = "physics"
+
+    @classmethod
+    def poll(cls, context):
+        """Fields are placed with empties"""
+        obj = context.object
+        return obj is not None and obj.type == 'EMPTY'
+
+    def draw_header(self, context):
+        self.layout.prop(context.object.particle_field_props, "enabled", text="")
+
+    def draw(self, context):
+        layout = self.layout
+        fp = context.object.particle_field_props
+        layout.enabled = fp.enabled
+        layout.prop(fp, "field_type")
+        layout.prop(fp, "strength")
+        row = layout.row(align=True)
+        row.prop(fp, "radius")
+        sub = row.row(align=True)
+        sub.enabled = fp.radius > 0.0
+        sub.prop(fp, "falloff", text="")
+
+# Point-cloud preview: one mesh whose vertices are the particles, instanced by
+# a shared Geometry Nodes group. Per-particle size / rotation / color live in
+# point attributes and are written in bulk with foreach_set every tick.
+PREVIEW_INSTANCER_NAME = "PS_PreviewInstancer"
+
+def ensure_preview_instancer():
+    """Return the shared instancer node group (built once per blend)"""
+    ng = bpy.data.node_groups.get(PREVIEW_INSTANCER_NAME)
+    if ng is not None:
+        return ng
+
+    ng = bpy.data.node_groups.new(PREVIEW_INSTANCER_NAME, 'GeometryNodeTree')
+    iface = ng.interface
+    iface.new_socket("Geometry", in_out='INPUT', socket_type='NodeSocketGeometry')
+    iface.new_socket("Instance", in_out='INPUT', socket_type='NodeSocketObject')
+    iface.new_socket("Material", in_out='INPUT', socket_type='NodeSocketMaterial')
+    iface.new_socket("Override Material", in_out='INPUT', socket_type='NodeSocketBool')
+    iface.new_socket("Geometry", in_out='OUTPUT', socket_type='NodeSocketGeometry')
+
+    nodes = ng.nodes
+    links = ng.links
+    g_in  = nodes.new('NodeGroupInput');  g_in.location  = (-800, 0)
+    g_out = nodes.new('NodeGroupOutput'); g_out.location = (400, 0)
+
+    obj_info = nodes.new('GeometryNodeObjectInfo'); obj_info.location = (-550, -150)
+    obj_info.transform_space = 'ORIGINAL'
+    links.new(g_in.outputs['Instance'], obj_info.inputs['Object'])
+
+    # Swap in the attribute-driven preview material for addon-generated materials
+    set_mat = nodes.new('GeometryNodeSetMaterial'); set_mat.location = (-300, -150)
+    links.new(obj_info.outputs['Geometry'],        set_mat.inputs['Geometry'])
+    links.new(g_in.outputs['Override Material'],  set_mat.inputs['Selection'])
+    links.new(g_in.outputs['Material'],           set_mat.inputs['Material'])
+
+    rot = nodes.new('GeometryNodeInputNamedAttribute'); rot.location = (-300, -350)
+    rot.data_type = 'FLOAT_VECTOR'
+    rot.inputs['Name'].default_value = 'ps_rot'
+    size = nodes.new('GeometryNodeInputNamedAttribute'); size.location = (-300, -500)
+    size.data_type = 'FLOAT'
+    size.inputs['Name'].default_value = 'ps_size'
+
+    inst = nodes.new('GeometryNodeInstanceOnPoints'); inst.location = (100, 0)
+    links.new(g_in.outputs['Geometry'],   inst.inputs['Points'])
+    links.new(set_mat.outputs['Geometry'], inst.inputs['Instance'])
+    links.new(rot.outputs['Attribute'],   inst.inputs['Rotation'])
+    links.new(size.outputs['Attribute'],  inst.inputs['Scale'])
+    links.new(inst.outputs['Instances'],  g_out.inputs['Geometry'])
+    return ng
+
+def resize_preview_cloud(mesh, capacity):
+    """(Re)allocate the cloud mesh to hold capacity points plus its attributes"""
+    mesh.clear_geometry()
+    mesh.vertices.add(capacity)
+    for name, data_type in (('ps_size', 'FLOAT'), ('ps_rot', 'FLOAT_VECTOR'), ('ps_color', 'FLOAT_COLOR')):
+        if name not in mesh.attributes:
+            mesh.attributes.new(name, data_type, 'POINT')
+
+def create_preview_cloud(context, emitter, capacity):
+    """Create the single point-cloud object that represents every preview particle"""
+    mesh = bpy.data.meshes.new(f"PS_PreviewCloud_{emitter.name}")
+    resize_preview_cloud(mesh, capacity)
+    cloud = bpy.data.objects.new(f"PS_PreviewCloud_{emitter.name}", mesh)
+    context.collection.objects.link(cloud)
+    cloud.hide_select = True
+    mod = cloud.modifiers.new("PS_Preview", 'NODES')
+    mod.node_group = ensure_preview_instancer()
+    return cloud
+
+def build_preview_collider(context):
+    """World-space BVH tree of every visible mesh (preview objects excluded).
+    A snapshot: the preview worker can query it off the main thread, where
+    scene.ray_cast is not allowed."""
+    from mathutils.bvhtree import BVHTree
+    depsgraph = context.evaluated_depsgraph_get()
+    verts, polys = [], []
+    for obj in context.visible_objects:
+        if obj.type != 'MESH' or obj.get('ps_preview'):
+            continue
+        eval_obj = obj.evaluated_get(depsgraph)
+        mesh = eval_obj.to_mesh()
+        mat  = obj.matrix_world
+        base = len(verts)
+        verts.extend(mat @ v.co for v in mesh.vertices)
+        polys.extend([base + i for i in poly.vertices] for poly in mesh.polygons)
+        eval_obj.to_mesh_clear()
+    return BVHTree.FromPolygons(verts, polys) if polys else None
+
+def editor_sampler(obj, ps):
+    """MeshSampler of obj's mesh for the SURFACE / VERTEX shapes (preview,
+    bake) — the same table the game builds from the emitter's mesh"""
+    if ps.emission_shape not in sim_core.MESH_SHAPES or obj.type != 'MESH':
+        return None
+    return sim_core.mesh_sampler(obj.data, obj.vertex_groups, ps.emission_vertex_group,
+                                 np.array(obj.matrix_world.to_scale()), ps.emission_shape == 'SURFACE')
+
+def editor_fields(context):
+    """ForceFields snapshot of the scene's enabled force fields (preview,
+    bake) — what the game's ParticleManager reads from their game properties"""
+    fields = []
+    for obj in context.scene.objects:
+        fp = obj.particle_field_props
+        if not fp.enabled:
+            continue
+        mat = obj.matrix_world
+        fields.append((fp.field_type, tuple(mat.translation), tuple(mat.col[2].xyz.normalized()),
+                       fp.strength, fp.radius, fp.falloff))
+    return sim_core.ForceFields(fields) if fields else None
+
+def advance_sim(sim, dt, emitter_pos, emitter_ori, collider=None, fields=None, emitter_prev=None):
+    """One step of the shared core on the editor side (preview worker, bake):
+    emit (along the path from emitter_prev, as sub-frame emission does in
+    game), integrate, collide, with a BVH snapshot from build_preview_collider
+    standing in for rayCast. Time scale and stepping are up to the caller
+    (the preview steps at a fixed rate on scaled time; the game scales baked
+    playback itself). LOD has no editor counterpart and is left out."""
+    p = sim.props
+    if p['enabled']:
+        count = sim.emission_count(dt, p['trigger'], p['emission_rate'],
+                                   p['burst_count'], p['max_particles'])
+        if count:
+            sim.emit(count, emitter_pos, emitter_ori, emitter_prev)
+    sim.step(dt, emitter_ori, fields)
+    live = sim.live
+    if not (p['enable_collision'] and collider is not None and len(live)):
+        return
+    hits, hit_pos, hit_normal = [], [], []
+    for i, frm, to in zip(live.tolist(), sim.prev_pos[live].tolist(), sim.pos[live].tolist()):
+        origin    = Vector(frm)
+        direction = Vector(to) - origin
+        distance  = direction.length
+        if distance <= 0.0:
+            continue
+        loc, normal, _, _ = collider.ray_cast(origin, direction / distance, distance)
+        if loc is not None:
+            hits.append(i)
+            hit_pos.append(loc)
+            hit_normal.append(normal)
+    if hits:
+        sim.collide(np.array(hits), np.array(hit_pos), np.array(hit_normal))
+
+class PreviewWorker(threading.Thread):
+    """Runs the shared simulation core for the viewport preview on its own
+    thread, so heavy emitters never stall the UI.
+
+    The simulation is deterministic: fixed steps of 1 / rate seconds from a
+    seeded random stream. Every checkpoint_every steps a compact state snapshot
+    is kept, so seeking to any time restores the nearest earlier checkpoint and
+    simulates forward from there. At most max_checkpoints are kept besides
+    step 0; past that, the one farthest from the current step is dropped.
+    Changing props, seed or interval restarts the history from step 0: Scrub
+    and Timeline playback replay up to their time, Real Time starts over.
+
+    The main thread posts inputs (props, emitter / camera transforms, collider,
+    playback time) and reads finished frames; the worker never touches bpy
+    data. Each frame fills the back buffer, then swaps it with the front one
+    under the lock — readers hold the lock while copying the front buffer out."""
+
+    max_checkpoints = 64
+
+    def __init__(self, capacity, props, seed=0, checkpoint_every=30, rate=60.0):
+        super().__init__(name="PS_PreviewWorker", daemon=True)
+        self.lock       = threading.Lock()
+        self.frame      = 0          # Id of the frame in the front buffer
+        self.dt         = 1.0 / rate
+        self.sim        = sim_core.ParticleSim(capacity)
+        self.sim.configure(props)
+        self.seed       = seed
+        self.checkpoint_every = checkpoint_every
+        self.step_index = 0          # Simulation time in fixed steps
+        self.checkpoints = {}        # step index -> ParticleSim.get_state()
+        self._stop_evt  = threading.Event()
+        self._props_in  = None       # Pending inputs, applied on the next tick
+        self._sampler_in = None
+        self._seed_in   = None
+        self._every_in  = None
+        self._reset     = False
+        self._seek      = None       # Playback time in seconds, None = run in real time
+        self._emitter   = (np.zeros(3), np.identity(3))
+        self._emitter_step = None    # Emitter (pos, ori) at the last simulated step
+        self._camera    = (None, None)
+        self._cam_last  = None       # Camera the front frame was built for
+        self._collider  = None
+        self._fields    = None       # ForceFields snapshot from editor_fields
+        self._accum     = 0.0
+        self._rot       = np.zeros((capacity, 3))   # Last euler per slot
+        self.front      = self._alloc(capacity)
+        self._back      = self._alloc(capacity)
+        self._restart()
+
+    @staticmethod
+    def _alloc(capacity):
+        return {
+            'active': np.zeros(capacity, dtype=bool),
+            'pos':    np.zeros((capacity, 3)),
+            'size':   np.zeros(capacity),
+            'rot':    np.zeros((capacity, 3)),
+            'color':  np.ones((capacity, 4)),
+            'writes_color': False,
+            'rotates':      False,
+        }
+
+    # ------------------------------------------------------------------
+    # Main thread side
+    # ------------------------------------------------------------------
+    def post(self, props=None, seed=None, checkpoint_every=None, emitter=None,
+             camera=None, collider=None, sampler=None, fields=None, reset=False):
+        """Hand new inputs to the worker; None leaves that input unchanged"""
+        with self.lock:
+            if props is not None:
+                self._props_in = props
+            if sampler is not None:
+                self._sampler_in = sampler   # False clears it
+            if seed is not None:
+                self._seed_in = seed
+            if checkpoint_every is not None:
+                self._every_in = checkpoint_every
+            if emitter is not None:
+                self._emitter = emitter
+            if camera is not None:
+                self._camera = camera
+            if collider is not None:
+                self._collider = collider or None   # False clears it
+            if fields is not None:
+                self._fields = fields or None       # False clears it
+            self._reset = self._reset or reset
+
+    def set_playback(self, seconds):
+        """Seek to seconds and hold there; None runs forward in real time"""
+        with self.lock:
+            self._seek = seconds
+
+    def stop(self):
+        self._stop_evt.set()
+        if self.is_alive():
+            self.join()
+
+    # ------------------------------------------------------------------
+    # Worker thread side
+    # ------------------------------------------------------------------
+    def run(self):
+        import time
+        last = time.perf_counter()
+        while not self._stop_evt.is_set():
+            now     = time.perf_counter()
+            elapsed = min(now - last, 0.1)
+            last    = now
+            with self.lock:
+                props, self._props_in = self._props_in, None
+                sampler, self._sampler_in = self._sampler_in, None
+                seed,  self._seed_in  = self._seed_in,  None
+                every, self._every_in = self._every_in, None
+                reset, self._reset    = self._reset, False
+                seek = self._seek
+                cam_pos, cam_ori = self._camera
+            self._tick(elapsed, props, sampler, seed, every, reset, seek, cam_pos, cam_ori)
+            self._stop_evt.wait(max(0.0, self.dt - (time.perf_counter() - now)))
+
+    def _restart(self):
+        """Drop the history and go back to step 0 (checkpoint 0 = empty or
+        prewarmed emitter)"""
+        sim = self.sim
+        sim.kill_all()
+        sim.reseed(self.seed)
+        if sim.props['prewarm'] and sim.props['enabled']:
+            sim.prewarm(*self._emitter)
+        self.step_index  = 0
+        self.checkpoints = {0: sim.get_state()}
+        self._rot[:]     = 0.0
+        self._emitter_step = None
+
+    def _tick(self, elapsed, props, sampler, seed, every, reset, seek, cam_pos, cam_ori):
+        sim     = self.sim
+        restart = reset
+        if props is not None:
+            if props['max_particles'] != sim.capacity:
+                sim.resize(props['max_particles'])
+                self._rot = np.zeros((sim.capacity, 3))
+            sim.configure(props)
+            restart = True
+        if sampler is not None:
+            sim.sampler = sampler or None
+            restart = True
+        if seed is not None:
+            self.seed = seed
+            restart   = True
+        if every is not None:
+            self.checkpoint_every = every
+            restart = True
+        if restart:
+            self._restart()
+
+        # The emitter's time scale changes how many fixed steps a second holds
+        scale = sim.props['time_scale']
+        if seek is None:
+            self._accum += elapsed * scale
+            steps = int(self._accum / self.dt)
+            self._accum -= steps * self.dt
+            target = self.step_index + steps   # After a restart: on from step 0
+        else:
+            self._accum = 0.0
+            target = int(round(max(seek, 0.0) * scale / self.dt))
+
+        stepped = target != self.step_index
+        if stepped:
+            self._seek_to(target)
+        # Holding still (paused scrub): only a moving camera needs a new frame
+        cam_moved = cam_pos is not None and not (
+            self._cam_last is not None and np.array_equal(cam_pos, self._cam_last[0])
+            and np.array_equal(cam_ori, self._cam_last[1]))
+        if stepped or restart or cam_moved:
+            self._cam_last = (cam_pos, cam_ori)
+            self._fill(cam_pos, cam_ori)
+
+    def _seek_to(self, target):
+        """Bring the simulation to step target, replaying from the nearest
+        checkpoint unless simulating on from the current step is shorter.
+        Running on, the steps spread emission along the emitter's path since
+        the last step; a replay has no recorded path and emits in place."""
+        base = max(k for k in self.checkpoints if k <= target)
+        if not (base <= self.step_index <= target):
+            self.sim.set_state(self.checkpoints[base])
+            self.step_index    = base
+            self._emitter_step = None
+        emitter_pos, emitter_ori = emitter = self._emitter
+        steps = target - self.step_index
+        for k in range(steps):
+            self._advance(*sim_core.emitter_at_step(emitter_pos, emitter_ori,
+                                                    self._emitter_step, k, steps))
+        if steps:
+            self._emitter_step = emitter
+
+    def _advance(self, emitter_pos, emitter_ori, emitter_prev):
+        """One fixed step, then a checkpoint when one is due"""
+        sim = self.sim
+        advance_sim(sim, self.dt, emitter_pos, emitter_ori, self._collider, self._fields, emitter_prev)
+        self.step_index += 1
+        step = self.step_index
+        if step % self.checkpoint_every == 0 and step not in self.checkpoints:
+            self.checkpoints[step] = sim.get_state()
+            if len(self.checkpoints) > self.max_checkpoints + 1:
+                del self.checkpoints[max((k for k in self.checkpoints if k), key=lambda k: abs(k - step))]
+
+    def _fill(self, cam_pos, cam_ori):
+        """Fill the back buffer with everything the viewport needs, then swap"""
+        sim  = self.sim
+        live = sim.live
+        back = self._back
+        if len(back['active']) != sim.capacity:
+            back = self._alloc(sim.capacity)
+        back['active'][:] = sim.active
+        back['pos'][:]    = sim.pos
+        back['size'][:]   = 0.0   # Dead slots collapse to nothing
+        back['color'][:]  = 1.0
+        if len(live):
+            back['size'][live] = sim.sizes(live)
+            if sim.writes_color:
+                back['color'][live] = sim.colors(live)
+            if sim.is_billboard:
+                if cam_pos is not None:
+                    need, mats = sim.billboard_updates(live, cam_pos, cam_ori)
+                    if len(need):
+                        self._rot[need] = sim_core.matrices_to_euler(mats)
+            else:
+                self._rot[live] = sim.rot[live]
+        back['rot'][:] = self._rot
+        back['writes_color'] = sim.writes_color
+        back['rotates']      = sim.is_billboard or sim.has_torque or sim.rot_has_value
+
+        with self.lock:
+            self._back, self.front = self.front, back
+            self.frame += 1
+
 class PARTICLE_OT_preview_toggle(bpy.types.Operator):
     """Toggle viewport particle preview"""
     bl_idname = "particle.preview_toggle"
     bl_label = "Toggle Particle Preview"
-    
+
     _timer = None
-    _particles = None       
-    _time_accumulator = 0.0
-    _last_time = 0.0
-    _burst_timer = 0.0
-    _burst_triggered = False
-    _original_object = None  
-    _default_sphere = None   
-    _billboard_mesh = None   
-    
+    _worker = None           # PreviewWorker running the shared simulation core
+    _props = None            # Last props dict posted to the worker
+    _history = None          # Last (seed, checkpoint interval) posted to the worker
+    _fields = None           # Last force field tuples posted to the worker
+    _frame = -1              # Last worker frame copied to the viewport
+    _original_object = None
+    _default_sphere = None
+    _billboard_mesh = None
+    _billboard_obj = None    # Hidden object carrying the billboard plane
+    _objects = None          # Objects mode: pooled bpy objects, index == simulation slot
+    _shown = None            # Objects mode: slots whose object is currently visible
+    _cloud_obj = None        # Point Cloud mode: the single instancing mesh object
+    _source = None           # Object every particle is currently a copy / instance of
+
     def modal(self, context, event):
-        # Check if user pressed 
+        # Check if user pressed
         if event.type == 'P' and event.value == 'PRESS':
             self.cancel(context)
             return {'CANCELLED'}
-        
+
         if event.type == 'TIMER':
             # Check if active object changed
             if context.object != self._original_object:
                 self.cancel(context)
                 return {'CANCELLED'}
-            
+
             obj = context.object
             if not obj or not obj.particle_system_props.preview_active:
                 self.cancel(context)
                 return {'CANCELLED'}
-            
+
             ps = obj.particle_system_props
-            
-            # Calculate delta time
-            import time
-            current_time = time.time()
-            if self._last_time == 0:
-                dt = 0.016
-            else:
-                dt = current_time - self._last_time
-            self._last_time = current_time
-            dt = min(dt, 0.1)
-            
-            # Update existing particles
-            if self._particles is None:
-                self._particles = []
-
-            import math
-
-            # Hoist per-frame constants out of the particle loop
-            gravity       = Vector(ps.gravity)
-            enable_coll   = ps.enable_collision
-            bounce        = ps.bounce_strength
-            movement_type = ps.movement_type
-            is_force      = (movement_type == 'FORCE')
-
-            # FORCE mode constants
-            if is_force:
-                force_vec    = Vector(ps.force)
-                damping      = ps.damping
-                acc          = (force_vec + gravity) * dt
-                damp_factor  = 1.0 - damping * dt
-                torque_xyz   = ps.torque
-                has_torque   = (torque_xyz[0] != 0 or torque_xyz[1] != 0 or torque_xyz[2] != 0)
-                if has_torque:
-                    torque_rad = Vector((math.radians(torque_xyz[0]),
-                                        math.radians(torque_xyz[1]),
-                                        math.radians(torque_xyz[2]))) * dt
+            worker = self._worker
+
+            # Props → worker, only when something changed (same dirty check as the runtime).
+            # The collider snapshot is refreshed along with it.
+            props = settings_to_props(ps)
+            if props != self._props:
+                collider = build_preview_collider(context) if props['enable_collision'] else None
+                worker.post(props=props, collider=collider or False,
+                            sampler=editor_sampler(obj, ps) or False)
+                self._props = props
+            history = (ps.preview_seed, ps.preview_checkpoint_interval)
+            if history != self._history:
+                worker.post(seed=history[0], checkpoint_every=history[1])
+                self._history = history
+            # Force fields move freely in the editor; re-post only on change
+            fields = editor_fields(context)
+            fields_args = fields.args if fields is not None else None
+            if fields_args != self._fields:
+                worker.post(fields=fields or False)
+                self._fields = fields_args
+
+            # Playback: real time, the scrub slider or the scene timeline
+            if ps.preview_playback == 'SCRUB':
+                worker.set_playback(ps.preview_time)
+            elif ps.preview_playback == 'TIMELINE':
+                scene = context.scene
+                fps   = scene.render.fps / scene.render.fps_base
+                worker.set_playback((scene.frame_current - scene.frame_start) / fps)
             else:
-                grav_dt = gravity * dt   # SIMPLE: gravity only
-
-            # SIMPLE rotation constants
-            rot_xyz      = ps.rotation
-            has_rotation = (rot_xyz[0] != 0 or rot_xyz[1] != 0 or rot_xyz[2] != 0)
-            if has_rotation:
-                rot_rad = (math.radians(rot_xyz[0]),
-                           math.radians(rot_xyz[1]),
-                           math.radians(rot_xyz[2]))
-
-            to_remove = []
-            for i, particle_data in enumerate(self._particles):
-                particle_obj, age, lifetime, start_size, end_size, velocity, angular_velocity, rotation, is_billboard, col_start, col_end, col_t0, col_t1, p_start_alpha = particle_data
-                age += dt
-
-                if age >= lifetime:
-                    to_remove.append(i)
-                    bpy.data.objects.remove(particle_obj, do_unlink=True)
-                    continue
+                worker.set_playback(None)
+
+            # Particle object changed (type or mesh)
+            source = self._particle_source(context, ps)
+            if source is not self._source:
+                self._set_source(source, ps)
+
+            mat = obj.matrix_world
+            cam_pos, cam_ori = self._view_camera(context)
+            worker.post(emitter=(np.array(mat.translation), np.array(mat.to_3x3().normalized())),
+                        camera=(cam_pos, cam_ori) if cam_pos is not None else None)
+
+            # Nothing to draw into: let the worker run, skip the copy
+            if cam_pos is None:
+                return {'PASS_THROUGH'}
+
+            with worker.lock:
+                if worker.frame == self._frame:
+                    return {'PASS_THROUGH'}
+                self._frame = worker.frame
+                self._write(context, worker.front)
 
-                # Physics
-                if is_force:
-                    # Apply combined force + gravity acceleration then damping
-                    velocity += acc
-                    velocity *= damp_factor
-                else:
-                    # SIMPLE: gravity only
-                    velocity += grav_dt
-
-                # Position integration + collision (ground plane Z=0 for preview)
-                if enable_coll:
-                    next_pos = particle_obj.location + velocity * dt
-                    if next_pos.z < 0:
-                        velocity.z = -velocity.z * bounce
-                        next_pos.z = 0.01
-                    particle_obj.location = next_pos
-                else:
-                    particle_obj.location += velocity * dt
-
-                # Size interpolation
-                life_ratio = age / lifetime
-                size = start_size + (end_size - start_size) * life_ratio
-                particle_obj.scale = Vector((size, size, size))
-
-                # Color over lifetime
-                if ps.enable_color or ps.enable_alpha:
-                    if ps.enable_color:
-                        t = (life_ratio - col_t0) / max(col_t1 - col_t0, 0.0001)
-                        t = max(0.0, min(1.0, t))
-                        cr = col_start[0] + (col_end[0] - col_start[0]) * t
-                        cg = col_start[1] + (col_end[1] - col_start[1]) * t
-                        cb = col_start[2] + (col_end[2] - col_start[2]) * t
-                    else:
-                        cr, cg, cb = 1.0, 1.0, 1.0
-
-                    if ps.enable_alpha and p_start_alpha > 0.0:
-                        ca = p_start_alpha * ((1.0 - life_ratio) ** (1.0 / p_start_alpha))
-                    else:
-                        ca = 1.0
-
-                    particle_obj.color = (cr, cg, cb, ca)
-
-                # Billboard: per-particle look-at toward the viewport eye.
-                # position, build a full orthonormal XYZ basis, apply as matrix.
-                if is_billboard:
-                    for area in context.screen.areas:
-                        if area.type == 'VIEW_3D':
-                            rv3d = area.spaces.active.region_3d
-                            if rv3d:
-                                from mathutils import Matrix as _Mat
-                                eye     = rv3d.view_matrix.inverted().translation
-                                to_cam  = (eye - particle_obj.location).normalized()
-                                world_z = Vector((0.0, 0.0, 1.0))
-                                # Gimbal guard: if to_cam nearly parallel to Z use Y as up ref
-                                world_up = Vector((0.0, 1.0, 0.0)) if abs(to_cam.dot(world_z)) > 0.999 else world_z
-                                # right = up_ref × to_cam  (X axis of billboard)
-                                right   = world_up.cross(to_cam).normalized()
-                                # up = to_cam × right  (Z axis of billboard, true up)
-                                up      = to_cam.cross(right).normalized()
-                                # Build column-major rotation matrix:
-                                # col0=right(X), col1=to_cam(Y, faces camera), col2=up(Z)
-                                rot_mat = _Mat((
-                                    (right.x,  to_cam.x,  up.x),
-                                    (right.y,  to_cam.y,  up.y),
-                                    (right.z,  to_cam.z,  up.z),
-                                ))
-                                particle_obj.rotation_euler = rot_mat.to_euler()
-                            break
-
-                # Rotation (only for MESH type — billboard handles its own orientation)
-                if not is_billboard:
-                    if is_force and has_torque:
-                        # Torque accumulates angular velocity, damping applied
-                        angular_velocity += torque_rad
-                        angular_velocity *= damp_factor
-                        rotation = (rotation[0] + angular_velocity[0] * dt,
-                                    rotation[1] + angular_velocity[1] * dt,
-                                    rotation[2] + angular_velocity[2] * dt)
-                        particle_obj.rotation_euler.x = rotation[0]
-                        particle_obj.rotation_euler.y = rotation[1]
-                        particle_obj.rotation_euler.z = rotation[2]
-                    elif has_rotation:
-                        rx = rotation[0] + (rot_rad[0] / lifetime) * dt
-                        ry = rotation[1] + (rot_rad[1] / lifetime) * dt
-                        rz = rotation[2] + (rot_rad[2] / lifetime) * dt
-                        particle_obj.rotation_euler.x = rx
-                        particle_obj.rotation_euler.y = ry
-                        particle_obj.rotation_euler.z = rz
-                        rotation = (rx, ry, rz)
-
-                self._particles[i] = (particle_obj, age, lifetime, start_size, end_size,
-                                      velocity, angular_velocity, rotation, is_billboard,
-                                      col_start, col_end, col_t0, col_t1, p_start_alpha)
-
-            # Remove dead particles
-            for i in reversed(to_remove):
-                self._particles.pop(i)
-            
-            # Emit new particles
-            if ps.enabled and ps.trigger_enabled:
-                if ps.emission_mode == 'CONTINUOUS':
-                    self._time_accumulator += dt
-                    interval = 1.0 / ps.emission_rate if ps.emission_rate > 0 else float('inf')
-                    
-                    while self._time_accumulator >= interval:
-                        self.spawn_particle(context)
-                        self._time_accumulator -= interval
-                
-                elif ps.emission_mode == 'BURST':
-                    if ps.is_one_shot:
-                        if not self._burst_triggered:
-                            for _ in range(ps.burst_count):
-                                self.spawn_particle(context)
-                            self._burst_triggered = True
-                    else:
-                        self._burst_timer += dt
-                        if self._burst_timer >= ps.emission_delay:
-                            for _ in range(ps.burst_count):
-                                self.spawn_particle(context)
-                            self._burst_timer = 0.0
-            
             # Force viewport update
             for area in context.screen.areas:
                 if area.type == 'VIEW_3D':
                     area.tag_redraw()
-        
-        return {'PASS_THROUGH'}
-    
-    def spawn_particle(self, context):
-        import math
-        obj = context.object
-        ps = obj.particle_system_props
 
-        # Limit max particles
-        if len(self._particles) >= ps.max_particles:
-            old_particle = self._particles.pop(0)
-            bpy.data.objects.remove(old_particle[0], do_unlink=True)
-
-        # Calculate spawn position based on emission shape
-        emission_shape = ps.emission_shape
-        mat = obj.matrix_world
-
-        if emission_shape == 'BOX':
-            box_size = ps.emission_box_size
-            local_offset = Vector((
-                (random.random() - 0.5) * box_size[0],
-                (random.random() - 0.5) * box_size[1],
-                (random.random() - 0.5) * box_size[2]
-            ))
-            spawn_pos = mat @ local_offset
+        return {'PASS_THROUGH'}
 
-        elif emission_shape == 'SPHERE':
-            radius = ps.emission_sphere_radius
-            u = random.random()
-            v = random.random()
-            theta = 2 * math.pi * u
-            phi   = math.acos(2 * v - 1)
-            r     = radius * (random.random() ** (1.0 / 3.0))
-            local_offset = Vector((
-                r * math.sin(phi) * math.cos(theta),
-                r * math.sin(phi) * math.sin(theta),
-                r * math.cos(phi)
-            ))
-            spawn_pos = mat @ local_offset
-
-        else:  # POINT
-            spawn_pos = mat.translation.copy()
-
-        is_billboard = (ps.particle_type == 'BILLBOARD')
-
-        if is_billboard:
+    # ------------------------------------------------------------------
+    # bpy adapter
+    # ------------------------------------------------------------------
+    def _particle_source(self, context, ps):
+        """Object every preview particle is a copy / instance of"""
+        if ps.particle_type == 'BILLBOARD':
             # Auto-create a plane (shared mesh, instanced objects)
             if self._billboard_mesh is None:
                 import bmesh as _bmesh
@@ -1186,70 +3708,123 @@ class PARTICLE_OT_preview_toggle(bpy.types.Operator):
                 v1 = bm.verts.new(( s, 0.0, -s))
                 v2 = bm.verts.new(( s, 0.0,  s))
                 v3 = bm.verts.new((-s, 0.0,  s))
-                bm.faces.new((v0, v1, v2, v3))
+                face = bm.faces.new((v0, v1, v2, v3))
+                uv_layer = bm.loops.layers.uv.new("UVMap")
+                for loop, uv in zip(face.loops, ((0.0, 0.0), (1.0, 0.0), (1.0, 1.0), (0.0, 1.0))):
+                    loop[uv_layer].uv = uv
                 bm.to_mesh(bm_data)
                 bm.free()
+                bm_data.materials.append(PARTICLE_OT_apply_material._ensure_material(ps))
                 self._billboard_mesh = bm_data
-            particle_obj = bpy.data.objects.new("PS_Billboard", self._billboard_mesh)
-        elif ps.particle_mesh:
-            particle_obj = ps.particle_mesh.copy()
-            particle_obj.data = ps.particle_mesh.data
-        else:
-            # Fallback default sphere
-            if self._default_sphere is None or self._default_sphere.name not in bpy.data.objects:
-                prev_active = context.view_layer.objects.active
-                bpy.ops.mesh.primitive_uv_sphere_add(radius=0.05, location=(0, 0, 0))
-                self._default_sphere = context.view_layer.objects.active
-                context.view_layer.objects.active = prev_active
-            particle_obj = self._default_sphere.copy()
-            particle_obj.data = self._default_sphere.data
-
-        # Link to scene
-        context.collection.objects.link(particle_obj)
-
-        # Set initial properties
-        particle_obj.location = spawn_pos
-        particle_obj.scale = Vector((ps.start_size, ps.start_size, ps.start_size))
-
-        # Calculate random velocity
-        base_vel = Vector(ps.start_velocity)
-        random_offset = Vector((
-            (random.random() - 0.5) * 2.0 * ps.velocity_random,
-            (random.random() - 0.5) * 2.0 * ps.velocity_random,
-            (random.random() - 0.5) * 2.0 * ps.velocity_random
-        ))
-        velocity = base_vel + random_offset
-
-        # Calculate lifetime
-        lifetime = ps.lifetime * (1.0 + (random.random() - 0.5) * ps.lifetime_random)
-
-        # Capture color/alpha settings at spawn time so they stay consistent
-        # even if the user changes panel values mid-preview
-        p_col_start   = tuple(ps.color_start) if ps.enable_color else (1.0, 1.0, 1.0)
-        p_col_end     = tuple(ps.color_end)   if ps.enable_color else (1.0, 1.0, 1.0)
-        p_col_t0      = (ps.color_start_time / 10.0) if ps.enable_color else 0.0
-        p_col_t1      = max(ps.color_end_time / 10.0, p_col_t0 + 0.0001) if ps.enable_color else 1.0
-        p_start_alpha = ps.start_alpha if ps.enable_alpha else 0.0
-
-        # Assign the billboard material so colors/textures show in viewport
-        if is_billboard:
-            mat_name = f"PS_BillboardMat_{obj.name}"
-            mat_data = bpy.data.materials.get(mat_name)
-            if mat_data and not particle_obj.data.materials:
-                particle_obj.data.materials.append(mat_data)
-            elif mat_data and particle_obj.data.materials:
-                particle_obj.data.materials[0] = mat_data
-
-        # Store: (obj, age, lifetime, start_size, end_size, velocity, angular_velocity, rotation,
-        #         is_billboard, col_start, col_end, col_t0, col_t1, start_alpha)
-        self._particles.append((particle_obj, 0.0, lifetime, ps.start_size, ps.end_size,
-                                velocity, Vector((0.0, 0.0, 0.0)), (0.0, 0.0, 0.0), is_billboard,
-                                p_col_start, p_col_end, p_col_t0, p_col_t1, p_start_alpha))
-    
+            if self._billboard_obj is None:
+                self._billboard_obj = bpy.data.objects.new("PS_PreviewBillboard", self._billboard_mesh)
+                self._billboard_obj['ps_preview'] = True
+                context.collection.objects.link(self._billboard_obj)
+                self._billboard_obj.hide_set(True)
+            return self._billboard_obj
+        if ps.particle_mesh:
+            return ps.particle_mesh
+        # Fallback default sphere
+        if self._default_sphere is None or self._default_sphere.name not in bpy.data.objects:
+            prev_active = context.view_layer.objects.active
+            bpy.ops.mesh.primitive_uv_sphere_add(radius=0.05, location=(0, 0, 0))
+            self._default_sphere = context.view_layer.objects.active
+            self._default_sphere['ps_preview'] = True
+            context.view_layer.objects.active = prev_active
+        return self._default_sphere
+
+    def _set_source(self, source, ps):
+        """Switch the particle object. Objects mode drops every particle, like a
+        mesh change in the game; the cloud just re-points its instancer."""
+        self._source = source
+        if self._cloud_obj is None:
+            self._clear_particles(len(self._objects))
+            self._worker.post(reset=True)
+            return
+        self._cloud_set_source(source, ps.particle_type == 'BILLBOARD', ps)
+
+    def _view_camera(self, context):
+        """Viewport eye position and rotation as NumPy arrays (None if no 3D view)"""
+        for area in context.screen.areas:
+            if area.type == 'VIEW_3D':
+                rv3d = area.spaces.active.region_3d
+                if rv3d:
+                    view_inv = rv3d.view_matrix.inverted()
+                    return np.array(view_inv.translation), np.array(view_inv.to_3x3())
+                break
+        return None, None
+
+    def _write(self, context, buf):
+        """Copy one worker frame to the viewport representation"""
+        if self._cloud_obj is not None:
+            self._cloud_sync(buf)
+            return
+
+        active = buf['active']
+        if len(active) != len(self._objects):
+            # max_particles changed: the worker reallocated its slots
+            self._clear_particles(len(active))
+        objects = self._objects
+        for i in np.flatnonzero(self._shown & ~active).tolist():
+            objects[i].scale = (0.0, 0.0, 0.0)
+        live   = np.flatnonzero(active)
+        sizes  = buf['size'][live].tolist()
+        colors = buf['color'][live].tolist() if buf['writes_color'] else None
+        rots   = buf['rot'][live].tolist() if buf['rotates'] else None
+        for k, (i, xyz) in enumerate(zip(live.tolist(), buf['pos'][live].tolist())):
+            particle_obj = objects[i]
+            if particle_obj is None:
+                # First use of this slot: create its object and keep it (pooling, like the game)
+                particle_obj = self._source.copy()
+                particle_obj['ps_preview'] = True
+                context.collection.objects.link(particle_obj)
+                objects[i] = particle_obj
+            particle_obj.location = xyz
+            s = sizes[k]
+            particle_obj.scale = (s, s, s)
+            if colors is not None:
+                particle_obj.color = colors[k]
+            if rots is not None:
+                particle_obj.rotation_euler = rots[k]
+        self._shown = active.copy()
+
+    def _cloud_set_source(self, source, is_billboard, ps):
+        """Point the instancer at source; addon-generated materials are swapped for
+        the attribute-driven preview variant so per-particle colors show up"""
+        mod = self._cloud_obj.modifiers["PS_Preview"]
+        ids = {item.name: item.identifier for item in mod.node_group.interface.items_tree
+               if item.item_type == 'SOCKET' and item.in_out == 'INPUT'}
+        mats = source.data.materials if source.data else ()
+        override = is_billboard or bool(mats and mats[0] and mats[0].get('ps_mat_key'))
+        mod[ids["Instance"]] = source
+        mod[ids["Override Material"]] = override
+        if override:
+            mod[ids["Material"]] = PARTICLE_OT_apply_material._ensure_material(ps, preview=True)
+        self._cloud_obj.update_tag()
+
+    def _cloud_sync(self, buf):
+        """Bulk-write positions, sizes, rotations and colors to the cloud mesh"""
+        mesh = self._cloud_obj.data
+        if len(mesh.vertices) != len(buf['pos']):
+            resize_preview_cloud(mesh, len(buf['pos']))
+        mesh.vertices.foreach_set('co', buf['pos'].astype(np.float32).ravel())
+        mesh.attributes['ps_size'].data.foreach_set('value', buf['size'].astype(np.float32))
+        mesh.attributes['ps_rot'].data.foreach_set('vector', buf['rot'].astype(np.float32).ravel())
+        mesh.attributes['ps_color'].data.foreach_set('color', buf['color'].astype(np.float32).ravel())
+        mesh.update()
+
+    def _clear_particles(self, capacity=0):
+        """Remove every pooled preview object and make room for capacity slots"""
+        for particle_obj in self._objects or ():
+            if particle_obj is not None:
+                bpy.data.objects.remove(particle_obj, do_unlink=True)
+        self._objects = [None] * capacity
+        self._shown   = np.zeros(capacity, dtype=bool)
+
     def execute(self, context):
         obj = context.object
         ps = obj.particle_system_props
-        
+
         if ps.preview_active:
             # Stop preview
             ps.preview_active = False
@@ -1258,46 +3833,74 @@ class PARTICLE_OT_preview_toggle(bpy.types.Operator):
         else:
             # Start preview - always reinitialize instance state to prevent bleed
             ps.preview_active = True
-            self._particles = []
-            self._time_accumulator = 0.0
-            self._last_time = 0.0
-            self._burst_timer = 0.0
-            self._burst_triggered = False
+            self._props = settings_to_props(ps)
+            self._history = (ps.preview_seed, ps.preview_checkpoint_interval)
+            self._fields = None
+            self._worker = PreviewWorker(ps.max_particles, self._props, *self._history)
+            # Reset: step 0 (and any prewarm) is rebuilt at the emitter's transform
+            mat = obj.matrix_world
+            self._worker.post(emitter=(np.array(mat.translation), np.array(mat.to_3x3().normalized())),
+                              sampler=editor_sampler(obj, ps) or False, reset=True)
+            if ps.enable_collision:
+                self._worker.post(collider=build_preview_collider(context) or False)
+            self._frame = -1
+            self._objects = None
+            self._clear_particles(ps.max_particles)
             self._original_object = obj  # Track which object started preview
             self._default_sphere = None  # Reset per-session so stale mesh isn't reused
             self._billboard_mesh = None  # Reset billboard plane mesh per-session
-            
+            self._billboard_obj  = None
+            self._source         = None
+            self._cloud_obj      = None
+            if ps.preview_mode == 'POINT_CLOUD':
+                self._cloud_obj = create_preview_cloud(context, obj, ps.max_particles)
+                self._cloud_obj['ps_preview'] = True
+            self._worker.start()
+
             wm = context.window_manager
             self._timer = wm.event_timer_add(0.016, window=context.window)
             wm.modal_handler_add(self)
             return {'RUNNING_MODAL'}
-    
+
     def cancel(self, context):
         wm = context.window_manager
         if self._timer:
             wm.event_timer_remove(self._timer)
             self._timer = None
-        
+
+        # Stop the simulation thread before touching anything it reads
+        if self._worker is not None:
+            self._worker.stop()
+
         # Clean up all particles
-        if self._particles:
-            for particle_obj, *_ in self._particles:
-                bpy.data.objects.remove(particle_obj, do_unlink=True)
-        self._particles = []
+        self._clear_particles()
+        self._worker = None
+
+        # Point Cloud mode: drop the cloud; both modes: the hidden billboard carrier
+        if self._cloud_obj is not None:
+            cloud_mesh = self._cloud_obj.data
+            bpy.data.objects.remove(self._cloud_obj, do_unlink=True)
+            bpy.data.meshes.remove(cloud_mesh)
+            self._cloud_obj = None
+        if self._billboard_obj is not None:
+            bpy.data.objects.remove(self._billboard_obj, do_unlink=True)
+            self._billboard_obj = None
+        self._source = None
 
         # Clean up shared billboard mesh data block
         if self._billboard_mesh is not None:
             bpy.data.meshes.remove(self._billboard_mesh)
             self._billboard_mesh = None
-        
+
         # Reset preview_active on the original object (in case context changed)
         if self._original_object and hasattr(self._original_object, 'particle_system_props'):
             self._original_object.particle_system_props.preview_active = False
-        
+
         # Also try current object as fallback
         obj = context.object
         if obj and hasattr(obj, 'particle_system_props'):
             obj.particle_system_props.preview_active = False
-        
+
         # Force UI update
         for area in context.screen.areas:
             if area.type == 'PROPERTIES':
@@ -1310,19 +3913,22 @@ class PARTICLE_OT_setup_logic(bpy.types.Operator):
     bl_label = "Setup Particle System"
     bl_options = {'REGISTER', 'UNDO'}
 
-    def _ensure_billboard_template(self, context, init_obj):
+    @staticmethod
+    def _ensure_billboard_template(context, init_obj):
         """Create PS_BillboardPlane as an inactive-layer template if not present.
         UPBGE's addObject() spawns from objectsInactive — objects that exist in
         the blend but are not on any active layer at game start.  We create a
         1x1 upright plane (Y-normal faces camera after billboard rotation),
         link it to the scene collection, and mark it hidden so it stays off-screen
-        until a particle system spawns an instance from it."""
+        until a particle system spawns an instance from it.
+        Planes are shared: emitters whose material key matches reuse one plane
+        and one material, so the engine compiles that shader only once."""
         import bmesh as _bm
 
-        # Unique name per emitter so multiple emitters don't share the same template
-        plane_name = f'PS_BP_{init_obj.name}'
+        ps = init_obj.particle_system_props
+        plane_name = f'PS_BP_{PARTICLE_OT_apply_material._material_key(ps)}'
 
-        # If this emitter already has its own template, nothing to do
+        # Another emitter with the same node-relevant settings already made it
         if plane_name in bpy.data.objects:
             return plane_name
 
@@ -1356,11 +3962,9 @@ class PARTICLE_OT_setup_logic(bpy.types.Operator):
         # Disable all physics so billboard instances never collide
         plane_obj.game.physics_type = 'NO_COLLISION'
 
-        # Create material and build nodes via the shared helper on PARTICLE_OT_apply_material.
+        # Get the shared material via the helper on PARTICLE_OT_apply_material.
         # This keeps node logic in one place — Apply Material button uses the same code.
-        mat_name = f"PS_BillboardMat_{init_obj.name}"
-        mat = bpy.data.materials.get(mat_name) or bpy.data.materials.new(name=mat_name)
-        PARTICLE_OT_apply_material._build_nodes(mat, init_obj.particle_system_props)
+        mat = PARTICLE_OT_apply_material._ensure_material(ps)
         plane_obj.data.materials.append(mat)
 
         return plane_name
@@ -1410,57 +4014,146 @@ class PARTICLE_OT_setup_logic(bpy.types.Operator):
 
 import bge
 from bge import logic
-from mathutils import Vector, Matrix
-import random
-import math
-
-# Module-level math cache: avoid repeated attribute lookups inside the hot loop
-_random = random.random
-_pi     = math.pi
-_acos   = math.acos
-_sin    = math.sin
-_cos    = math.cos
-_radians = math.radians
-
-class Particle:
-    __slots__ = ('position', 'velocity', 'age', 'lifetime', 'size',
-                 'obj', 'rotation', 'angular_velocity', 'local_offset', 'is_active')
-    def __init__(self):
-        self.position        = Vector((0.0, 0.0, 0.0))
-        self.velocity        = Vector((0.0, 0.0, 0.0))
-        self.age             = 0.0
-        self.lifetime        = 1.0
-        self.size            = 0.1
-        self.obj             = None
-        self.rotation        = Vector((0.0, 0.0, 0.0))
-        self.angular_velocity = Vector((0.0, 0.0, 0.0))
-        self.local_offset    = Vector((0.0, 0.0, 0.0))
-        self.is_active       = False
+import os
+import multiprocessing
+from multiprocessing import shared_memory
+from concurrent.futures import ThreadPoolExecutor
+
+#@SIM_CORE@
+
+# Text of the core above, compiled file-backed so Numba can cache its kernels
+SIM_CORE_SOURCE = '#@SIM_CORE_SOURCE@'
+# Core + worker loop, executed by the PROCESS-mode worker processes
+SIM_WORKER_SOURCE = '#@SIM_WORKER_SOURCE@'
+
+# ── Specialized write-back ──────────────────────────────────────────────
+# ParticleSystem._write_back(live, pos, size, col, rot) is assembled from
+# these templates with only the sections an emitter's features need (no
+# per-frame feature checks), compiled once per combination and shared by
+# every emitter with the same one. Change detection against the write-back
+# cache runs vectorized; only values that moved past their epsilon cost a
+# Python-level attribute write.
+_WB_HEAD = '''
+def write_back(self, live, pos, size, col, rot):
+    pool = self.particle_pool
+
+    d    = pos - self._w_pos[live]
+    mask = (d * d).sum(axis=1) > self._eps_pos_sq
+    if mask.any():
+        idx = live[mask]
+        for i, xyz in zip(idx.tolist(), pos[mask].tolist()):
+            pool[i].worldPosition = xyz
+        self._w_pos[idx] = pos[mask]
+
+    # Constant-size particles never pass this check after the spawn write
+    mask = np.abs(size - self._w_scale[live]) > self._eps_scale
+    if mask.any():
+        idx = live[mask]
+        for i, s in zip(idx.tolist(), size[mask].tolist()):
+            pool[i].worldScale = [s, s, s]
+        self._w_scale[idx] = size[mask]
+'''
+
+# Color & alpha (or Shader mode's per-particle constants)
+_WB_COLOR = '''
+    mask = (np.abs(col - self._w_color[live]) > self._eps_color).any(axis=1)
+    if mask.any():
+        idx = live[mask]
+        for i, rgba in zip(idx.tolist(), col[mask].tolist()):
+            pool[i].color = rgba
+        self._w_color[idx] = col[mask]
+'''
+
+# Re-orient only when the shared matrix changed (SCREEN) or the direction
+# to the camera turned past the angular threshold (AXIS / PER_PARTICLE)
+_WB_BILLBOARD = '''
+    cam = logic.getCurrentScene().active_camera
+    if cam:
+        need, mats = self.sim.billboard_updates(live, np.array(cam.worldPosition),
+                                                np.array(cam.worldOrientation))
+        for i, m in zip(need.tolist(), mats.tolist()):
+            pool[i].worldOrientation = m
+'''
+
+# MESH rotation. worldOrientation triggers an internal matrix decomposition
+# in UPBGE, so emitters without rotation never get this section.
+_WB_ROTATION = '''
+    for i, e in zip(live.tolist(), rot.tolist()):
+        pool[i].worldOrientation = e
+'''
+
+_write_back_variants = {}
+_mesh_arrays = {}   # (mesh datablock pointer or emitter name, vertex group) -> mesh_arrays()
+
+
+def write_back_variant(color, billboard, rotation):
+    '''The write_back(self, live, pos, size, col, rot) function for one
+    feature combination; col / rot are only read when color / rotation.'''
+    key = (bool(color), bool(billboard), bool(rotation) and not billboard)
+    fn  = _write_back_variants.get(key)
+    if fn is None:
+        src = _WB_HEAD
+        if key[0]:
+            src += _WB_COLOR
+        if key[1]:
+            src += _WB_BILLBOARD
+        if key[2]:
+            src += _WB_ROTATION
+        ns = {'np': np, 'logic': logic}
+        exec(compile(src, f"<write_back color={key[0]} billboard={key[1]} rotation={key[2]}>", 'exec'), ns)
+        fn = _write_back_variants[key] = ns['write_back']
+    return fn
+
+
 class ParticleSystem:
+    '''KX adapter around the shared ParticleSim core: reads game properties,
+    owns the pooled KX_GameObjects (index == simulation slot), runs the
+    collision ray casts and writes the simulated state back to the objects.'''
     def __init__(self, emitter_obj):
         self.emitter          = emitter_obj
-        self.particle_pool    = []
-        self.inactive_stack   = []   # FAST O(1) pool: stack of inactive indices
-        self.time_since_emit  = 0.0
+        self.particle_pool    = []   # KX_GameObjects, index == simulation slot
+        self.sim              = None
         self.particle_template = None
-        self.burst_triggered  = False
         self.props            = {}
-        # Cached per-frame scalars hoisted out of the particle loop
-        self._grav            = Vector((0.0, 0.0, -9.8))
-        self._is_local        = False
-        self._is_force        = False
-        self._size_start      = 0.1
-        self._size_delta      = 0.0   # end_size - start_size, pre-subtracted
-        self._damping_factor  = 1.0   # (1 - damping * dt), pre-multiplied
         self._enable_collision = False
-        self._bounce          = 0.5
         self._prev_mesh       = ''
         self._props_raw       = ()   # Dirty-flag cache: last known raw prop tuple
-        self._is_billboard    = False
         self._lod_level       = 0    # Current active LOD level (0 = full sim)
+        self._cache           = None # CacheReader while playing a baked cache
+        self._cache_path      = ''
+        self._step_in         = None # Frame inputs captured by prepare()
+        self._emitter_last   = None # Emitter (pos, ori) at the last simulated step
+        self._emitter_frames = (None, None) # Emitter (pos, ori) of the last frame and this one
+        self._sampler_key    = None # (shape, vertex group, scale) the mesh table was built for
+        self._step_out        = None # simulate() results waiting for apply()
+        self._no_coll         = False
+        self._worker          = None # Pipe to the worker process (PROCESS update mode)
+        self._shm             = None # Shared double-buffered frames of that worker
+        self._frames          = None
+        self._pending         = False # A step is in flight in the worker
+        self._pending_alpha   = 1.0
+        self._buf             = 0    # Frame buffer the last step was written to
+        self._discard         = False # Drop the in-flight frame (killed meanwhile)
+        self._batch_key       = None # ParticleBatch this sim is packed into (BATCH mode)
+        self._tick            = None # (steps, step dt, alpha) from the manager's FixedClock
+        self._clock_key       = None # Key of that clock in the manager's FixedClocks
+        self._moved           = False
+        self._fields          = None # ForceFields snapshot of this frame (set by the manager)
+        self._index           = None # SpatialHash of the live particles for the manager's queries
+        self._index_slots     = None
+        self._index_frame     = -1   # Manager frame the index was built in
+        self._shader_time     = 0.0  # Manager's shader clock this frame (Shader color mode)
+        self._shade_shift     = 0.0  # _shader_shift() of the step in flight in the worker
+        self._time_node       = None # ps_time Value node of the template's material
         self.load_properties()
         self.create_particle_template()
         self.initialize_pool()
+        self._cache_frame_constants()
+        # Prewarm: start settled instead of empty, no load-time simulation loop
+        if self.props['prewarm'] and self.props['enabled'] and self._cache is None:
+            self._spawn(self.sim.prewarm(np.array(self.emitter.worldPosition),
+                                         np.array(self.emitter.worldOrientation)))
+            self._from[:] = self.sim.pos
 
     # ------------------------------------------------------------------
     # Properties
@@ -1545,6 +4238,41 @@ class ParticleSystem:
             g('ps_lod3_no_coll',        True),   # 72
             g('ps_lod3_no_emit',        True),   # 73
             g('ps_lod3_destroy',        True),   # 74
+            g('ps_write_eps_pos',       0.0),    # 75
+            g('ps_write_eps_scale',     0.0005), # 76
+            g('ps_write_eps_color',     0.004),  # 77
+            g('ps_color_mode',          'CPU'),  # 78
+            g('ps_atlas_cells',         0),      # 79
+            g('ps_atlas_index',         0),      # 80
+            g('ps_atlas_random',        1),      # 81
+            g('ps_billboard_mode',      'PER_PARTICLE'),  # 82
+            g('ps_billboard_axis',      'Z'),    # 83
+            g('ps_billboard_threshold', 1.0),    # 84
+            g('ps_cache_file',          ''),     # 85
+            g('ps_cache_loop',          True),   # 86
+            g('ps_prewarm',             False),  # 87
+            g('ps_update_mode',         'SERIAL'),  # 88
+            g('ps_fixed_step',          False),  # 89
+            g('ps_fixed_rate',          30.0),   # 90
+            g('ps_max_substeps',        4),      # 91
+            g('ps_time_scale',          1.0),    # 92
+            g('ps_subframe',            True),   # 93
+            g('ps_vertex_group',        ''),     # 94
+            g('ps_normal_velocity',     0.0),    # 95
+            g('ps_emission_shell',      False),  # 96
+            g('ps_emission_inner',      0.5),    # 97
+            g('ps_cone_angle',          25.0),   # 98
+            g('ps_edge_length',         1.0),    # 99
+            g('ps_field_weight',        1.0),    # 100
+            g('ps_turbulence',          0.0),    # 101
+            g('ps_turb_scale',          1.0),    # 102
+            g('ps_turb_speed',          0.5),    # 103
+            g('ps_interaction',         False),  # 104
+            g('ps_interact_radius',     0.25),   # 105
+            g('ps_repulsion',           20.0),   # 106
+            g('ps_cohesion',            0.0),    # 107
+            g('ps_contact_damping',     0.5),    # 108
+            g('ps_tint_random',         0.0),    # 109
         )
 
     def _build_props_from_raw(self, r):
@@ -1610,6 +4338,41 @@ class ParticleSystem:
             'lod3_no_coll':           r[72],
             'lod3_no_emit':           r[73],
             'lod3_destroy':           r[74],
+            'write_eps_pos':          r[75],
+            'write_eps_scale':        r[76],
+            'write_eps_color':        r[77],
+            'color_mode':             r[78],
+            'atlas_cells':            r[79],
+            'atlas_index':            r[80],
+            'atlas_random':           r[81],
+            'billboard_mode':         r[82],
+            'billboard_axis':         r[83],
+            'billboard_threshold':    r[84],
+            'cache_file':             r[85],
+            'cache_loop':             r[86],
+            'prewarm':                r[87],
+            'update_mode':            r[88],
+            'fixed_step':             r[89],
+            'fixed_step_rate':        r[90],
+            'max_substeps':           r[91],
+            'time_scale':             r[92],
+            'subframe_emission':      r[93],
+            'vertex_group':           r[94],
+            'normal_velocity':        r[95],
+            'emission_shell':         r[96],
+            'emission_inner_radius':  r[97],
+            'emission_cone_angle':    r[98],
+            'emission_edge_length':   r[99],
+            'field_weight':           r[100],
+            'turbulence_strength':    r[101],
+            'turbulence_scale':       r[102],
+            'turbulence_speed':       r[103],
+            'enable_interaction':     r[104],
+            'interaction_radius':     r[105],
+            'repulsion':              r[106],
+            'cohesion':               r[107],
+            'contact_damping':        r[108],
+            'tint_random':            r[109],
         }
 
     def load_properties(self):
@@ -1629,72 +4392,28 @@ class ParticleSystem:
         self._build_props_from_raw(raw)
         return True
 
-    def _cache_frame_constants(self, dt):
-        '''Hoist props that are constant for all particles this frame.
-        Called once per update() instead of once per particle.'''
+    def _cache_frame_constants(self):
+        '''Hand the props to the simulation core and cache the adapter-side
+        constants. Called only when a game property changed.'''
         p = self.props
-        self._is_local   = (p['simulation_space'] == 'LOCAL')
-        self._is_force   = (p['movement_type']    == 'FORCE')
-        self._size_start = p['start_size']
-        self._size_delta = p['end_size'] - p['start_size']
-        self._enable_collision = p['enable_collision']
-        self._bounce     = p['bounce_strength']
-
-        grav_t = p['gravity']
-        grav_w = Vector(grav_t)
-
-        if self._is_force:
-            force_t = p['force']
-            force_w = Vector(force_t)
-            damping  = p['damping']
-            self._damping_factor = 1.0 - damping * dt
-            if self._is_local:
-                ori = self.emitter.worldOrientation
-                self._acc_per_sec = ori @ force_w + ori @ grav_w
-            else:
-                self._acc_per_sec = force_w + grav_w
-            self._acc = self._acc_per_sec * dt
-            # Pre-convert torque to radians/sec² — store per-sec so dt can be reapplied cheaply
-            torq = p['torque']
-            self._torque_per_sec = Vector((_radians(torq[0]),
-                                           _radians(torq[1]),
-                                           _radians(torq[2])))
-            self._torque_rad = self._torque_per_sec * dt
-        else:
-            self._damping_factor = 1.0
-            if self._is_local:
-                ori = self.emitter.worldOrientation
-                self._acc_per_sec = ori @ grav_w
-            else:
-                self._acc_per_sec = grav_w.copy()
-            self._acc = self._acc_per_sec * dt
-
-        # Pre-convert SIMPLE rotation speed to rad/frame-unit (divided by lifetime
-        # later per particle, but store the radians part now)
-        rot = p['rotation']
-        self._rot_has_value = (rot[0] != 0.0 or rot[1] != 0.0 or rot[2] != 0.0)
-        self._rot_rad = Vector((_radians(rot[0]),
-                                _radians(rot[1]),
-                                _radians(rot[2])))
-
-        # Pre-check torque for FORCE mode — if all zero, skip worldOrientation writes
-        torq_vals = p['torque']
-        self._has_torque = (torq_vals[0] != 0.0 or torq_vals[1] != 0.0 or torq_vals[2] != 0.0)
+        self.sim.configure(p)
+        self._from[:] = self.sim.pos   # Fixed timestep may have just turned on
+        if self._worker is not None:
+            self._worker.send(('props', id(self), p))
 
-        # Billboard mode flag
-        self._is_billboard = (p['particle_type'] == 'BILLBOARD')
-
-        # Color over lifetime
-        self._enable_color     = p['enable_color']
-        self._color_start      = p['color_start']
-        self._color_end        = p['color_end']
-        # Normalise the 0-10 timing values to 0-1 ratios
-        self._color_t_start    = p['color_start_time'] / 10.0
-        self._color_t_end      = max(p['color_end_time'] / 10.0, self._color_t_start + 0.0001)
-
-        # Alpha over lifetime
-        self._enable_alpha     = p['enable_alpha']
-        self._start_alpha      = p['start_alpha']
+        self._update_sampler()
+        self._enable_collision = p['enable_collision']
+        if p['cache_file'] != self._cache_path:
+            self._open_cache(p['cache_file'])
+
+        # Write-back specialized for the features in use (bound as a method)
+        sim = self.sim
+        self._write_back = write_back_variant(
+            sim.writes_color, sim.is_billboard, sim.has_torque or sim.rot_has_value).__get__(self)
+        if self._cache is not None:
+            # Baked frames carry the channels of the bake, not of the current props
+            self._play_write_back = write_back_variant(
+                self._cache.has_color, sim.is_billboard, self._cache.has_rot).__get__(self)
 
         # LOD settings — cache the full table once per props change
         self._lod_enabled  = p['enable_lod']
@@ -1709,6 +4428,49 @@ class ParticleSystem:
              p['lod3_no_coll'], p['lod3_no_emit'], p['lod3_destroy']),
         )
 
+        # Write-back epsilons — position compared squared to avoid a sqrt per particle
+        eps_pos = p['write_eps_pos']
+        self._eps_pos_sq  = eps_pos * eps_pos
+        self._eps_scale   = p['write_eps_scale']
+        self._eps_color   = p['write_eps_color']
+
+    def _update_sampler(self):
+        '''Mesh emission table — rebuilt when the shape, vertex group or the
+        emitter's scale changes (the table has the scale built in)'''
+        p   = self.props
+        key = None
+        if p['emission_shape'] in MESH_SHAPES:
+            key = (p['emission_shape'], p['vertex_group'], tuple(self.emitter.worldScale))
+        if key != self._sampler_key:
+            self._sampler_key = key
+            self.sim.sampler  = self._mesh_sampler() if key else None
+            if self._worker is not None:
+                self._send_sampler()
+
+    def _mesh_sampler(self):
+        '''MeshSampler of the emitter's Blender mesh for the SURFACE / VERTEX
+        shapes, at the emitter's current scale. None without a mesh. The mesh
+        is read once per datablock and vertex group (_mesh_arrays), so a
+        scale change only rebuilds the table.'''
+        p       = self.props
+        shape   = p['emission_shape']
+        surface = shape == 'SURFACE'
+        ob      = getattr(self.emitter, 'blenderObject', None)
+        mesh    = ob.data if ob is not None and ob.type == 'MESH' else None
+        key     = (mesh.as_pointer() if mesh is not None else self.emitter.name, p['vertex_group'])
+        if key not in _mesh_arrays:
+            arrays = _mesh_arrays[key] = mesh_arrays(mesh, ob.vertex_groups, p['vertex_group']) if mesh else None
+            if arrays is None:
+                print(f"✗ {shape} emission: '{self.emitter.name}' has no mesh faces, emitting from its origin")
+            else:
+                print(f"✓ {shape} emission: {len(arrays[1]) // 3 if surface else len(arrays[0])} "
+                      f"{'triangles' if surface else 'vertices'}")
+        arrays = _mesh_arrays[key]
+        if arrays is None:
+            return None
+        co, tris, weights = arrays
+        return MeshSampler(co * np.array(self.emitter.worldScale), tris, weights, surface)
+
     # ------------------------------------------------------------------
     # Pool management
     # ------------------------------------------------------------------
@@ -1731,158 +4493,336 @@ class ParticleSystem:
                 print(f"✓ Template: {mesh_name}")
             else:
                 print(f"✗ ERROR: '{mesh_name}' not in objectsInactive!")
+        self._time_node = self._find_time_node()
+
+    def _find_time_node(self):
+        '''The ps_time Value node of the template's material, which Shader
+        color mode ages the particles from. None without one.'''
+        ob  = getattr(self.particle_template, 'blenderObject', None)
+        mat = ob.active_material if ob is not None else None
+        if mat is None or not mat.use_nodes:
+            return None
+        return mat.node_tree.nodes.get('ps_time')
 
     def initialize_pool(self):
-        if not self.particle_template:
-            return
-        scene = logic.getCurrentScene()
-        max_p = self.props['max_particles']
-        print(f"Creating particle pool: {max_p} particles...")
+        if self.particle_template:
+            scene = logic.getCurrentScene()
+            max_p = self.props['max_particles']
+            print(f"Creating particle pool: {max_p} particles...")
+            zero3 = [0.0, 0.0, 0.0]
+            for i in range(max_p):
+                try:
+                    obj = scene.addObject(self.particle_template, self.emitter, 0)
+                    obj.worldScale = zero3
+                    obj.visible = False
+                except Exception as e:
+                    print(f"Pool creation error: {e}")
+                    continue
+                self.particle_pool.append(obj)
+            print(f"✓ Pool ready: {len(self.particle_pool)} particles")
+
+        # One simulation slot per pooled object. Write-back cache: last values
+        # actually pushed to each KX_GameObject (inf = unknown, next write goes through)
+        n = len(self.particle_pool)
+        self.sim      = ParticleSim(n)
+        self._w_pos   = np.full((n, 3), np.inf)
+        self._w_scale = np.full(n, np.inf)
+        self._w_color = np.full((n, 4), np.inf)
+        # Fixed timestep: positions before the last step, drawn pos interpolates from them
+        self._from    = np.zeros((n, 3))
+
+    def _spawn(self, idx):
+        '''Show freshly emitted slots. Spawn writes go straight through —
+        seed the write-back cache with them.'''
+        sim  = self.sim
+        pool = self.particle_pool
+        s    = sim.size_start
+        for i, xyz in zip(idx.tolist(), sim.pos[idx].tolist()):
+            obj = pool[i]
+            obj.worldPosition = xyz
+            obj.worldScale = [s, s, s]
+            obj.visible = True
+        self._w_pos[idx]   = sim.pos[idx]
+        self._w_scale[idx] = s
+        self._w_color[idx] = np.inf   # New life, new seed — force the first color write
+
+    def _hide(self, idx):
+        '''Collapse and hide the objects of slots the core just freed'''
+        pool  = self.particle_pool
         zero3 = [0.0, 0.0, 0.0]
-        for i in range(max_p):
-            p = Particle()
-            try:
-                p.obj = scene.addObject(self.particle_template, self.emitter, 0)
-                p.obj.worldScale = zero3
-                p.obj.visible = False
-            except Exception as e:
-                print(f"Pool creation error: {e}")
-                continue
-            self.particle_pool.append(p)
-            self.inactive_stack.append(i)   # All start inactive
-        print(f"✓ Pool ready: {len(self.particle_pool)} particles")
-
-    def get_inactive_particle(self):
-        '''O(1) pop from inactive stack instead of O(n) linear scan'''
-        if self.inactive_stack:
-            return self.particle_pool[self.inactive_stack.pop()]
-        return None
+        for i in idx.tolist():
+            obj = pool[i]
+            obj.worldScale = zero3
+            obj.visible = False
+        self._w_scale[idx] = 0.0
+
+    def _kill_all(self):
+        '''Kill and hide every particle, in the worker process too'''
+        self._hide(self.sim.kill_all())
+        if self._worker is not None:
+            self._worker.send(('kill', id(self)))
+            self._discard = self._pending
+
+    def _show_slots(self, slots):
+        '''Make exactly slots the live particles. Baked and worker frames arrive
+        as slot lists rather than spawn / kill events: slots that dropped out
+        are hidden, new ones shown with their first write-back forced.'''
+        sim = self.sim
+        was = sim.active.copy()
+        sim.active[:]     = False
+        sim.active[slots] = True
+        self._hide(np.flatnonzero(was & ~sim.active))
+        born = np.flatnonzero(sim.active & ~was)
+        pool = self.particle_pool
+        for i in born.tolist():
+            pool[i].visible = True
+        self._w_pos[born]   = np.inf
+        self._w_scale[born] = np.inf
+        self._w_color[born] = np.inf
+        sim.bb_dir[born]    = 0.0
+        sim.bb_gen[born]    = -1
+        sim.live = slots
 
-    def deactivate_particle(self, p):
-        '''Hide and push index back onto inactive stack'''
-        p.is_active = False
-        if p.obj:
-            p.obj.worldScale = [0.0, 0.0, 0.0]
-            p.obj.visible = False
-        # Recover index by identity search (only on deactivation, not hot path)
-        idx = self.particle_pool.index(p)
-        self.inactive_stack.append(idx)
+    # ------------------------------------------------------------------
+    # Collision
+    # ------------------------------------------------------------------
+    def _collide(self):
+        '''Ray from the pre-integration position to the post-integration position,
+        so the ray spans exactly the segment each particle travelled this frame.
+        rayCast(to, from, dist) — order matters. Returns the hits
+        (idx, hit_pos, hit_normal) or None.'''
+        sim  = self.sim
+        live = sim.live
+        to   = sim.pos[live]
+        frm  = sim.prev_pos[live]
+        seg  = to - frm
+        dist = np.sqrt((seg * seg).sum(axis=1))
+        pool = self.particle_pool
+        hits, hit_pos, hit_normal = [], [], []
+        for i, t, f, d in zip(live.tolist(), to.tolist(), frm.tolist(), dist.tolist()):
+            if d > 0.0:
+                hit_obj, hp, hn = pool[i].rayCast(t, f, d)
+                if hit_obj:
+                    hits.append(i)
+                    hit_pos.append(hp)
+                    hit_normal.append(hn)
+        if not hits:
+            return None
+        hits = (np.array(hits), np.array(hit_pos), np.array(hit_normal))
+        sim.collide(*hits)
+        return hits
 
     # ------------------------------------------------------------------
-    # Emission
+    # Spatial queries
     # ------------------------------------------------------------------
-    def emit_particle(self):
-        p = self.get_inactive_particle()
-        if not p:
-            return
+    def spatial_index(self, frame):
+        '''(SpatialHash, slots) over the live particles for the manager's
+        queries: index j of a query result is slot slots[j]. Built by the first
+        query of a frame only — frames nobody asks about cost nothing.
+        (None, slots) while no particle is alive.'''
+        if self._index_frame != frame:
+            self._index_frame = frame
+            live = self.sim.live
+            self._index_slots = live.copy()
+            self._index = None
+            if len(live):
+                pos = self.sim.pos[live]
+                # About one point per cell along the spread of the particles
+                extent = float(np.ptp(pos, axis=0).max())
+                cell   = max(extent, 1e-3) / max(1, round(len(live) ** (1.0 / 3.0)))
+                self._index = SpatialHash(cell).build(pos)
+        return self._index, self._index_slots
 
-        emission_shape  = self.props['emission_shape']
-        emitter_pos     = self.emitter.worldPosition
-        emitter_ori     = self.emitter.worldOrientation
-        spawn_local_offset = Vector((0.0, 0.0, 0.0))
-
-        if emission_shape == 'BOX':
-            bx, by, bz = self.props['emission_box_size']
-            spawn_local_offset = Vector((
-                (_random() - 0.5) * bx,
-                (_random() - 0.5) * by,
-                (_random() - 0.5) * bz,
-            ))
-            if self._is_local:
-                spawn_pos = emitter_pos + (emitter_ori @ spawn_local_offset)
-            else:
-                spawn_pos = emitter_pos + spawn_local_offset
-
-        elif emission_shape == 'SPHERE':
-            radius = self.props['emission_sphere_radius']
-            theta  = 2.0 * _pi * _random()
-            phi    = _acos(2.0 * _random() - 1.0)
-            r      = radius * (_random() ** (1.0 / 3.0))
-            sin_phi = _sin(phi)
-            spawn_local_offset = Vector((
-                r * sin_phi * _cos(theta),
-                r * sin_phi * _sin(theta),
-                r * _cos(phi),
-            ))
-            if self._is_local:
-                spawn_pos = emitter_pos + (emitter_ori @ spawn_local_offset)
+    # ------------------------------------------------------------------
+    # Baked playback
+    # ------------------------------------------------------------------
+    def _open_cache(self, path):
+        '''Switch between simulation and playback of the baked cache at path'''
+        self._kill_all()
+        self._cache      = None
+        self._cache_path = path
+        self._play_time  = 0.0
+        self._play_frame = -1
+        self._play_on    = False
+        if not path:
+            return
+        try:
+            self._cache = CacheReader(logic.expandPath(path))
+        except (OSError, ValueError) as e:
+            print(f"✗ Cache '{path}': {e} — simulating instead")
+            return
+        if self._cache.capacity > len(self.particle_pool):
+            print(f"✗ Cache '{path}' needs {self._cache.capacity} particles, pool has "
+                  f"{len(self.particle_pool)} — simulating instead")
+            self._cache = None
+            return
+        print(f"✓ Cache: {path} ({self._cache.frames} frames @ {self._cache.fps:g} fps)")
+
+    def _play(self, dt, running):
+        '''Stream the current cache frame into the slots and hand it to the
+        normal write-back — no simulation runs. Plays while running, restarts
+        when running turns on again, pauses otherwise.'''
+        cache = self._cache
+        sim   = self.sim
+        if running and not self._play_on:
+            self._play_time = 0.0
+        self._play_on = running
+
+        f = int(self._play_time * cache.fps)
+        if running:
+            self._play_time += dt
+        if f >= cache.frames:
+            f = f % cache.frames if self.props['cache_loop'] else -1
+
+        if f != self._play_frame:
+            self._play_frame = f
+            if f >= 0:
+                slots, pos, size, rot, col = cache.frame(f)
             else:
-                spawn_pos = emitter_pos + spawn_local_offset
-
-        else:  # POINT
-            spawn_pos = emitter_pos.copy()
-
-        # Velocity
-        vr = self.props['velocity_random']
-        sv = self.props['start_velocity']
-        local_vel = Vector((
-            sv[0] + (_random() - 0.5) * 2.0 * vr,
-            sv[1] + (_random() - 0.5) * 2.0 * vr,
-            sv[2] + (_random() - 0.5) * 2.0 * vr,
-        ))
-        world_vel = (emitter_ori @ local_vel) if self._is_local else local_vel
-
-        lifetime = self.props['lifetime'] * (1.0 + (_random() - 0.5) * self.props['lifetime_random'])
-
-        # Reset particle state
-        p.position.x = spawn_pos.x; p.position.y = spawn_pos.y; p.position.z = spawn_pos.z
-        p.velocity.x = world_vel.x; p.velocity.y = world_vel.y; p.velocity.z = world_vel.z
-        p.local_offset.x = spawn_local_offset.x
-        p.local_offset.y = spawn_local_offset.y
-        p.local_offset.z = spawn_local_offset.z
-        p.age      = 0.0
-        p.lifetime = lifetime
-        p.size     = self._size_start
-        p.rotation.x = 0.0; p.rotation.y = 0.0; p.rotation.z = 0.0
-        p.angular_velocity.x = 0.0; p.angular_velocity.y = 0.0; p.angular_velocity.z = 0.0
-        p.is_active = True
-
-        if p.obj:
-            p.obj.worldPosition = spawn_pos
-            s = self._size_start
-            p.obj.worldScale = [s, s, s]
-            p.obj.visible = True
-
-    def emit_burst(self):
-        for _ in range(self.props['burst_count']):
-            self.emit_particle()
-
-    def _emit_burst_lod(self, burst_count, max_particles):
-        active_count = len(self.particle_pool) - len(self.inactive_stack)
-        slots_free   = max(0, max_particles - active_count)
-        count        = min(burst_count, slots_free)
-        for _ in range(count):
-            self.emit_particle()
+                slots, pos, size, rot, col = np.zeros(0, dtype=np.intp), np.zeros((0, 3)), np.zeros(0), None, None
+
+            self._show_slots(slots)
+            self._play_local  = (pos, rot)   # Emitter-relative — placed every frame below
+            self._play_values = (size, col)
+
+        live = sim.live
+        if len(live):
+            pos, rot = from_emitter_space(*self._play_local, np.array(self.emitter.worldPosition),
+                                          np.array(self.emitter.worldOrientation), cache.is_local)
+            sim.pos[live] = pos
+            self._play_write_back(live, pos, *self._play_values, rot)
 
     # ------------------------------------------------------------------
-    # Main update
+    # Worker process (PROCESS update mode)
     # ------------------------------------------------------------------
-    def update(self, dt):
+    def attach_worker(self, conn):
+        '''Move the simulation into the worker process behind conn. The state
+        travels with get_state(); finished frames come back through a shared
+        double buffer, so only compact commands cross the pipe.'''
+        cap = self.sim.capacity
+        self._shm     = shared_memory.SharedMemory(create=True, size=frame_buffer_size(cap))
+        self._frames  = frame_views(self._shm.buf, cap)
+        self._worker  = conn
+        self._pending = False
+        conn.send(('open', id(self), self._shm.name, cap, self.sim.get_state()))
+        conn.send(('props', id(self), self.props))
+        if self.sim.sampler is not None:
+            self._send_sampler()
+
+    def _send_sampler(self):
+        '''The worker rebuilds the mesh table from its source arrays'''
+        sampler = self.sim.sampler
+        self._worker.send(('sampler', id(self), sampler.args if sampler is not None else None))
+
+    def detach_worker(self):
+        '''Take the simulation back from the worker process'''
+        conn = self._worker
+        hits = self._receive()
+        conn.send(('close', id(self)))
+        state = conn.recv(id(self))
+        self._show_slots(state['idx'])
+        self.sim.set_state(state)
+        self._from[:] = self.sim.pos
+        if hits is not None:
+            self.sim.collide(*hits)   # Found on the last frame, after the worker's step
+        self._worker   = None
+        self._pending  = False
+        self._discard  = False
+        self._frames   = None
+        self._shm.close()
+        self._shm.unlink()
+        self._shm      = None
+
+    def _receive(self):
+        '''Wait for the step in flight and show its frame. Returns the collision
+        hits found on it (owed to the worker's state) or None.'''
+        if not self._pending:
+            return None
+        frame = self._frames[self._worker.recv(id(self))]
+        self._pending = False
+        if self._discard:
+            self._discard = False
+            return None
+        sim   = self.sim
+        n     = int(frame['count'][0])
+        slots = frame['slots'][:n].astype(np.intp)
+        self._show_slots(slots)
+        if not n:
+            return None
+        sim.pos[slots]      = frame['pos'][:n]
+        sim.prev_pos[slots] = frame['prev'][:n]
+        hits = None
+        if self._enable_collision and not self._no_coll and self._moved:
+            hits = self._collide()
+        pos = sim.pos[slots]
+        if self._tick is not None:
+            frm = sim.prev_pos[slots]
+            pos = frm + (pos - frm) * self._pending_alpha
+        col = None
+        if sim.writes_color:
+            col = frame['color'][:n]
+            if sim.shader_color:
+                col = self._shade(col.copy(), self._shade_shift)
+        self._write_back(slots, pos, frame['size'][:n], col,
+                         frame['rot'][:n] if (sim.has_torque or sim.rot_has_value) else None)
+        return hits
+
+    def exchange(self):
+        '''PROCESS mode counterpart of simulate() + apply(): show the frame the
+        worker finished since the last call, then send it this frame's step.
+        The worker integrates while the logic thread moves on (other emitters,
+        rendering), so the particles trail the emitter by one frame.'''
+        hits = self._receive()   # Applied by the worker before it integrates
+
+        # Double buffer: the worker writes the frame this one did not read
+        steps, dt = self._substeps()
+        if steps:
+            self._step_to_end()
+        _, emit, self._no_coll, emitter_pos, emitter_ori, emitter_prev = self._step_in
+        if steps:
+            self._emitter_last = (emitter_pos, emitter_ori)
+        self._buf ^= 1
+        fields = self._fields.args if self._fields is not None else None
+        self._worker.send(('step', id(self), self._buf, steps, dt, emit,
+                           emitter_pos, emitter_ori, emitter_prev, fields, hits))
+        self._pending       = True
+        self._moved         = steps > 0
+        self._pending_alpha = self._tick[2] if self._tick is not None else 1.0
+        self._shade_shift   = self._shader_shift()
+
+    # ------------------------------------------------------------------
+    # Main update — prepare (logic thread) / simulate (any thread) / apply (logic thread)
+    # ------------------------------------------------------------------
+    def prepare(self, dt):
+        '''Everything that reads the engine before the numeric step: props sync,
+        mesh change, time scale, LOD and the emitter transform. Returns False
+        when nothing is left to simulate this frame (paused, or baked playback
+        already wrote its frame).'''
         prev_mesh = self.props.get('particle_mesh')
 
         # Sync properties only if a game property actually changed this frame.
         # On stable frames this costs one tuple comparison and nothing else.
-        props_changed = self.sync_properties()
+        if self.sync_properties():
+            self._cache_frame_constants()
+        elif self._sampler_key is not None:
+            self._update_sampler()   # The emitter may have been scaled
 
         # Mesh change: deactivate pool and refresh template
         if self.props.get('particle_mesh') != prev_mesh:
-            for p in self.particle_pool:
-                if p.is_active:
-                    self.deactivate_particle(p)
+            self._kill_all()
             self.create_particle_template()
 
-        # Recache frame constants only when props changed OR first frame
-        if props_changed or not hasattr(self, '_acc'):
-            self._cache_frame_constants(dt)
-        else:
-            # Props stable: only rebuild the dt-dependent parts (acc scales with dt)
-            self._acc = self._acc_per_sec * dt
-            if self._is_force:
-                self._damping_factor = 1.0 - self.props['damping'] * dt
-                self._torque_rad = self._torque_per_sec * dt
-
         props = self.props
 
+        # Time scale 0 freezes the particles where they are: no LOD, emission,
+        # integration or write-back until it is raised again
+        scale = props['time_scale']
+        if scale <= 0.0:
+            self._emitter_last   = None   # Resume without a path from where it paused
+            self._emitter_frames = (None, None)
+            return False
+        dt *= scale
+
         # ── LOD evaluation ─────────────────────────────────────────
         # Runs once per update() — O(1) distance check against active camera.
         lod_max_particles = props['max_particles']   # default: main setting
@@ -1915,220 +4855,519 @@ class ParticleSystem:
 
             # Destroy particles when entering a new LOD level that requests it
             if lod_destroy and self._lod_level != prev_lod_level:
-                for p in self.particle_pool:
-                    if p.is_active:
-                        self.deactivate_particle(p)
+                self._kill_all()
         # ── end LOD ────────────────────────────────────────────────
 
+        # Baked playback: frames stream from the memory-mapped cache
+        if self._cache is not None:
+            self._play(dt, props['enabled'] and props['trigger'] and not lod_no_emit)
+            return False
+
         # Spawn logic — LOD overrides max_particles, rate and burst_count
+        emit = None
         if props['enabled'] and not lod_no_emit:
-            mode    = props['emission_mode']
-            trigger = props['trigger']
-
-            if mode == 'CONTINUOUS':
-                if trigger:
-                    self.time_since_emit += dt
-                    rate = lod_emission_rate
-                    interval = 1.0 / rate if rate > 0 else float('inf')
-                    while self.time_since_emit >= interval:
-                        # Respect LOD max_particles soft cap
-                        active_count = len(self.particle_pool) - len(self.inactive_stack)
-                        if active_count < lod_max_particles:
-                            self.emit_particle()
-                        self.time_since_emit -= interval
-
-            elif mode == 'BURST':
-                if props['is_one_shot']:
-                    if trigger and not self.burst_triggered:
-                        self._emit_burst_lod(lod_burst_count, lod_max_particles)
-                        self.burst_triggered = True
-                    elif not trigger:
-                        self.burst_triggered = False
-                else:
-                    if trigger:
-                        self.time_since_emit += dt
-                        if self.time_since_emit >= props['emission_delay']:
-                            self._emit_burst_lod(lod_burst_count, lod_max_particles)
-                            self.time_since_emit = 0.0
-
-        # --- Particle update loop (hot path) ---
-        acc              = self._acc
-        is_force         = self._is_force
-        damping_factor   = self._damping_factor
-        enable_collision = self._enable_collision and not lod_no_coll
-        bounce           = self._bounce
-        size_start       = self._size_start
-        size_delta       = self._size_delta
-        rot_has_value    = self._rot_has_value
-        is_billboard     = self._is_billboard
-        emitter_ori      = self.emitter.worldOrientation
-
-        if is_force:
-            torque_rad   = self._torque_rad
-            damping_fac  = self._damping_factor
-
-        has_torque   = self._has_torque
-        if not is_force and rot_has_value:
-            rot_rad = self._rot_rad
-
-        # Hoist billboard camera lookup outside the loop — same camera for all particles this frame
-        bb_cam = None
-        if is_billboard:
-            _scene = logic.getCurrentScene()
-            bb_cam = _scene.active_camera
-
-        # Color & alpha locals — LOD overrides applied on top
-        enable_color  = self._enable_color
-        enable_alpha  = self._enable_alpha
-        color_start   = self._color_start
-        color_end     = self._color_end
-        color_t_start = self._color_t_start
-        color_t_end   = self._color_t_end
-        start_alpha   = self._start_alpha
-
-        for p in self.particle_pool:
-            if not p.is_active:
-                continue
+            emit = (props['trigger'], lod_emission_rate, lod_burst_count, lod_max_particles)
+        # The transform at the last simulated step lets sub-frame emission spread
+        # spawns along the path (advanced by _begin / exchange once steps run)
+        emitter = (np.array(self.emitter.worldPosition), np.array(self.emitter.worldOrientation))
+        self._emitter_frames = (self._emitter_frames[1], emitter)
+        self._step_in = (dt, emit, lod_no_coll) + emitter + (self._emitter_last,)
+        return True
 
-            p.age += dt
-            if p.age >= p.lifetime:
-                self.deactivate_particle(p)
-                continue
+    def simulate(self):
+        '''Numeric part of the frame: emission, integration and the per-slot
+        size / color / rotation values. Touches only the core's arrays (no
+        KX_GameObject access), so the manager may run it on a worker thread.'''
+        steps, dt = self._substeps()
+        self._begin(steps)
+        for _ in range(steps):
+            self._emit(dt)
+            # Integrate every particle in one vectorized pass
+            self._dead.append(self.sim.step(dt, self._step_in[4], self._fields))
+        self._finish()
+
+    def _substeps(self):
+        '''(steps, dt) of this frame: one variable step, or what the fixed clock
+        released (the clock runs on scaled game time, so every step is 1 / rate)'''
+        if self._tick is None:
+            return 1, self._step_in[0]
+        return self._tick[0], self._tick[1]
+
+    def _begin(self, steps):
+        '''Start of the frame's steps (the manager steps BATCH emitters together
+        and calls _begin / _emit / _finish per emitter around batch steps)'''
+        self._born  = []
+        self._dead  = []
+        self._steps = steps
+        if steps:
+            self._step_to_end()
+            self._emitter_last = self._step_in[3:5]
+        if steps > 1:
+            self._was   = self.sim.active.copy()
+            self._start = self.sim.pos.copy()
+
+    def _step_to_end(self):
+        '''Fixed timestep: the frame's last step ended alpha steps before the
+        frame: move the emitter transform of _step_in back to that moment, on
+        the way from last frame's transform to this one. Step ends are then
+        1 / rate apart along the emitter's path whatever the frame rate.'''
+        last, now = self._emitter_frames
+        if self._tick is None or last is None or self._tick[2] <= 0.0:
+            return
+        lag = self._tick[2] * self._tick[1]
+        t   = max(1.0 - lag / self._step_in[0], 0.0) if self._step_in[0] > 0.0 else 1.0
+        pos = last[0] + (now[0] - last[0]) * t
+        ori = rotations_toward(last[1], now[1], np.array((t,)))[0]
+        self._step_in = self._step_in[:3] + (pos, ori) + self._step_in[5:]
+
+    def _emit(self, dt):
+        '''Emission of one step'''
+        sim = self.sim
+        _, emit, self._no_coll, emitter_pos, emitter_ori, emitter_prev = self._step_in
+        if emit is not None:
+            count = sim.emission_count(dt, *emit)
+            if count:
+                k = len(self._dead)   # Steps taken so far this frame
+                self._born.append(sim.emit(count, *emitter_at_step(
+                    emitter_pos, emitter_ori, emitter_prev, k, self._steps)))
+
+    def _finish(self):
+        '''After the steps: collect what apply() writes'''
+        sim  = self.sim
+        live = sim.live
+        born = np.concatenate(self._born) if self._born else None
+        if len(self._dead) > 1:
+            # Several steps: show / hide the net change since the frame began
+            # (a slot may have died and been reborn in between)
+            now  = sim.active
+            dead = np.flatnonzero(self._was & ~now)
+            if born is not None:
+                born = np.unique(born[now[born]])
+        else:
+            dead = self._dead[0] if self._dead else np.zeros(0, dtype=np.intp)
+        if self._tick is not None and self._dead:
+            self._from[live] = sim.prev_pos[live]
+            if len(self._dead) > 1:
+                # Collision rays span the whole frame for particles that lived through it
+                keep = live[self._was[live]]
+                if born is not None:
+                    keep = np.setdiff1d(keep, born, assume_unique=True)
+                sim.prev_pos[keep] = self._start[keep]
+        self._moved    = bool(self._dead)
+        col = sim.colors(live) if sim.writes_color else None
+        if col is not None and sim.shader_color:
+            col = self._shade(col, self._shader_shift())
+        self._step_out = (born, dead, live, sim.sizes(live), col,
+                          sim.rot[live] if (sim.has_torque or sim.rot_has_value) else None)
+
+    def _shader_shift(self):
+        '''Shader color mode: the shader clock in this emitter's scaled seconds,
+        less the time a fixed step has not simulated yet'''
+        shift = self._shader_time * self.props['time_scale']
+        if self._tick is not None:
+            shift -= self._tick[2] * self._tick[1]
+        return shift
+
+    def _shade(self, col, shift):
+        '''Shader color mode: turn the core's (age / life, seed, cell, 1 / life)
+        into the constants the material reads, age / life = R + ps_time * A.
+        They hold for the particle's whole life, so the write-back epsilon lets
+        its color through once (again only if the emitter's time scale changes).'''
+        col[:, 0] -= shift * col[:, 3]
+        col[:, 3] *= self.props['time_scale']
+        return col
+
+    def apply(self):
+        '''Push the simulated frame to the game objects: show / hide, collision
+        rays, write-back. Logic thread only.'''
+        sim = self.sim
+        born, dead, live, size, col, rot = self._step_out
+        self._step_out = None
+        if born is not None:
+            self._spawn(born)
+        self._hide(dead)
+        if self._enable_collision and not self._no_coll and self._moved and len(live):
+            self._collide()   # Moves hit particles only — size / color are unaffected
+        if len(live):
+            pos = sim.pos[live]
+            if self._tick is not None:
+                # Fixed timestep: draw between the last two steps
+                frm = self._from[live]
+                pos = frm + (pos - frm) * self._tick[2]
+            self._write_back(live, pos, size, col, rot)
+
+    def update(self, dt):
+        if self.prepare(dt):
+            self.simulate()
+            self.apply()
+
+
+class FixedClock:
+    '''Fixed-timestep accumulator shared by every emitter with the same rate,
+    step cap and time scale, so BATCH members always step together'''
+    def __init__(self, rate, max_steps):
+        self.dt        = 1.0 / rate
+        self.max_steps = max_steps
+        self.acc       = 0.0
+
+    def advance(self, dt):
+        '''Add a frame of real time: returns (steps, step dt, alpha), alpha being
+        how far the frame lies between the last two steps'''
+        self.acc += dt
+        steps = int(self.acc / self.dt)
+        if steps > self.max_steps:
+            steps    = self.max_steps
+            self.acc = 0.0          # Drop the backlog instead of spiralling
+        else:
+            self.acc -= steps * self.dt
+        return steps, self.dt, self.acc / self.dt
 
-            # Apply acceleration (gravity + optional force) — pre-built above
-            p.velocity += acc
-
-            if is_force:
-                p.velocity *= damping_fac
-
-            # Capture position BEFORE integration so the ray spans exactly
-            # the segment the particle travels this frame (fixes one-frame-late
-            # detection and the tunneling it caused at high velocities).
-            prev_pos = p.position.copy()
-
-            # Position integration
-            p.position += p.velocity * dt
-
-            # Collision — ray from pre-integration pos to post-integration pos.
-            # rayCast(to, from, dist) — order matters.
-            if enable_collision and p.obj:
-                distance = p.velocity.length * dt
-                if distance > 0:
-                    hit_obj, hit_pos, hit_normal = p.obj.rayCast(
-                        p.position,  # to   — where the particle arrived
-                        prev_pos,    # from — where the particle was
-                        distance     # max ray length (one frame of travel)
-                    )
-                    if hit_obj:
-                        dot = p.velocity.dot(hit_normal)
-                        p.velocity -= 2.0 * dot * hit_normal
-                        p.velocity *= bounce
-                        # Push off surface to prevent sinking
-                        p.position = hit_pos + hit_normal * 0.02
-
-            # Write to game object
-            obj = p.obj
-            if obj:
-                obj.worldPosition = p.position
-                life_ratio = p.age / p.lifetime
-                s = size_start + size_delta * life_ratio
-                p.size = s
-                obj.worldScale = [s, s, s]
-
-                # Color & alpha — only write obj.color if at least one feature is on,
-                # avoiding an unnecessary per-particle dict write when both are disabled.
-                if enable_color or enable_alpha:
-                    if enable_color:
-                        t = (life_ratio - color_t_start) / (color_t_end - color_t_start)
-                        t = max(0.0, min(1.0, t))
-                        cr = color_start[0] + (color_end[0] - color_start[0]) * t
-                        cg = color_start[1] + (color_end[1] - color_start[1]) * t
-                        cb = color_start[2] + (color_end[2] - color_start[2]) * t
-                    else:
-                        cr = cg = cb = 1.0
-
-                    if enable_alpha:
-                        alpha = start_alpha * ((1.0 - life_ratio) ** (1.0 / start_alpha))
-                    else:
-                        alpha = 1.0
-
-                    obj.color = [cr, cg, cb, alpha]
-
-                # Billboard: face the active camera every frame
-                if is_billboard:
-                    if bb_cam:
-                        cam_pos = bb_cam.worldPosition
-                        to_cam  = (cam_pos - p.position).normalized()
-                        # Gimbal-lock guard: if to_cam is nearly parallel to Z,
-                        # fall back to Y as the reference axis
-                        world_z = Vector((0.0, 0.0, 1.0))
-                        ref     = Vector((0.0, 1.0, 0.0)) if abs(to_cam.dot(world_z)) > 0.999 else world_z
-                        right   = ref.cross(to_cam).normalized()
-                        up      = to_cam.cross(right).normalized()
-                        # UPBGE worldOrientation expects column-major:
-                        # col0=right(X), col1=to_cam(Y/normal), col2=up(Z)
-                        rot_mat = Matrix((
-                            (right.x, to_cam.x, up.x),
-                            (right.y, to_cam.y, up.y),
-                            (right.z, to_cam.z, up.z),
-                        ))
-                        obj.worldOrientation = rot_mat
-
-                # Rotation — only for MESH type, and only when there is actual rotation.
-                # worldOrientation triggers an internal matrix decomposition in UPBGE
-                # so skipping it when unused saves meaningful cost per particle per frame.
-                elif is_force and has_torque:
-                    av = p.angular_velocity
-                    av += torque_rad
-                    av *= damping_fac
-                    p.rotation += av * dt
-                    obj.worldOrientation = [p.rotation.x, p.rotation.y, p.rotation.z]
-                elif rot_has_value:
-                    speed = rot_rad / p.lifetime
-                    p.rotation += speed * dt
-                    obj.worldOrientation = [p.rotation.x, p.rotation.y, p.rotation.z]
+
+class FixedClocks:
+    '''The manager's FixedClocks, one per (rate, max steps, emitter time scale).
+    Each advances once per frame, on first use, by the frame's unclamped time
+    times that scale: scaling changes how many steps run, never their length.'''
+    def __init__(self):
+        self.clocks  = {}   # Key -> FixedClock
+        self.ticks   = {}   # Key -> this frame's (steps, step dt, alpha)
+        self.real_dt = 0.0
+
+    def begin(self, real_dt):
+        self.ticks   = {}
+        self.real_dt = real_dt
+
+    def tick(self, props, prev_key):
+        '''(key, (steps, step dt, alpha)) of an emitter with props this frame,
+        (None, None) without a fixed step. prev_key is its key of the last
+        frame: a new rate or scale keeps the time that clock already owed.'''
+        if not props['fixed_step']:
+            return None, None
+        key = (max(props['fixed_step_rate'], 1.0), max(props['max_substeps'], 1), props['time_scale'])
+        if key not in self.ticks:
+            fixed = self.clocks.get(key)
+            if fixed is None:
+                fixed = self.clocks[key] = FixedClock(*key[:2])
+                prev = self.clocks.get(prev_key)
+                if prev is not None and prev_key not in self.ticks:
+                    fixed.acc = prev.acc
+            self.ticks[key] = fixed.advance(self.real_dt * key[2])
+        return key, self.ticks[key]
+
+    def end(self):
+        '''Drop the clocks no emitter used this frame (e.g. a ramped time scale)'''
+        for key in [key for key in self.clocks if key not in self.ticks]:
+            del self.clocks[key]
+
+
+class WorkerPipe:
+    '''Command pipe of one worker process, shared by all its emitters. Replies
+    carry the emitter key; recv(key) parks other emitters' replies until they
+    ask for them, so emitters can attach and detach in any order.'''
+    def __init__(self, conn):
+        self.conn    = conn
+        self.send    = conn.send
+        self._parked = {}
+
+    def recv(self, key):
+        parked = self._parked.get(key)
+        if parked:
+            return parked.pop(0)
+        while True:
+            k, reply = self.conn.recv()
+            if k == key:
+                return reply
+            self._parked.setdefault(k, []).append(reply)
+
+
+class SimWorkers:
+    '''Spawned processes hosting the ParticleSim of PROCESS-mode emitters.
+    Each runs SIM_WORKER_SOURCE with its end of a Pipe; emitters are handed
+    out round-robin and keep their worker until they leave PROCESS mode.'''
+    def __init__(self, count):
+        ctx = multiprocessing.get_context('spawn')
+        self.conns = []
+        self.procs = []
+        for _ in range(count):
+            conn, child = ctx.Pipe()
+            proc = ctx.Process(target=exec, name='ps_sim_worker', daemon=True,
+                               args=(SIM_WORKER_SOURCE, {'__name__': 'ps_sim_worker', 'conn': child,
+                                                         'SIM_CORE_SOURCE': SIM_CORE_SOURCE}))
+            proc.start()
+            child.close()
+            self.conns.append(WorkerPipe(conn))
+            self.procs.append(proc)
+        self._next = 0
+
+    def assign(self):
+        conn = self.conns[self._next % len(self.conns)]
+        self._next += 1
+        return conn
+
+    def shutdown(self):
+        for conn in self.conns:
+            conn.send(('quit', None))
+        for proc in self.procs:
+            proc.join(1.0)
 
 
 class ParticleManager:
     def __init__(self):
         self.systems = {}
         self.last_time = 0.0
+        self.pool = None      # ThreadPoolExecutor, created for the first THREAD emitters
+        self.workers = None   # SimWorkers, created for the first PROCESS emitter
+        self.batches = {}     # (ParticleBatch.key(), clock key, time scale) -> ParticleBatch of BATCH emitters
+        self.clocks  = FixedClocks()
+        self.time_scale = 1.0 # Game-wide multiplier on every emitter's time; 0 pauses them all
+        self.fields  = []     # Force field objects ('ps_field' game property), shared by every emitter
+        self.frame   = 0      # Updates run so far; spatial query indexes are rebuilt once per frame
+        self.shader_time = 0.0 # Scaled game seconds; Shader color mode materials age particles from it
         print("="*60)
         print("PARTICLE SYSTEM v0.7.1 - OBJECT POOLING")
         print("="*60)
+        print(f"✓ Kernels: {use_kernels(source=SIM_CORE_SOURCE)}")
     
     def scan(self):
         scene = logic.getCurrentScene()
         for obj in scene.objects:
+            if 'ps_field' in obj:
+                self.add_field(obj)
             if 'ps_enabled' in obj:
                 if obj.name not in self.systems:
                     self.systems[obj.name] = ParticleSystem(obj)
             elif obj.name in self.systems:
                 # POOLING: Clean up pool on removal
                 system = self.systems[obj.name]
-                for p in system.particle_pool:
-                    if p.obj:
-                        p.obj.endObject()
+                if system._worker is not None:
+                    system.detach_worker()
+                self._rebatch(system, None)
+                for particle_obj in system.particle_pool:
+                    particle_obj.endObject()
                 del self.systems[obj.name]
     
+    def add_field(self, obj):
+        '''Register a force field object (e.g. one added with addObject after
+        the scene started). Its ps_field game property picks the kind
+        (ATTRACT / VORTEX / WIND, anything else switches it off);
+        ps_field_strength, ps_field_radius and ps_field_falloff shape it.
+        Ended objects drop out on their own.'''
+        if not any(f is obj for f in self.fields):
+            self.fields.append(obj)
+
+    def remove_field(self, obj):
+        self.fields = [f for f in self.fields if f is not obj]
+
+    def _field_frame(self):
+        '''ForceFields snapshot of this frame, read once for every emitter
+        (None when no field is active)'''
+        self.fields = [f for f in self.fields if not f.invalid]
+        snap = []
+        for obj in self.fields:
+            kind = obj.get('ps_field', '')
+            if kind not in FIELD_KINDS:
+                continue
+            ori = obj.worldOrientation
+            snap.append((kind, list(obj.worldPosition), [ori[0][2], ori[1][2], ori[2][2]],
+                         obj.get('ps_field_strength', 1.0), obj.get('ps_field_radius', 0.0),
+                         obj.get('ps_field_falloff', 'SMOOTH')))
+        return ForceFields(snap) if snap else None
+
     def update(self):
         cur = logic.getClockTime()
-        dt = cur - self.last_time if self.last_time > 0 else 0.016
+        real_dt = cur - self.last_time if self.last_time > 0 else 0.016
         self.last_time = cur
-        dt = min(dt, 0.1)
-        
+        self.frame += 1
+
+        # Global time scale (bullet time, pause menus). Paused, the frame costs
+        # nothing — the particles stay where they were last written.
+        scale = self.time_scale
+        if scale <= 0.0:
+            return
+        dt      = min(real_dt, 0.1) * scale
+        real_dt = real_dt * scale
+        self.shader_time += dt
+        self.clocks.begin(real_dt)
+
+        fields = self._field_frame()
+
+        parallel, remote, batched = [], [], {}
         for sys in self.systems.values():
-            sys.update(dt)
+            sys._fields      = fields
+            sys._shader_time = self.shader_time
+            ready = sys.prepare(dt)
+            props = sys.props
+            mode  = props['update_mode']
+            clock, sys._tick = self.clocks.tick(props, sys._clock_key)
+            sys._clock_key = clock
+            if (mode == 'PROCESS') != (sys._worker is not None):
+                if sys._worker is None:
+                    sys.attach_worker(self._worker_conn())
+                else:
+                    sys.detach_worker()
+            key = (ParticleBatch.key(sys.sim), clock, props['time_scale']) if (ready and mode == 'BATCH') else None
+            if key != sys._batch_key:
+                self._rebatch(sys, key)
+            if not ready:
+                continue
+            if mode == 'PROCESS':
+                remote.append(sys)
+            elif mode == 'THREAD':
+                parallel.append(sys)
+            elif mode == 'BATCH':
+                batched[id(sys.sim)] = sys
+            else:
+                sys.simulate()
+                sys.apply()
+
+        self.clocks.end()
+
+        # Shader color mode: one clock write per material instead of a color
+        # write per particle and frame
+        nodes = {sys._time_node.as_pointer(): sys._time_node for sys in self.systems.values()
+                 if sys._time_node is not None and sys.sim.shader_color}
+        for node in nodes.values():
+            node.outputs[0].default_value = self.shader_time
+
+        # One age / integrate pass per batch step; emission and write-back stay per emitter
+        for batch in self.batches.values():
+            members   = [batched[id(sim)] for sim in batch.members]
+            steps, sdt = members[0]._substeps()   # Members share dt / clock / scale (batch key)
+            for sys in members:
+                sys._begin(steps)
+            oris      = [sys._step_in[4] for sys in members]
+            for _ in range(steps):
+                for sys in members:
+                    sys._emit(sdt)
+                for sys, d in zip(members, batch.step(sdt, oris, fields)):
+                    sys._dead.append(d)
+            for sys in members:
+                sys._finish()
+                sys.apply()
+
+        # Worker processes first, so they integrate while the threads below run
+        for sys in remote:
+            sys.exchange()
+
+        # Numeric phase on the pool (NumPy releases the GIL inside its kernels),
+        # then the KX writes back here on the logic thread
+        if len(parallel) > 1:
+            if self.pool is None:
+                n = os.cpu_count() or 2
+                self.pool = ThreadPoolExecutor(max_workers=n, thread_name_prefix='ps_update')
+                print(f"✓ Parallel update: {n} threads")
+            for f in [self.pool.submit(sys.simulate) for sys in parallel]:
+                f.result()
+        elif parallel:
+            parallel[0].simulate()
+        for sys in parallel:
+            sys.apply()
+
+    # ------------------------------------------------------------------
+    # Spatial queries — for gameplay scripts (damage from embers, pickups...)
+    # ------------------------------------------------------------------
+    # Results are slot arrays per emitter name: a slot indexes the emitter's
+    # particle_pool and its sim arrays (e.g. systems[name].sim.pos[slots]).
+    # emitters limits a query to one emitter (name or object) or a list of
+    # them; None covers every emitter.
+
+    def _query_systems(self, emitters):
+        if emitters is None:
+            return list(self.systems.items())
+        if isinstance(emitters, str) or not isinstance(emitters, (list, tuple, set)):
+            emitters = [emitters]
+        names = [e if isinstance(e, str) else e.name for e in emitters]
+        return [(name, self.systems[name]) for name in names if name in self.systems]
+
+    def particles_in_radius(self, point, radius, emitters=None):
+        '''Live particles within radius of point: {emitter name: slots}'''
+        point = np.asarray(point, dtype=float).reshape(1, 3)
+        found = {}
+        for name, sys in self._query_systems(emitters):
+            index, slots = sys.spatial_index(self.frame)
+            if index is None:
+                continue
+            _, j, _ = index.query(point, radius)
+            if len(j):
+                found[name] = np.sort(slots[j])
+        return found
+
+    def particles_in_box(self, lo, hi, emitters=None):
+        '''Live particles inside the world-aligned box lo..hi: {emitter name: slots}'''
+        lo = np.asarray(lo, dtype=float)
+        hi = np.asarray(hi, dtype=float)
+        center = ((lo + hi) * 0.5).reshape(1, 3)
+        reach  = float(np.linalg.norm(hi - lo)) * 0.5 + 1e-9   # Sphere around the box
+        found = {}
+        for name, sys in self._query_systems(emitters):
+            index, slots = sys.spatial_index(self.frame)
+            if index is None:
+                continue
+            _, j, _ = index.query(center, reach)
+            pos = index.pos[j]
+            j   = j[((pos >= lo) & (pos <= hi)).all(axis=1)]
+            if len(j):
+                found[name] = np.sort(slots[j])
+        return found
+
+    def nearest_particle(self, point, emitters=None, max_distance=np.inf):
+        '''(emitter name, slot, distance) of the live particle nearest to
+        point, or None when there is none within max_distance'''
+        best = None
+        for name, sys in self._query_systems(emitters):
+            index, slots = sys.spatial_index(self.frame)
+            if index is None:
+                continue
+            hit = index.nearest(point, max_distance)
+            if hit is not None and (best is None or hit[1] < best[2]):
+                best = (name, int(slots[hit[0]]), hit[1])
+                max_distance = hit[1]   # Other emitters only need to beat it
+        return best
+
+    def _rebatch(self, sys, key):
+        '''Move sys from its current batch (if any) into the batch for key'''
+        if sys._batch_key is not None:
+            batch = self.batches[sys._batch_key]
+            batch.remove(sys.sim)
+            if not batch.members:
+                del self.batches[sys._batch_key]
+        if key is not None:
+            self.batches.setdefault(key, ParticleBatch()).add(sys.sim)
+        sys._batch_key = key
+
+    def _worker_conn(self):
+        if self.workers is None:
+            n = max(1, (os.cpu_count() or 2) - 1)
+            self.workers = SimWorkers(n)
+            print(f"✓ Worker processes: {n}")
+        return self.workers.assign()
+
+    def shutdown(self):
+        '''Release the worker processes, their shared memory and the thread pool'''
+        for sys in self.systems.values():
+            if sys._worker is not None:
+                sys.detach_worker()
+        if self.workers is not None:
+            self.workers.shutdown()
+            self.workers = None
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
 
 def init():
     if not hasattr(logic, '_pm'):
         logic._pm = ParticleManager()
-        logic.getCurrentScene().pre_draw.append(lambda c: logic._pm.update())
+        scene = logic.getCurrentScene()
+        scene.pre_draw.append(lambda c: logic._pm.update())
+        scene.onRemove.append(lambda s: logic._pm.shutdown())
         logic._pm.scan()
 
 init()
 """
         
+        script_text = script_text.replace("#@SIM_CORE@", SIM_CORE_SOURCE)
+        script_text = script_text.replace("'#@SIM_CORE_SOURCE@'", repr(SIM_CORE_SOURCE))
+        script_text = script_text.replace("'#@SIM_WORKER_SOURCE@'", repr(SIM_CORE_SOURCE + SIM_WORKER_SOURCE))
+
         # Script - write only if controller has no script or the text block was deleted
         import time
         script_needs_write = (
@@ -2164,11 +5403,19 @@ init()
         ensure_prop('ps_emission_mode', 'STRING', props.emission_mode)
         ensure_prop('ps_emission_shape', 'STRING', props.emission_shape)
         ensure_prop('ps_emission_sphere_radius', 'FLOAT', props.emission_sphere_radius)
+        ensure_prop('ps_vertex_group', 'STRING', props.emission_vertex_group)
+        ensure_prop('ps_normal_velocity', 'FLOAT', props.normal_velocity)
+        ensure_prop('ps_emission_shell', 'BOOL', props.emission_shell)
+        ensure_prop('ps_emission_inner', 'FLOAT', props.emission_inner_radius)
+        ensure_prop('ps_cone_angle', 'FLOAT', props.emission_cone_angle)
+        ensure_prop('ps_edge_length', 'FLOAT', props.emission_edge_length)
         ensure_prop('ps_max_particles', 'INT', props.max_particles)
         ensure_prop('ps_emission_rate', 'FLOAT', props.emission_rate)
         ensure_prop('ps_emission_delay', 'FLOAT', props.emission_delay)
         ensure_prop('ps_burst_count', 'INT', props.burst_count)
         ensure_prop('ps_is_one_shot', 'BOOL', props.is_one_shot)
+        ensure_prop('ps_prewarm', 'BOOL', props.prewarm)
+        ensure_prop('ps_subframe', 'BOOL', props.subframe_emission)
         ensure_prop('ps_lifetime', 'FLOAT', props.lifetime)
         ensure_prop('ps_lifetime_random', 'FLOAT', props.lifetime_random)
         ensure_prop('ps_start_size', 'FLOAT', props.start_size)
@@ -2192,6 +5439,11 @@ init()
         # Collision properties
         ensure_prop('ps_enable_collision', 'BOOL', props.enable_collision)
         ensure_prop('ps_bounce_strength', 'FLOAT', props.bounce_strength)
+        ensure_prop('ps_interaction', 'BOOL', props.enable_interaction)
+        ensure_prop('ps_interact_radius', 'FLOAT', props.interaction_radius)
+        ensure_prop('ps_repulsion', 'FLOAT', props.repulsion)
+        ensure_prop('ps_cohesion', 'FLOAT', props.cohesion)
+        ensure_prop('ps_contact_damping', 'FLOAT', props.contact_damping)
         
         # Movement type
         ensure_prop('ps_movement_type', 'STRING', props.movement_type)
@@ -2232,6 +5484,18 @@ init()
         # Alpha over lifetime
         ensure_prop('ps_enable_alpha', 'BOOL',  props.enable_alpha)
         ensure_prop('ps_start_alpha', 'FLOAT', props.start_alpha)
+        ensure_prop('ps_color_mode',  'STRING', props.color_mode)
+        ensure_prop('ps_tint_random', 'FLOAT', props.tint_random)
+
+        # Texture atlas
+        ensure_prop('ps_atlas_cells',  'INT', props.atlas_columns * props.atlas_rows if props.use_atlas else 0)
+        ensure_prop('ps_atlas_index',  'INT', props.atlas_index)
+        ensure_prop('ps_atlas_random', 'INT', props.atlas_random_cells)
+
+        # Billboard orientation
+        ensure_prop('ps_billboard_mode',      'STRING', props.billboard_mode)
+        ensure_prop('ps_billboard_axis',      'STRING', props.billboard_axis)
+        ensure_prop('ps_billboard_threshold', 'FLOAT',  props.billboard_angle_threshold)
 
         # LOD
         ensure_prop('ps_enable_lod',      'BOOL',  props.enable_lod)
@@ -2258,7 +5522,25 @@ init()
         ensure_prop('ps_lod3_no_emit',    'BOOL',  props.lod3_disable_emitting)
         ensure_prop('ps_lod3_destroy',    'BOOL',  props.lod3_destroy_particles)
 
-        # create per-emitter template and store its name
+        # Write-back epsilons
+        ensure_prop('ps_write_eps_pos',   'FLOAT', props.write_epsilon_position)
+        ensure_prop('ps_write_eps_scale', 'FLOAT', props.write_epsilon_scale)
+        ensure_prop('ps_write_eps_color', 'FLOAT', props.write_epsilon_color)
+        ensure_prop('ps_update_mode', 'STRING', props.update_mode)
+        ensure_prop('ps_fixed_step',   'BOOL',  props.fixed_step)
+        ensure_prop('ps_fixed_rate',   'FLOAT', props.fixed_step_rate)
+        ensure_prop('ps_max_substeps', 'INT',   props.max_substeps)
+        ensure_prop('ps_time_scale',   'FLOAT', props.time_scale)
+        ensure_prop('ps_field_weight', 'FLOAT', props.field_weight)
+        ensure_prop('ps_turbulence',   'FLOAT', props.turbulence_strength)
+        ensure_prop('ps_turb_scale',   'FLOAT', props.turbulence_scale)
+        ensure_prop('ps_turb_speed',   'FLOAT', props.turbulence_speed)
+
+        # Baked playback cache
+        ensure_prop('ps_cache_file', 'STRING', props.cache_file if props.use_cache else '')
+        ensure_prop('ps_cache_loop', 'BOOL',   props.cache_loop)
+
+        # create (or reuse) the shared template and store its name
         if props.particle_type == 'BILLBOARD':
             bb_name = self._ensure_billboard_template(context, init_obj)
             # Store the unique template name so the runtime knows which plane to use
@@ -2285,12 +5567,57 @@ init()
 class PARTICLE_OT_apply_material(bpy.types.Operator):
     """Build or rebuild the particle material based on current settings.
     Works for both Billboard (applies to the PS_BP_ plane) and Mesh (applies to the particle mesh).
-    Always rebuilds from scratch so there are no leftover nodes from previous configurations."""
+    Materials are shared by content key; the button rebuilds the shared one from scratch
+    so there are no leftover nodes from previous configurations."""
     bl_idname = "particle.apply_material"
     bl_label  = "Apply Material"
 
     @staticmethod
-    def _build_nodes(mat, ps):
+    def _material_key(ps):
+        """Short hash of every setting that changes the generated node tree.
+        CPU-mode colors are written per object at runtime, so they are not part of it."""
+        import hashlib
+        use_tex = ps.enable_texture
+        parts = [
+            'BLEND',
+            use_tex,
+            ps.billboard_texture.name if (use_tex and ps.billboard_texture) else '',
+            ps.enable_color,
+            ps.enable_alpha,
+            ps.color_mode,
+            (ps.atlas_columns, ps.atlas_rows) if (use_tex and ps.use_atlas) else None,
+        ]
+        if ps.color_mode == 'SHADER':
+            # Shader mode bakes the ramp / alpha curve / tint into the nodes
+            parts.append('ps_time')   # Age from the runtime clock (age = R + ps_time * A)
+            if ps.enable_color:
+                parts += [tuple(round(c, 4) for c in ps.color_start),
+                          tuple(round(c, 4) for c in ps.color_end),
+                          round(ps.color_start_time, 4), round(ps.color_end_time, 4)]
+            if ps.enable_alpha:
+                parts.append(round(ps.start_alpha, 4))
+            if ps.tint_random > 0.0:
+                parts += [tuple(round(c, 4) for c in ps.tint_color), round(ps.tint_random, 4)]
+        return hashlib.md5(repr(parts).encode()).hexdigest()[:8]
+
+    @staticmethod
+    def _ensure_material(ps, rebuild=False, preview=False):
+        """Return the shared material for ps, building its nodes only when it is new
+        (or when rebuild is requested). preview=True returns the point-cloud variant,
+        which reads the per-particle color from the instancer instead of the object."""
+        key = PARTICLE_OT_apply_material._material_key(ps)
+        mat_name = f"PS_MatPreview_{key}" if preview else f"PS_Mat_{key}"
+        mat = bpy.data.materials.get(mat_name)
+        if mat is None:
+            mat = bpy.data.materials.new(name=mat_name)
+            rebuild = True
+        if rebuild or mat.get('ps_mat_key') != key:
+            PARTICLE_OT_apply_material._build_nodes(mat, ps, preview=preview)
+            mat['ps_mat_key'] = key
+        return mat
+
+    @staticmethod
+    def _build_nodes(mat, ps, preview=False):
         """Clear and rebuild the node tree based on ps settings."""
         mat.use_nodes = True
         mat.blend_method = 'BLEND'
@@ -2298,9 +5625,11 @@ class PARTICLE_OT_apply_material(bpy.types.Operator):
         links = mat.node_tree.links
         nodes.clear()
 
-        use_tex   = ps.enable_texture
-        use_color = ps.enable_color
-        use_alpha = ps.enable_alpha
+        use_tex    = ps.enable_texture
+        use_color  = ps.enable_color
+        use_alpha  = ps.enable_alpha
+        use_shader = (ps.color_mode == 'SHADER')
+        use_tint   = use_shader and ps.tint_random > 0.0
 
         # Always need BSDF + Output
         out  = nodes.new('ShaderNodeOutputMaterial'); out.location  = (600, 0)
@@ -2309,45 +5638,170 @@ class PARTICLE_OT_apply_material(bpy.types.Operator):
 
         # Object Info — needed for color and/or alpha
         obj_inf = None
-        if use_color or use_alpha or use_tex:
-            obj_inf = nodes.new('ShaderNodeObjectInfo'); obj_inf.location = (-250, -150)
+        if use_color or use_alpha or use_tex or use_tint:
+            if preview:
+                # Point-cloud preview: same Color / Alpha outputs, read per instance
+                obj_inf = nodes.new('ShaderNodeAttribute'); obj_inf.location = (-250, -150)
+                obj_inf.attribute_type = 'INSTANCER'
+                obj_inf.attribute_name = 'ps_color'
+            else:
+                obj_inf = nodes.new('ShaderNodeObjectInfo'); obj_inf.location = (-250, -150)
+
+        # Sockets that carry the per-particle color / alpha (None = not driven)
+        col_out = None
+        alpha_out = None
+
+        if use_shader and obj_inf:
+            # Shader-side lifetime: the runtime writes (age offset, seed, cell, age
+            # rate) into the object color once per particle and drives ps_time
+            # every frame; age = offset + ps_time * rate (ps_time stays 0 in the editor)
+            sep = nodes.new('ShaderNodeSeparateColor'); sep.location = (-900, -350)
+            links.new(obj_inf.outputs['Color'], sep.inputs['Color'])
+            clock = nodes.new('ShaderNodeValue'); clock.location = (-900, -550)
+            clock.name = clock.label = 'ps_time'
+            clock.outputs[0].default_value = 0.0
+            age = nodes.new('ShaderNodeMath'); age.location = (-700, -450)
+            age.operation = 'MULTIPLY_ADD'
+            links.new(clock.outputs['Value'], age.inputs[0])
+            links.new(obj_inf.outputs['Alpha'], age.inputs[1])
+            links.new(sep.outputs['Red'],      age.inputs[2])
+            age_out  = age.outputs['Value']
+            seed_out = sep.outputs['Green']
+
+            if use_color:
+                # Ramp stops placed at the From/To ratios — linear, clamped outside
+                ramp = nodes.new('ShaderNodeValToRGB'); ramp.location = (-450, -300)
+                t0 = ps.color_start_time / 10.0
+                t1 = max(ps.color_end_time / 10.0, t0 + 0.0001)
+                ramp.color_ramp.interpolation = 'LINEAR'
+                ramp.color_ramp.elements[0].position = min(t0, 1.0)
+                ramp.color_ramp.elements[0].color = (*ps.color_start, 1.0)
+                ramp.color_ramp.elements[1].position = min(t1, 1.0)
+                ramp.color_ramp.elements[1].color = (*ps.color_end, 1.0)
+                links.new(age_out, ramp.inputs['Fac'])
+                col_out = ramp.outputs['Color']
+
+            if use_tint:
+                # Mix towards the tint by seed × tint_random
+                tint_fac = nodes.new('ShaderNodeMath'); tint_fac.location = (-450, -550)
+                tint_fac.operation = 'MULTIPLY'
+                tint_fac.inputs[1].default_value = ps.tint_random
+                links.new(seed_out, tint_fac.inputs[0])
+                mix_tint = nodes.new('ShaderNodeMixRGB'); mix_tint.location = (-200, -400)
+                mix_tint.blend_type = 'MIX'
+                links.new(tint_fac.outputs['Value'], mix_tint.inputs['Fac'])
+                if col_out:
+                    links.new(col_out, mix_tint.inputs['Color1'])
+                else:
+                    mix_tint.inputs['Color1'].default_value = (1.0, 1.0, 1.0, 1.0)
+                mix_tint.inputs['Color2'].default_value = (*ps.tint_color, 1.0)
+                col_out = mix_tint.outputs['Color']
+
+            if use_alpha:
+                # start_alpha * (1 - age) ^ (1 / start_alpha) — same curve as the CPU path
+                start_a = max(ps.start_alpha, 0.001)
+                inv_age = nodes.new('ShaderNodeMath'); inv_age.location = (-450, -750)
+                inv_age.operation = 'SUBTRACT'
+                inv_age.use_clamp = True
+                inv_age.inputs[0].default_value = 1.0
+                links.new(age_out, inv_age.inputs[1])
+                pow_a = nodes.new('ShaderNodeMath'); pow_a.location = (-250, -750)
+                pow_a.operation = 'POWER'
+                pow_a.inputs[1].default_value = 1.0 / start_a
+                links.new(inv_age.outputs['Value'], pow_a.inputs[0])
+                mul_a = nodes.new('ShaderNodeMath'); mul_a.location = (-50, -750)
+                mul_a.operation = 'MULTIPLY'
+                mul_a.inputs[1].default_value = ps.start_alpha
+                links.new(pow_a.outputs['Value'], mul_a.inputs[0])
+                alpha_out = mul_a.outputs['Value']
+
+        elif obj_inf:
+            # CPU mode: the runtime already wrote the final color / alpha
+            if use_color:
+                col_out = obj_inf.outputs['Color']
+            if use_alpha:
+                alpha_out = obj_inf.outputs['Alpha']
 
         if use_tex:
-            # Full texture chain: UV → Image Texture × Object Info → BSDF
+            # Full texture chain: UV → Image Texture × per-particle color → BSDF
             tex_co  = nodes.new('ShaderNodeTexCoord'); tex_co.location  = (-500, 150)
             img_tex = nodes.new('ShaderNodeTexImage'); img_tex.location = (-250, 150)
-            links.new(tex_co.outputs['UV'], img_tex.inputs['Vector'])
+
+            if ps.use_atlas and use_shader and obj_inf:
+                # Atlas: cell index comes from the B channel, (idx + 0.5) / cells.
+                # uv' = (uv + (col, rows - 1 - row)) / (cols, rows)
+                img_tex.extension = 'EXTEND'
+                cols  = ps.atlas_columns
+                rows  = ps.atlas_rows
+                sep_c = nodes.new('ShaderNodeSeparateColor'); sep_c.location = (-1500, 400)
+                links.new(obj_inf.outputs['Color'], sep_c.inputs['Color'])
+                idx = nodes.new('ShaderNodeMath'); idx.location = (-1300, 400)
+                idx.operation = 'MULTIPLY'
+                idx.inputs[1].default_value = cols * rows
+                links.new(sep_c.outputs['Blue'], idx.inputs[0])
+                idx_f = nodes.new('ShaderNodeMath'); idx_f.location = (-1100, 400)
+                idx_f.operation = 'FLOOR'
+                links.new(idx.outputs['Value'], idx_f.inputs[0])
+                col_i = nodes.new('ShaderNodeMath'); col_i.location = (-900, 500)
+                col_i.operation = 'MODULO'
+                col_i.inputs[1].default_value = cols
+                links.new(idx_f.outputs['Value'], col_i.inputs[0])
+                row_d = nodes.new('ShaderNodeMath'); row_d.location = (-900, 300)
+                row_d.operation = 'DIVIDE'
+                row_d.inputs[1].default_value = cols
+                links.new(idx_f.outputs['Value'], row_d.inputs[0])
+                row_i = nodes.new('ShaderNodeMath'); row_i.location = (-700, 300)
+                row_i.operation = 'FLOOR'
+                links.new(row_d.outputs['Value'], row_i.inputs[0])
+                row_flip = nodes.new('ShaderNodeMath'); row_flip.location = (-500, 300)
+                row_flip.operation = 'SUBTRACT'
+                row_flip.inputs[0].default_value = rows - 1
+                links.new(row_i.outputs['Value'], row_flip.inputs[1])
+                cell_xy = nodes.new('ShaderNodeCombineXYZ'); cell_xy.location = (-300, 400)
+                links.new(col_i.outputs['Value'],    cell_xy.inputs['X'])
+                links.new(row_flip.outputs['Value'], cell_xy.inputs['Y'])
+                uv_add = nodes.new('ShaderNodeVectorMath'); uv_add.location = (-100, 400)
+                uv_add.operation = 'ADD'
+                links.new(tex_co.outputs['UV'],     uv_add.inputs[0])
+                links.new(cell_xy.outputs['Vector'], uv_add.inputs[1])
+                uv_scale = nodes.new('ShaderNodeVectorMath'); uv_scale.location = (100, 400)
+                uv_scale.operation = 'MULTIPLY'
+                uv_scale.inputs[1].default_value = (1.0 / cols, 1.0 / rows, 1.0)
+                links.new(uv_add.outputs['Vector'], uv_scale.inputs[0])
+                links.new(uv_scale.outputs['Vector'], img_tex.inputs['Vector'])
+            else:
+                links.new(tex_co.outputs['UV'], img_tex.inputs['Vector'])
 
             if ps.billboard_texture:
                 img_tex.image = ps.billboard_texture
 
-            if use_color:
-                # Multiply texture color × object color
+            if col_out:
+                # Multiply texture color × particle color
                 mix_col = nodes.new('ShaderNodeMixRGB'); mix_col.location = (50, 150)
                 mix_col.blend_type = 'MULTIPLY'
                 mix_col.inputs['Fac'].default_value = 1.0
                 links.new(img_tex.outputs['Color'],  mix_col.inputs['Color1'])
-                links.new(obj_inf.outputs['Color'],  mix_col.inputs['Color2'])
+                links.new(col_out,                   mix_col.inputs['Color2'])
                 links.new(mix_col.outputs['Color'],  bsdf.inputs['Base Color'])
             else:
                 links.new(img_tex.outputs['Color'], bsdf.inputs['Base Color'])
 
-            if use_alpha:
-                # Multiply texture alpha × object alpha
+            if alpha_out:
+                # Multiply texture alpha × particle alpha
                 math_a = nodes.new('ShaderNodeMath'); math_a.location = (50, -50)
                 math_a.operation = 'MULTIPLY'
                 links.new(img_tex.outputs['Alpha'],   math_a.inputs[0])
-                links.new(obj_inf.outputs['Alpha'],   math_a.inputs[1])
+                links.new(alpha_out,                  math_a.inputs[1])
                 links.new(math_a.outputs['Value'],    bsdf.inputs['Alpha'])
             else:
                 links.new(img_tex.outputs['Alpha'], bsdf.inputs['Alpha'])
 
         else:
             # Color-only path — no texture nodes, no transparency artifacts
-            if use_color:
-                links.new(obj_inf.outputs['Color'], bsdf.inputs['Base Color'])
-            if use_alpha:
-                links.new(obj_inf.outputs['Alpha'], bsdf.inputs['Alpha'])
+            if col_out:
+                links.new(col_out, bsdf.inputs['Base Color'])
+            if alpha_out:
+                links.new(alpha_out, bsdf.inputs['Alpha'])
 
     def execute(self, context):
         obj = context.active_object
@@ -2358,46 +5812,194 @@ class PARTICLE_OT_apply_material(bpy.types.Operator):
         ps = obj.particle_system_props
 
         if ps.particle_type == 'BILLBOARD':
-            bb_name = f"PS_BP_{obj.name}"
-            target  = bpy.data.objects.get(bb_name)
-            if not target:
-                self.report({'ERROR'}, f"Billboard plane '{bb_name}' not found — run Initialize first")
+            bb_prop = obj.game.properties.get('ps_billboard_template')
+            if not bb_prop:
+                self.report({'ERROR'}, "Billboard plane not found — run Initialize first")
                 return {'CANCELLED'}
-            mat_name = f"PS_BillboardMat_{obj.name}"
+            # Settings may have changed the key: switch to (or create) the matching shared plane
+            bb_name = PARTICLE_OT_setup_logic._ensure_billboard_template(context, obj)
+            bb_prop.value = bb_name
+            target = bpy.data.objects[bb_name]
         else:
             target = ps.particle_mesh
             if not target:
                 self.report({'ERROR'}, "No particle mesh assigned")
                 return {'CANCELLED'}
-            mat_name = f"PS_Mat_{obj.name}"
 
-        # Get or create the material
-        mat = bpy.data.materials.get(mat_name)
-        if mat is None:
-            mat = bpy.data.materials.new(name=mat_name)
+        # Get the shared material — the button always rebuilds it from scratch
+        mat = self._ensure_material(ps, rebuild=True)
         if not target.data.materials:
             target.data.materials.append(mat)
         else:
             target.data.materials[0] = mat
 
-        self._build_nodes(mat, ps)
+        self.report({'INFO'}, f"Material '{mat.name}' applied to '{target.name}'")
+        return {'FINISHED'}
+
+
+class PARTICLE_OT_pack_atlas(bpy.types.Operator):
+    """Pack the billboard textures of the selected emitters into one grid atlas.
+    Every packed emitter switches to the atlas image, its own cell and Shader color
+    evaluation, so emitters with otherwise equal settings share one material"""
+    bl_idname = "particle.pack_atlas"
+    bl_label  = "Pack Texture Atlas"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    atlas_name: bpy.props.StringProperty(name="Atlas Name", default="PS_Atlas")
+
+    def execute(self, context):
+        import math
+
+        emitters = [o for o in context.selected_objects
+                    if hasattr(o, 'particle_system_props') and o.particle_system_props.enabled]
+        # Source texture: the original one if this emitter was already packed
+        sources = {}
+        for o in emitters:
+            ps  = o.particle_system_props
+            src = ps.atlas_source if (ps.use_atlas and ps.atlas_source) else ps.billboard_texture
+            if src and src.size[0] > 0 and src.size[1] > 0:
+                sources[o] = src
+        if not sources:
+            self.report({'ERROR'}, "No selected emitter has a billboard texture")
+            return {'CANCELLED'}
+
+        # One cell per distinct image, uniform grid sized to the largest texture
+        images = []
+        for src in sources.values():
+            if src not in images:
+                images.append(src)
+        cols   = math.ceil(math.sqrt(len(images)))
+        rows   = math.ceil(len(images) / cols)
+        cell_w = max(img.size[0] for img in images)
+        cell_h = max(img.size[1] for img in images)
+
+        atlas_px = np.zeros((rows * cell_h, cols * cell_w, 4), dtype=np.float32)
+        for i, img in enumerate(images):
+            tmp = img.copy()
+            if tuple(tmp.size) != (cell_w, cell_h):
+                tmp.scale(cell_w, cell_h)
+            buf = np.empty(cell_w * cell_h * 4, dtype=np.float32)
+            tmp.pixels.foreach_get(buf)
+            bpy.data.images.remove(tmp)
+            col, row = i % cols, i // cols
+            y0 = (rows - 1 - row) * cell_h   # Image rows start at the bottom
+            atlas_px[y0:y0 + cell_h, col * cell_w:(col + 1) * cell_w] = buf.reshape(cell_h, cell_w, 4)
+
+        atlas = bpy.data.images.get(self.atlas_name)
+        if atlas is not None and tuple(atlas.size) != (cols * cell_w, rows * cell_h):
+            bpy.data.images.remove(atlas)
+            atlas = None
+        if atlas is None:
+            atlas = bpy.data.images.new(self.atlas_name, cols * cell_w, rows * cell_h, alpha=True)
+        atlas.pixels.foreach_set(atlas_px.ravel())
+        atlas.update()
+        atlas.pack()
+
+        for o, src in sources.items():
+            ps = o.particle_system_props
+            ps.atlas_source      = src
+            ps.billboard_texture = atlas
+            ps.enable_texture    = True
+            ps.use_atlas         = True
+            ps.atlas_columns     = cols
+            ps.atlas_rows        = rows
+            ps.atlas_index       = images.index(src)
+            ps.color_mode        = 'SHADER'
+            # Property update callbacks only see context.object — sync game props directly
+            gp = o.game.properties
+            for name, value in (('ps_atlas_cells', cols * rows), ('ps_atlas_index', ps.atlas_index),
+                                ('ps_color_mode', 'SHADER')):
+                if name in gp:
+                    gp[name].value = value
+            if ps.particle_type == 'BILLBOARD' and 'ps_billboard_template' in gp:
+                gp['ps_billboard_template'].value = PARTICLE_OT_setup_logic._ensure_billboard_template(context, o)
+
+        self.report({'INFO'}, f"Packed {len(images)} texture(s) from {len(sources)} emitter(s) into '{atlas.name}' ({cols}x{rows})")
+        return {'FINISHED'}
+
+
+class PARTICLE_OT_bake_cache(bpy.types.Operator):
+    """Simulate this emitter offline and write the result to its cache file"""
+    bl_idname = "particle.bake_cache"
+    bl_label = "Bake Particle Cache"
+    bl_options = {'REGISTER'}
+
+    @classmethod
+    def poll(cls, context):
+        return context.object is not None and hasattr(context.object, 'particle_system_props')
+
+    def execute(self, context):
+        import os
+        obj = context.object
+        ps = obj.particle_system_props
+        if not ps.cache_file:
+            self.report({'ERROR'}, "Set a cache file first")
+            return {'CANCELLED'}
+        path = bpy.path.abspath(ps.cache_file)
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Same core, seed and collider snapshot as the preview; the emitter
+        # is baked where it stands now
+        props = settings_to_props(ps)
+        sim = sim_core.ParticleSim(ps.max_particles, seed=ps.preview_seed)
+        sim.configure(props)
+        sim.sampler = editor_sampler(obj, ps)
+        mat = obj.matrix_world
+        emitter_pos = np.array(mat.translation)
+        emitter_ori = np.array(mat.to_3x3().normalized())
+        collider = build_preview_collider(context) if ps.enable_collision else None
+        fields = editor_fields(context)
+        if ps.prewarm and ps.enabled:
+            sim.prewarm(emitter_pos, emitter_ori)
+
+        # Positions are stored relative to the emitter so the cache plays back
+        # wherever the emitter is in game (LOCAL sims turning with it too).
+        # Billboards are oriented live there, only mesh rotation is baked.
+        rotates = not sim.is_billboard and (sim.has_torque or sim.rot_has_value)
+        dt = 1.0 / ps.bake_fps
+        frames = []
+        for _ in range(max(1, round(ps.bake_duration * ps.bake_fps))):
+            advance_sim(sim, dt, emitter_pos, emitter_ori, collider, fields)
+            live = sim.live
+            pos, rot = sim_core.to_emitter_space(sim.pos[live], sim.rot[live] if rotates else None,
+                                                 emitter_pos, emitter_ori, sim.is_local)
+            col = sim.colors(live) if sim.writes_color else None
+            if col is not None and sim.shader_color:
+                col[:, 3] = 0.0   # Playback writes the age every frame: no rate
+            frames.append((live, pos, sim.sizes(live), rot, col))
+
+        flags = ((sim_core.CACHE_COLOR if sim.writes_color else 0)
+                 | (sim_core.CACHE_ROT if rotates else 0)
+                 | (sim_core.CACHE_LOCAL if sim.is_local else 0))
+        try:
+            sim_core.write_cache(path, frames, ps.bake_fps, sim.capacity, flags)
+        except OSError as e:
+            self.report({'ERROR'}, f"Could not write cache: {e}")
+            return {'CANCELLED'}
 
-        self.report({'INFO'}, f"Material '{mat_name}' applied to '{target.name}'")
+        size_kb = os.path.getsize(path) / 1024.0
+        self.report({'INFO'}, f"Baked {len(frames)} frames to '{ps.cache_file}' ({size_kb:.0f} KB)")
         return {'FINISHED'}
 
 
 classes = (
     ParticleSystemProperties,
+    ParticleFieldProperties,
     PARTICLE_PT_upbge_panel,
+    PARTICLE_PT_force_field,
     PARTICLE_OT_preview_toggle,
     PARTICLE_OT_setup_logic,
     PARTICLE_OT_apply_material,
+    PARTICLE_OT_pack_atlas,
+    PARTICLE_OT_bake_cache,
 )
 
 def register():
     for cls in classes:
         bpy.utils.register_class(cls)
     bpy.types.Object.particle_system_props = bpy.props.PointerProperty(type=ParticleSystemProperties)
+    bpy.types.Object.particle_field_props = bpy.props.PointerProperty(type=ParticleFieldProperties)
 
 def unregister():
     # NOTE: Wire shapes are NOT cleaned up - they persist by design
@@ -2406,6 +6008,7 @@ def unregister():
     for cls in reversed(classes):
         bpy.utils.unregister_class(cls)
     del bpy.types.Object.particle_system_props
+    del bpy.types.Object.particle_field_props
 
 if __name__ == "__main__":
     register()
\ No newline at end of file
@@ -0,0 +1,118 @@
+"""Shared fixtures for the simulation core tests.
+
+The core is pure NumPy, so this reads SIM_CORE_SOURCE out of the addon
+without importing it (no bpy / bge needed) and runs it standalone.
+"""
+import ast
+import os
+import types
+
+import numpy as np
+import pytest
+
+ADDON = os.path.join(os.path.dirname(__file__), os.pardir, "Particle system", "particle_system.py")
+
+# ParticleSim.configure() props with the addon's defaults (see settings_to_props)
+PROPS = {
+    'enabled': True, 'trigger': True, 'emission_mode': 'CONTINUOUS', 'emission_shape': 'POINT',
+    'emission_box_size': (1.0, 1.0, 1.0), 'emission_sphere_radius': 1.0, 'emission_shell': False,
+    'emission_inner_radius': 0.5, 'emission_cone_angle': 25.0, 'emission_edge_length': 1.0,
+    'vertex_group': '', 'normal_velocity': 0.0, 'subframe_emission': True,
+    'max_particles': 100, 'emission_rate': 100.0, 'emission_delay': 1.0, 'burst_count': 5,
+    'is_one_shot': False, 'lifetime': 1.0, 'lifetime_random': 0.0,
+    'start_size': 0.1, 'end_size': 0.05, 'start_velocity': (0.0, 0.0, 2.0), 'velocity_random': 0.5,
+    'gravity': (0.0, 0.0, -9.8), 'simulation_space': 'WORLD', 'movement_type': 'SIMPLE',
+    'force': (0.0, 0.0, 0.0), 'torque': (0.0, 0.0, 0.0), 'damping': 0.0, 'rotation': (0.0, 0.0, 0.0),
+    'enable_collision': False, 'bounce_strength': 0.5, 'field_weight': 1.0,
+    'turbulence_strength': 0.0, 'turbulence_scale': 1.0, 'turbulence_speed': 0.5,
+    'enable_interaction': False, 'interaction_radius': 0.25, 'repulsion': 20.0, 'cohesion': 0.0,
+    'contact_damping': 0.5, 'particle_type': 'MESH',
+    'color_start': (1.0, 1.0, 1.0), 'color_end': (1.0, 0.0, 0.0), 'color_start_time': 0.0,
+    'color_end_time': 10.0, 'start_alpha': 1.0, 'enable_color': False, 'enable_alpha': False,
+    'color_mode': 'CPU', 'tint_random': 0.0, 'atlas_cells': 0, 'atlas_index': 0, 'atlas_random': 1,
+    'billboard_mode': 'PER_PARTICLE', 'billboard_axis': 'Z', 'billboard_threshold': 1.0,
+}
+
+
+def _addon_string(name):
+    """Value of the string constant assigned to name anywhere in the addon"""
+    with open(ADDON, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    return next(node.value.value for node in ast.walk(tree)
+                if isinstance(node, ast.Assign) and isinstance(node.value, ast.Constant)
+                and any(getattr(t, "id", None) == name for t in node.targets))
+
+
+def load_core_source():
+    return _addon_string("SIM_CORE_SOURCE")
+
+
+def _needs_engine(node):
+    """The runtime's bge imports and its init() call"""
+    if isinstance(node, ast.Import):
+        return any(alias.name == "bge" for alias in node.names)
+    if isinstance(node, ast.ImportFrom):
+        return node.module == "bge"
+    return (isinstance(node, ast.Expr) and isinstance(node.value, ast.Call)
+            and getattr(node.value.func, "id", None) == "init")
+
+
+@pytest.fixture(scope="session")
+def core_source():
+    return load_core_source()
+
+
+@pytest.fixture
+def core(core_source):
+    """A fresh copy of the core module (use_kernels() state is per module)"""
+    module = types.ModuleType("ps_sim_core")
+    exec(core_source, module.__dict__)
+    return module
+
+
+@pytest.fixture
+def runtime(core_source):
+    """The game runtime script without the engine: the core pasted in as the
+    addon does, minus the bge imports and the init() call. logic is None, so
+    only code that leaves the engine alone can run."""
+    tree = ast.parse(_addon_string("script_text").replace("#@SIM_CORE@", core_source))
+    tree.body = [node for node in tree.body if not _needs_engine(node)]
+    namespace = {"__name__": "ps_runtime", "logic": None}
+    exec(compile(tree, "ps_runtime", "exec"), namespace)
+    return types.SimpleNamespace(**namespace)
+
+
+@pytest.fixture
+def props():
+    return dict(PROPS)
+
+
+class Emitter(dict):
+    """Stands in for an emitter KX_GameObject: game properties plus a transform"""
+    name = 'emitter'
+
+    def __init__(self, **props):
+        super().__init__({'ps_' + k: v for k, v in props.items()})
+        self.worldPosition    = np.zeros(3)
+        self.worldOrientation = np.eye(3)
+        self.worldScale       = np.ones(3)
+
+
+@pytest.fixture
+def make_emitter():
+    """make_emitter(emission_rate=50.0) sets the game property ps_emission_rate"""
+    return Emitter
+
+
+@pytest.fixture
+def system(runtime):
+    """The runtime's ParticleSystem without a scene: no particle template and
+    no pooled objects, so only prepare() / simulate() can run"""
+    class Headless(runtime.ParticleSystem):
+        def create_particle_template(self):
+            self.particle_template = None
+
+        def initialize_pool(self):
+            self.particle_pool = [None] * self.props['max_particles']
+            super().initialize_pool()
+    return Headless
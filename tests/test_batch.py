@@ -0,0 +1,91 @@
+"""ParticleBatch must step its members exactly like their own ParticleSim.step()."""
+import numpy as np
+import pytest
+
+DT = 1.0 / 60.0
+
+# Member settings per batch key; each member differs in capacity and physics
+GROUPS = {
+    'NONE': [
+        dict(max_particles=40),
+        dict(max_particles=25, simulation_space='LOCAL', gravity=(0.0, 1.0, -3.0), lifetime_random=0.5),
+        dict(max_particles=30, movement_type='FORCE', force=(1.0, 0.0, 0.0), damping=0.5),
+        dict(max_particles=35, turbulence_strength=2.0, field_weight=0.5, enable_interaction=True,
+             interaction_radius=0.3, cohesion=2.0),
+        dict(max_particles=20, particle_type='BILLBOARD', field_weight=0.0, emission_shape='SPHERE'),
+    ],
+    'TORQUE': [
+        dict(max_particles=30, movement_type='FORCE', torque=(90.0, 0.0, 0.0)),
+        dict(max_particles=45, movement_type='FORCE', torque=(0.0, 30.0, 10.0), damping=0.2,
+             simulation_space='LOCAL'),
+    ],
+    'LINEAR': [
+        dict(max_particles=30, rotation=(45.0, 0.0, 0.0)),
+        dict(max_particles=20, rotation=(0.0, 0.0, 90.0), emission_rate=40.0),
+    ],
+}
+
+
+def rz(angle):
+    c, s = np.cos(angle), np.sin(angle)
+    return np.array([[c, -s, 0.0], [s, c, 0.0], [0.0, 0.0, 1.0]])
+
+
+class Pair:
+    '''The same emitter twice: one stepped alone, one that may join the batch'''
+    def __init__(self, core, props, k):
+        p = dict(props, emission_rate=props.get('emission_rate', 100.0) * (1.0 + 0.2 * k))
+        self.solo, self.member = [core.ParticleSim(p['max_particles'], seed=k) for _ in range(2)]
+        for sim in (self.solo, self.member):
+            sim.configure(p)
+        self.rate, self.cap = p['emission_rate'], p['max_particles']
+        self.pos = np.array([k, 0.0, 0.5])
+        self.k   = k
+
+    def emit(self, frame):
+        ori = rz(0.1 * frame + self.k)
+        for sim in (self.solo, self.member):
+            count = sim.emission_count(DT, True, self.rate, 5, self.cap)
+            sim.emit(count, self.pos, ori)
+        return ori
+
+    def check(self):
+        a, b = self.solo, self.member
+        np.testing.assert_array_equal(a.active, b.active)
+        np.testing.assert_array_equal(a.live, b.live)
+        for name in ('pos', 'vel', 'rot', 'age'):
+            np.testing.assert_allclose(getattr(a, name), getattr(b, name), rtol=1e-12, atol=1e-12, err_msg=name)
+
+
+@pytest.mark.parametrize("group", sorted(GROUPS))
+def test_batch_matches_serial_steps(core, props, group):
+    fields = core.ForceFields([('ATTRACT', (0.0, 0.0, 2.0), (0.0, 0.0, 1.0), 3.0, 4.0, 'SMOOTH'),
+                               ('VORTEX', (1.0, 0.0, 0.0), (0.0, 0.0, 1.0), 2.0, 0.0, 'CONSTANT')])
+    pairs = [Pair(core, dict(props, **settings), k) for k, settings in enumerate(GROUPS[group])]
+    assert {core.ParticleBatch.key(p.member) for p in pairs} == {group}
+
+    batch = core.ParticleBatch()
+    for p in pairs[:-1]:            # The last member joins later
+        batch.add(p.member)
+    late   = pairs[-1]
+    leaver = pairs[0]
+    for frame in range(120):
+        if frame == 40:
+            batch.remove(leaver.member)   # Repack without it, arrays handed back
+        if frame == 60:
+            batch.add(late.member)        # Joins with particles already alive
+        if frame == 80:
+            batch.add(leaver.member)      # Rejoins at the end of the packing order
+        oris = {id(p): p.emit(frame) for p in pairs}
+        dead = {}
+        for p in pairs:
+            dead[id(p)] = p.solo.step(DT, oris[id(p)], fields)
+            if p.member not in batch.members:
+                np.testing.assert_array_equal(p.member.step(DT, oris[id(p)], fields), dead[id(p)])
+        members = [next(p for p in pairs if p.member is m) for m in batch.members]
+        if members:   # The manager drops a batch that emptied
+            for p, d in zip(members, batch.step(DT, [oris[id(p)] for p in members], fields)):
+                np.testing.assert_array_equal(np.sort(d), np.sort(dead[id(p)]))
+        for p in pairs:
+            p.check()
+    assert all(p.solo.active_count for p in pairs)
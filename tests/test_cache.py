@@ -0,0 +1,82 @@
+"""Baked cache files: write_cache() then CacheReader.frame() round trips."""
+import numpy as np
+
+
+def random_frames(rng, count, capacity, empty=()):
+    frames = []
+    for f in range(count):
+        n = 0 if f in empty else int(rng.integers(1, capacity))
+        slots = np.sort(rng.choice(capacity, n, replace=False))
+        frames.append((slots, rng.uniform(-5.0, 8.0, (n, 3)), rng.uniform(0.0, 0.3, n),
+                       rng.uniform(-10.0, 10.0, (n, 3)), rng.random((n, 4))))
+    return frames
+
+
+def test_round_trip_within_quantization(core, tmp_path):
+    rng    = np.random.default_rng(4)
+    frames = random_frames(rng, 40, 300, empty=(0, 17, 39))
+    path   = str(tmp_path / "fx.pscache")
+    core.write_cache(path, frames, 30.0, 300, core.CACHE_COLOR | core.CACHE_ROT | core.CACHE_LOCAL)
+
+    cache = core.CacheReader(path)
+    assert (cache.frames, cache.fps, cache.capacity) == (40, 30.0, 300)
+    assert cache.has_color and cache.has_rot and cache.is_local
+    live   = [f for f in frames if len(f[0])]
+    span   = np.ptp(np.concatenate([f[1] for f in live]), axis=0)
+    size_max = max(f[2].max() for f in live)
+    for i, (slots, pos, size, rot, color) in enumerate(frames):
+        got = cache.frame(i)
+        np.testing.assert_array_equal(got[0], slots)
+        assert got[1].shape == (len(slots), 3)
+        assert np.all(np.abs(got[1] - pos) <= span / 65535.0 * 0.5 + 1e-5)
+        assert np.all(np.abs(got[2] - size) <= size_max / 65535.0 * 0.5 + 1e-7)
+        assert np.all(np.abs(got[4] - color) <= 0.5 / 255.0 + 1e-9)
+        wrapped = np.remainder(got[3] - rot + np.pi, 2.0 * np.pi) - np.pi   # Eulers come back in +-pi
+        assert np.all(np.abs(wrapped) <= np.pi / 32767.0 * 0.5 + 1e-9)
+
+
+def test_zero_extent_and_missing_channels(core, tmp_path):
+    # Every particle on one point: the bounding box has no extent on any axis
+    point  = np.array([[1.5, -2.0, 0.25]])
+    frames = [(np.array([0, 3, 7]), np.repeat(point, 3, axis=0), np.full(3, 0.2), None, None),
+              (np.zeros(0, dtype=np.intp), np.zeros((0, 3)), np.zeros(0), None, None)]
+    path = str(tmp_path / "point.pscache")
+    core.write_cache(path, frames, 60.0, 8, 0)
+
+    cache = core.CacheReader(path)
+    assert not (cache.has_color or cache.has_rot or cache.is_local)
+    slots, pos, size, rot, color = cache.frame(0)
+    np.testing.assert_array_equal(slots, [0, 3, 7])
+    np.testing.assert_allclose(pos, np.repeat(point, 3, axis=0), atol=1e-6)
+    np.testing.assert_allclose(size, 0.2, rtol=1e-6)
+    assert rot is None and color is None
+    slots, pos, size, _, _ = cache.frame(1)
+    assert len(slots) == 0 and pos.shape == (0, 3) and size.shape == (0,)
+
+
+def test_all_frames_empty(core, tmp_path):
+    empty = (np.zeros(0, dtype=np.intp), np.zeros((0, 3)), np.zeros(0), None, None)
+    path  = str(tmp_path / "empty.pscache")
+    core.write_cache(path, [empty] * 3, 24.0, 10, 0)
+    cache = core.CacheReader(path)
+    assert cache.frames == 3
+    assert all(len(cache.frame(i)[0]) == 0 for i in range(3))
+
+
+def test_emitter_space_round_trip(core):
+    rng = np.random.default_rng(2)
+    pos = rng.uniform(-3.0, 3.0, (20, 3))
+    rot = rng.uniform(-1.5, 1.5, (20, 3))
+    c, s = np.cos(0.8), np.sin(0.8)
+    ori = np.array([[c, -s, 0.0], [s, c, 0.0], [0.0, 0.0, 1.0]])
+    emitter_pos = np.array([4.0, -1.0, 2.0])
+    for local in (False, True):
+        baked = core.to_emitter_space(pos, rot, emitter_pos, ori, local)
+        back  = core.from_emitter_space(*baked, emitter_pos, ori, local)
+        np.testing.assert_allclose(back[0], pos, atol=1e-12)
+        np.testing.assert_allclose(core.euler_to_matrices(back[1]), core.euler_to_matrices(rot), atol=1e-12)
+    # WORLD playback at a turned emitter only moves the particles along
+    baked = core.to_emitter_space(pos, rot, emitter_pos, ori, False)
+    moved = core.from_emitter_space(*baked, emitter_pos + 1.0, ori.T, False)
+    np.testing.assert_allclose(moved[0], pos + 1.0, atol=1e-12)
+    assert moved[1] is rot
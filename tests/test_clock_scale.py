@@ -0,0 +1,77 @@
+"""FixedClocks: per-emitter time scale on top of the shared fixed-step clocks."""
+import pytest
+
+
+def fixed(rate=30.0, max_steps=8, scale=1.0):
+    return {'fixed_step': True, 'fixed_step_rate': rate, 'max_substeps': max_steps, 'time_scale': scale}
+
+
+def run(runtime, props, frames, frame_dt):
+    clocks, key, total = runtime.FixedClocks(), None, 0
+    for _ in range(frames):
+        clocks.begin(frame_dt)
+        key, (steps, dt, _) = clocks.tick(props, key)
+        clocks.end()
+        assert dt == pytest.approx(1.0 / props['fixed_step_rate'])   # Never stretched
+        total += steps
+    return total, clocks.clocks[key].acc
+
+
+def test_scale_changes_step_count_not_step_length(runtime):
+    slow, _ = run(runtime, fixed(scale=0.5), 120, 1.0 / 60.0)
+    fast, _ = run(runtime, fixed(scale=3.0), 120, 1.0 / 60.0)
+    assert (slow, fast) == (30, 180)
+
+
+def test_scaled_second_equals_scaled_time(runtime):
+    # x3 for one second runs what x1 runs in three
+    assert run(runtime, fixed(scale=3.0), 60, 1.0 / 60.0) == \
+        pytest.approx(run(runtime, fixed(), 180, 1.0 / 60.0))
+    assert run(runtime, fixed(scale=0.5), 120, 1.0 / 60.0) == \
+        pytest.approx(run(runtime, fixed(), 60, 1.0 / 60.0))
+
+
+def test_shared_key_ticks_once_per_frame(runtime):
+    clocks = runtime.FixedClocks()
+    clocks.begin(0.05)
+    a = clocks.tick(fixed(), None)
+    b = clocks.tick(fixed(), None)
+    c = clocks.tick(fixed(scale=2.0), None)
+    assert a == b and a[1][0] == 1
+    assert c[1][0] == 3
+    assert len(clocks.clocks) == 2
+
+
+def test_ramped_scale_keeps_owed_time(runtime):
+    # A new scale every frame makes a new clock every frame; the time the
+    # previous one owed must carry over, or short frames would never step
+    clocks, key, total, owed = runtime.FixedClocks(), None, 0, 0.0
+    for frame in range(120):
+        scale = 0.2 + frame / 119.0
+        owed += 1.0 / 60.0 * scale
+        clocks.begin(1.0 / 60.0)
+        key, (steps, _, _) = clocks.tick(fixed(scale=scale), key)
+        clocks.end()
+        total += steps
+        assert list(clocks.clocks) == [key]     # The old scales were pruned
+    assert total == int(owed * 30.0 + 1e-9)
+
+
+def test_unused_clocks_are_dropped(runtime):
+    clocks = runtime.FixedClocks()
+    clocks.begin(0.02)
+    clocks.tick(fixed(rate=60.0), None)
+    clocks.tick(fixed(rate=30.0), None)
+    clocks.end()
+    clocks.begin(0.02)
+    key, _ = clocks.tick(fixed(rate=60.0), None)
+    clocks.end()
+    assert list(clocks.clocks) == [key]
+
+
+def test_without_fixed_step(runtime):
+    clocks = runtime.FixedClocks()
+    clocks.begin(0.02)
+    assert clocks.tick(dict(fixed(), fixed_step=False), None) == (None, None)
+    clocks.end()
+    assert clocks.clocks == {}
@@ -0,0 +1,35 @@
+"""FixedClock: the fixed-timestep accumulator of the game runtime."""
+import pytest
+
+
+def test_steps_and_remainder(runtime):
+    clock = runtime.FixedClock(60.0, 8)
+    steps, dt, alpha = clock.advance(0.05)          # 3 steps of 1/60
+    assert (steps, dt) == (3, pytest.approx(1.0 / 60.0))
+    assert alpha == pytest.approx(0.0, abs=1e-9)
+    steps, _, alpha = clock.advance(0.01)           # Not a whole step yet
+    assert steps == 0 and alpha == pytest.approx(0.6)
+    steps, _, alpha = clock.advance(0.01)           # The remainder carries over
+    assert steps == 1 and alpha == pytest.approx(0.2)
+
+
+def test_step_count_follows_time_not_frames(runtime):
+    clock = runtime.FixedClock(50.0, 8)
+    frame_times = [0.013, 0.021, 0.005, 0.04, 0.0, 0.017] * 50
+    total = sum(clock.advance(t)[0] for t in frame_times)
+    assert total == int(sum(frame_times) * 50.0 + 1e-9)
+    assert 0.0 <= clock.acc < clock.dt
+
+
+def test_cap_drops_the_backlog(runtime):
+    clock = runtime.FixedClock(60.0, 4)
+    steps, _, alpha = clock.advance(1.0)            # A hitch: 60 steps owed
+    assert steps == 4
+    assert clock.acc == 0.0 and alpha == 0.0        # No spiral: the rest is dropped
+    assert clock.advance(1.0 / 60.0)[0] == 1        # Next frame runs normally
+
+
+def test_exact_multiple_of_the_cap_keeps_stepping(runtime):
+    clock = runtime.FixedClock(10.0, 3)
+    assert clock.advance(0.3 + 1e-9)[0] == 3
+    assert clock.acc == pytest.approx(0.0, abs=1e-8)
@@ -0,0 +1,23 @@
+"""Parity of the Numba-compiled kernels with NumpyKernels."""
+import pytest
+
+SEEDS = range(6)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_fused_loops_agree_with_numpy(core, seed):
+    # The fused kernels run as plain Python without a jit
+    assert core.kernels_agree(core.fused_kernels(lambda f: f), core.NumpyKernels, n=97, seed=seed)
+
+
+def test_numba_kernels_agree_with_numpy(core):
+    numba = pytest.importorskip("numba")
+    fused = core.fused_kernels(numba.njit)   # Compiled once for all seeds
+    for seed in SEEDS:
+        assert core.kernels_agree(fused, core.NumpyKernels, seed=seed), seed
+
+
+def test_use_kernels_caches_on_disk(core, core_source):
+    pytest.importorskip("numba")
+    assert core.use_kernels(source=core_source).endswith("(cached)")
+    assert core.kernels is not core.NumpyKernels
@@ -0,0 +1,91 @@
+"""Mesh emission tables: vertex-group weights and the emitter's scale."""
+import numpy as np
+
+# A 2 x 2 square in XY: triangle 0 = (0, 1, 2), triangle 1 = (0, 2, 3)
+CO   = [(-1.0, -1.0, 0.0), (1.0, -1.0, 0.0), (1.0, 1.0, 0.0), (-1.0, 1.0, 0.0)]
+TRIS = [0, 1, 2, 0, 2, 3]
+
+
+class Collection(list):
+    def foreach_get(self, attr, out):
+        out[:] = np.ravel([getattr(item, attr) for item in list.__iter__(self)])   # Bulk, not per item
+
+
+class Item:
+    def __init__(self, **attrs):
+        self.__dict__.update(attrs)
+
+
+class Vertices(Collection):
+    reads = 0
+
+    def __iter__(self):
+        Vertices.reads += 1   # Per-vertex Python access (the vertex-group weights)
+        return super().__iter__()
+
+
+class Mesh:
+    '''Just the bpy.types.Mesh API that mesh_arrays() reads'''
+    def __init__(self, groups):
+        self.vertices = Vertices(Item(index=i, co=co, groups=[Item(group=g, weight=w) for g, w in groups.get(i, ())])
+                                 for i, co in enumerate(CO))
+        self.loop_triangles = Collection(Item(vertices=TRIS[k:k + 3]) for k in range(0, len(TRIS), 3))
+
+    def calc_loop_triangles(self):
+        pass
+
+    def as_pointer(self):
+        return id(self)
+
+
+# Group 0 "spawn" weights vertex 1 only; vertex 3 is in the other group alone
+GROUPS = {0: [(1, 0.0)], 1: [(1, 0.5), (0, 1.0)], 3: [(1, 1.0)]}
+VERTEX_GROUPS = {'spawn': Item(index=0), 'other': Item(index=1)}
+
+
+def blender_object(mesh):
+    return Item(type='MESH', data=mesh, vertex_groups=VERTEX_GROUPS)
+
+
+def test_group_weights(core):
+    co, tris, weights = core.mesh_arrays(Mesh(GROUPS), VERTEX_GROUPS, 'spawn')
+    np.testing.assert_array_equal(co, CO)
+    np.testing.assert_array_equal(tris, TRIS)
+    np.testing.assert_array_equal(weights, [0.0, 1.0, 0.0, 0.0])
+    assert core.mesh_arrays(Mesh(GROUPS), VERTEX_GROUPS, '')[2] is None
+
+    # Triangle 1 has no weight on any corner and never emits
+    pos, _ = core.MeshSampler(co, tris, weights).sample(np.random.default_rng(1), 500)
+    assert np.all(pos[:, 0] >= pos[:, 1] - 1e-12)
+
+
+def test_scale_rebuilds_the_table(system, make_emitter):
+    emitter = make_emitter(emission_shape='SURFACE', vertex_group='spawn')
+    emitter.blenderObject = blender_object(Mesh(GROUPS))
+    ps  = system(emitter)
+    rng = np.random.default_rng(2)
+    assert np.abs(ps.sim.sampler.sample(rng, 500)[0]).max() <= 1.0
+
+    emitter.worldScale = np.array([3.0, 0.5, 1.0])
+    ps.prepare(1.0 / 60.0)
+    pos, _ = ps.sim.sampler.sample(rng, 500)
+    assert np.abs(pos[:, 0]).max() > 2.0 and np.abs(pos[:, 1]).max() <= 0.5
+    sampler = ps.sim.sampler
+    ps.prepare(1.0 / 60.0)
+    assert ps.sim.sampler is sampler   # Same scale, same table
+
+
+def test_mesh_read_once_per_datablock(system, make_emitter):
+    mesh  = Mesh(GROUPS)
+    first = Vertices.reads
+    systems = []
+    for k in range(3):
+        emitter = make_emitter(emission_shape='VERTEX', vertex_group='spawn')
+        emitter.blenderObject = blender_object(mesh)
+        systems.append(system(emitter))
+    for ps in systems:
+        for scale in (1.5, 2.0, 0.25):
+            ps.emitter.worldScale = np.full(3, scale)
+            ps.prepare(1.0 / 60.0)
+            np.testing.assert_allclose(ps.sim.sampler.verts, np.array(CO) * scale)
+    assert Vertices.reads - first == 1
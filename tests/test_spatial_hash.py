@@ -0,0 +1,85 @@
+"""SpatialHash queries against brute force distances."""
+import numpy as np
+import pytest
+
+
+def brute_pairs(pos, radius):
+    d = np.sqrt(((pos[:, None, :] - pos[None, :, :]) ** 2).sum(axis=2))
+    i, j = np.nonzero(np.triu(d < radius, k=1))
+    return {(a, b): d[a, b] for a, b in zip(i.tolist(), j.tolist())}
+
+
+def brute_query(pos, points, radius):
+    d = np.sqrt(((points[:, None, :] - pos[None, :, :]) ** 2).sum(axis=2))
+    q, j = np.nonzero(d < radius)
+    return {(a, b): d[a, b] for a, b in zip(q.tolist(), j.tolist())}
+
+
+def as_dict(q, j, dist):
+    keys = list(zip(q.tolist(), j.tolist()))
+    assert len(set(keys)) == len(keys), "a pair was reported more than once"
+    return dict(zip(keys, dist.tolist()))
+
+
+def assert_same(found, expected):
+    assert found.keys() == expected.keys()
+    for key, dist in found.items():
+        assert dist == pytest.approx(expected[key], abs=1e-12)
+
+
+def points(rng, n):
+    # Straddles the origin (negative cell indices) with a dense cluster, so
+    # buckets hold many points and different cells collide in the table
+    spread  = rng.uniform(-6.0, 2.5, (n - n // 4, 3))
+    cluster = rng.normal(-1.0, 0.15, (n // 4, 3))
+    return np.concatenate((spread, cluster))
+
+
+@pytest.mark.parametrize("cell, radius", [(0.4, 0.35), (0.25, 0.6), (1.0, 1.0)])
+def test_pairs_match_brute_force(core, cell, radius):
+    pos  = points(np.random.default_rng(7), 600)
+    grid = core.SpatialHash(cell).build(pos)
+    i, j, dist = grid.pairs(radius)
+    assert np.all(i < j)
+    assert_same(as_dict(i, j, dist), brute_pairs(pos, radius))
+
+
+@pytest.mark.parametrize("cell, radius", [(0.4, 0.35), (0.25, 0.6)])
+def test_query_matches_brute_force(core, cell, radius):
+    rng   = np.random.default_rng(8)
+    pos   = points(rng, 500)
+    probe = np.concatenate((rng.uniform(-7.0, 3.5, (80, 3)), pos[:20], [[40.0, -40.0, 0.0]]))
+    grid  = core.SpatialHash(cell).build(pos)
+    assert_same(as_dict(*grid.query(probe, radius)), brute_query(pos, probe, radius))
+
+
+def test_all_pairs_fallback(core):
+    # A radius of many cells over few points: (2 * span + 1) ** 3 >= n
+    rng  = np.random.default_rng(9)
+    pos  = rng.uniform(-2.0, 1.0, (30, 3))
+    grid = core.SpatialHash(0.1).build(pos)
+    i, j, dist = grid.pairs(1.5)
+    assert_same(as_dict(i, j, dist), brute_pairs(pos, 1.5))
+    probe = rng.uniform(-3.0, 2.0, (10, 3))
+    assert_same(as_dict(*grid.query(probe, 1.5)), brute_query(pos, probe, 1.5))
+
+
+def test_nearest(core):
+    rng  = np.random.default_rng(10)
+    pos  = points(rng, 400)
+    grid = core.SpatialHash(0.3).build(pos)
+    for point in rng.uniform(-8.0, 4.0, (25, 3)):
+        d = np.sqrt(((pos - point) ** 2).sum(axis=1))
+        j, dist = grid.nearest(point)
+        assert dist == pytest.approx(d.min(), abs=1e-12)
+        assert d[j] == pytest.approx(d.min(), abs=1e-12)
+        assert grid.nearest(point, d.min() * 0.99) is None
+
+
+def test_empty_and_single(core):
+    grid = core.SpatialHash(0.5).build(np.zeros((0, 3)))
+    assert all(len(a) == 0 for a in grid.pairs(1.0))
+    assert all(len(a) == 0 for a in grid.query(np.zeros((3, 3)), 1.0))
+    assert grid.nearest((0.0, 0.0, 0.0)) is None
+    grid.build(np.array([[-0.2, 0.1, -3.0]]))
+    assert all(len(a) == 0 for a in grid.pairs(1.0))
@@ -0,0 +1,47 @@
+"""Sub-frame emission: spawns spread evenly along a moving emitter's path."""
+import numpy as np
+import pytest
+
+RATE = 120.0     # Particles per second
+SPEED = 1.0      # Emitter speed, m/s
+
+
+def run(runtime, system, make_emitter, fps, **props):
+    emitter = make_emitter(max_particles=400, emission_rate=RATE, lifetime=10.0, lifetime_random=0.0,
+                           start_velocity_z=0.0, gravity_z=0.0, velocity_random=0.0, **props)
+    ps     = system(emitter)
+    ps.sim.reseed(5)
+    clocks = runtime.FixedClocks()
+    frames = int(fps)          # One second of game time
+    steps  = []
+    for frame in range(frames):
+        emitter.worldPosition = np.array([SPEED * (frame + 1) / fps, 0.0, 0.0])
+        clocks.begin(1.0 / fps)
+        assert ps.prepare(1.0 / fps)
+        ps._clock_key, ps._tick = clocks.tick(ps.props, ps._clock_key)
+        ps.simulate()
+        steps.append(ps._steps)
+        clocks.end()
+    gaps = np.diff(np.sort(ps.sim.pos[ps.sim.live][:, 0]))
+    return gaps[int(RATE / fps) + 5:-5], steps     # The first frame has no path to spread along
+
+
+def test_variable_step_spacing(runtime, system, make_emitter):
+    gaps, _ = run(runtime, system, make_emitter, 20.0)
+    np.testing.assert_allclose(gaps, SPEED / RATE, atol=1e-9)
+
+
+@pytest.mark.parametrize("fps, fixed_rate", [(60.0, 30.0), (45.0, 20.0), (24.0, 60.0)])
+def test_fixed_step_spacing(runtime, system, make_emitter, fps, fixed_rate):
+    # Render frames without a step must not move the start of the next step's path
+    gaps, steps = run(runtime, system, make_emitter, fps, fixed_step=True, fixed_rate=fixed_rate, max_substeps=8)
+    if fixed_rate < fps:
+        assert 0 in steps
+    else:
+        assert max(steps) > 1
+    np.testing.assert_allclose(gaps, SPEED / RATE, atol=1e-9)
+
+
+def test_without_subframe_emission_spawns_clump(runtime, system, make_emitter):
+    gaps, _ = run(runtime, system, make_emitter, 20.0, subframe=False)
+    assert np.count_nonzero(gaps < 1e-9) > len(gaps) // 2